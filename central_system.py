@@ -1,10 +1,41 @@
 import sys
-from src.central.mine_management import main
+
+def _parse_loopback_fleet() -> int:
+    if '--loopback' not in sys.argv:
+        return 0
+    idx = sys.argv.index('--loopback')
+    if idx + 1 < len(sys.argv) and sys.argv[idx + 1].isdigit():
+        return int(sys.argv[idx + 1])
+    return 1
+
+def _arg(name: str, default=None, cast=str):
+    if name not in sys.argv:
+        return default
+    idx = sys.argv.index(name)
+    if idx + 1 >= len(sys.argv):
+        return default
+    return cast(sys.argv[idx + 1])
 
 if __name__ == "__main__":
     print("="*70)
     print("SISTEMA CENTRAL DE GESTÃO DA MINA".center(70))
     print("="*70)
-    print("\nIniciando interface gráfica...\n")
     
-    main()
+    fleet_size = _parse_loopback_fleet()
+    api_port = _arg('--api-port', cast=int)
+    api_url = _arg('--connect')
+    dispatch = True if '--dispatch' in sys.argv else None
+    if fleet_size:
+        print(f"\nTransporte loopback em processo com {fleet_size} caminhão(ões) simulados\n")
+    
+    if '--headless' in sys.argv:
+        from src.central.fleet_service import main
+        print("\nServiço central sem interface gráfica (Ctrl+C para encerrar)\n")
+        main(loopback_fleet=fleet_size, api_port=api_port, dispatch=dispatch)
+    else:
+        from src.central.mine_management import main
+        if api_url:
+            print(f"\nInterface gráfica conectada ao serviço central em {api_url}\n")
+        elif not fleet_size:
+            print("\nIniciando interface gráfica...\n")
+        main(loopback_fleet=fleet_size, api_port=api_port, api_url=api_url, dispatch=dispatch)
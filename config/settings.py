@@ -49,6 +49,211 @@ MQTT_CONFIG = {
     'broker_host': 'localhost',
     'broker_port': 1883,
     'qos': 1,
+    'payload_format': 'binary',
+    'transport': 'paho',
+}
+
+RECONNECT_CONFIG = {
+    'initial_delay': 0.5,
+    'max_delay': 30.0,
+    'multiplier': 2.0,
+    'jitter': 0.5,
+    'connect_timeout': 10.0,
+    'clean_session': False,
+}
+
+LOOPBACK_CONFIG = {
+    'latency': 0.0,
+    'jitter': 0.0,
+    'loss': 0.0,
+}
+
+TELEMETRY_CONFIG = {
+    'delta_mode': True,
+    'keyframe_interval': 10.0,
+    'delta_tolerances': {
+        'x': 0.05,
+        'y': 0.05,
+        'theta': 0.01,
+        'velocity': 0.05,
+        'velocity_setpoint': 0.01,
+        'angular_setpoint': 0.01,
+        'acceleration_cmd': 0.01,
+        'steering_cmd': 0.01,
+        'temperature': 0.5,
+    },
+    'keyframe_request_interval': 2.0,
+    'state_period': 1.0,
+    'position_check_period': 0.05,
+    'position_tolerance': 0.5,
+    'heading_tolerance': 0.1,
+    'position_min_interval': 0.05,
+    'position_max_interval': 2.0,
+}
+
+INBOUND_CONFIG = {
+    'command': {'maxsize': 100, 'coalesce': False},
+    'route': {'maxsize': 128, 'coalesce': False},
+    'position': {'maxsize': 512, 'coalesce': True},
+}
+
+COLLISION_CONFIG = {
+    'check_period': 0.1,
+    'safety_distance': 5.0,
+    'warning_distance': 10.0,
+}
+
+NEIGHBOUR_CONFIG = {
+    'expiry': 5.0,
+    'base_uncertainty': 0.5,
+    'velocity_uncertainty': 1.0,
+    'max_acceleration': 1.0,
+    'speed_scale': 5.0,
+    'latency_margin': 1.0,
+}
+
+STORE_FORWARD_CONFIG = {
+    'enabled': True,
+    'directory': 'data/telemetry_buffer',
+    'max_bytes': 50 * 1024 * 1024,
+    'segment_bytes': 256 * 1024,
+    'drain_rate': 50.0,
+    'classes': {
+        'state': {'priority': 0, 'order': 'fifo'},
+        'position': {'priority': 1, 'order': 'lifo'},
+    },
+}
+
+MAP_CONFIG = {
+    'width': 100.0,
+    'height': 75.0,
+    'grid_spacing': None,
+    'spatial_cell': 50.0,
+    'min_scale': 0.01,
+    'max_scale': 200.0,
+    'zoom_step': 1.2,
+    'cull_margin_px': 40,
+    'cluster_below_scale': 2.0,
+    'cluster_radius_px': 40,
+}
+
+HISTORY_CONFIG = {
+    'raw_capacity': 3000,
+    'tiers': {1.0: 900, 10.0: 4320, 60.0: 720},
+    'trail_seconds': 300.0,
+    'trail_tolerance_px': 2.0,
+    'chart_seconds': 300.0,
+    'chart_bucket': 1.0,
+    'chart_refresh': 1.0,
+}
+
+CENTRAL_SERVICE_CONFIG = {
+    'apply_period': 0.1,
+    'api_host': '127.0.0.1',
+    'api_port': 8765,
+    'api_timeout': 2.0,
+    'stale_timeout': 60.0,
+}
+
+CONFLICT_CONFIG = {
+    'period': 0.5,
+    'horizon': 10.0,
+    'safety_distance': 5.0,
+    'cell_size': 20.0,
+    'max_age': 5.0,
+}
+
+ZONE_CONFIG = {
+    'enabled': True,
+    'zones': [
+        {'id': 'cruzamento_central', 'polygon': [[45.0, 32.0], [55.0, 32.0], [55.0, 43.0], [45.0, 43.0]]},
+    ],
+    'request_distance': 12.0,
+    'stop_margin': 2.0,
+    'crossing_speed': 3.0,
+    'clearance': 1.0,
+    'grace': 5.0,
+    'max_duration': 60.0,
+    'max_wait': 120.0,
+    'retry_interval': 2.0,
+    'response_timeout': 5.0,
+}
+
+DISPATCH_CONFIG = {
+    'enabled': False,
+    'period': 1.0,
+    'sites': [
+        {'id': 'carga_norte', 'kind': 'load', 'x': 15.0, 'y': 60.0, 'service_time': 15.0},
+        {'id': 'carga_leste', 'kind': 'load', 'x': 85.0, 'y': 60.0, 'service_time': 15.0},
+        {'id': 'britador', 'kind': 'dump', 'x': 85.0, 'y': 15.0, 'service_time': 8.0},
+        {'id': 'pilha_esteril', 'kind': 'dump', 'x': 15.0, 'y': 15.0, 'service_time': 8.0},
+    ],
+    'speed': 4.0,
+    'arrival_radius': 3.0,
+    'service_radius': 3.0,
+    'staging_distance': 15.0,
+    'staging_spacing': 8.0,
+    'stop_speed': 1.0,
+    'cache_tolerance': 1.0,
+    'progress_timeout': 30.0,
+    'progress_distance': 2.0,
+    'detour_distance': 8.0,
+    'max_age': 5.0,
+}
+
+CENTRAL_METRICS_CONFIG = {
+    'topic': 'mine/central/metrics',
+    'period': 5.0,
+}
+
+LOAD_TEST_CONFIG = {
+    'trucks': [10, 50, 100, 200],
+    'step_duration': 30.0,
+    'state_rate': 1.0,
+    'position_rate': 5.0,
+    'step_period': 0.05,
+}
+
+SIMULATION_CONFIG = {
+    'seed': None,
+    'start_pose': [50.0, 37.5, 0.0],
+    'heating_probability': 0.15,
+    'heating_interval': 10.0,
+    'heating_range': [95.0, 150.0],
+    'fault_check_period': 5.0,
+    'electrical_fault_probability': 0.03,
+    'hydraulic_fault_probability': 0.03,
+}
+
+SCENARIO_CONFIG = {
+    'directory': 'scenarios',
+    'trace_period': 1.0,
+    'stop_speed': 0.1,
+}
+
+CAMPAIGN_CONFIG = {
+    'runs': 200,
+    'fleets': [4, 8],
+    'seeds_per_fleet': 4,
+    'faults': ['electrical', 'hydraulic', 'heating'],
+    'fault_window': [60.0, 240.0],
+    'heating_range': [100.0, 150.0],
+    'reset_after': 30.0,
+    'duration': 300.0,
+    'workers': None,
+}
+
+BENCHMARK_CONFIG = {
+    'trucks': 8,
+    'duration': 1800.0,
+    'payload_tonnes': 90.0,
+    'position_period': 0.2,
+    'zone_period': 0.1,
+    'neighbour_radius': 40.0,
+    'collision_distance': 2.5,
+    'stall_grace': 5.0,
+    'max_stalled_fraction': 0.05,
+    'start': {'x': 30.0, 'y': 5.0, 'spacing': 6.0, 'per_row': 8},
 }
 
 LOG_CONFIG = {
@@ -61,4 +266,11 @@ BUFFER_CONFIG = {
 
 ROUTE_CONFIG = {
     'waypoint_threshold': 1.0,
+    'queue_size': 10,
+    'chunk_size': 200,
+    'chunk_timeout': 30.0,
+    'max_waypoints': 20000,
+    'ack_timeout': 5.0,
+    'resend_interval': 1.0,
+    'max_resends': 5,
 }
@@ -1,13 +1,8 @@
 import sys
-try:
-    import paho.mqtt.client as mqtt
-except ImportError:
-    print("ERRO: paho-mqtt não instalado")
-    print("Instale com: pip install paho-mqtt")
-    sys.exit(1)
-
 import json
 import time
+from src.embedded.communication.telemetry_codec import decode_payload
+from src.embedded.communication.transport import MQTT_AVAILABLE, TRANSPORT_PAHO, create_transport
 
 def print_menu():
     print("\n" + "="*60)
@@ -46,7 +41,7 @@ def send_route(client, truck_id, waypoints):
 
 truck_state = {}
 
-def on_connect(client, userdata, flags, rc, properties=None):
+def on_connect(client, userdata, flags, rc):
     if rc == 0:
         print("\n✓ Conectado ao broker MQTT")
 
@@ -57,9 +52,11 @@ def on_connect(client, userdata, flags, rc, properties=None):
         print(f"\n✗ Falha na conexão (código {rc})")
 
 def on_message(client, userdata, msg):
-    global truck_state
     try:
-        truck_state = json.loads(msg.payload.decode('utf-8'))
+        data = decode_payload(msg.payload)
+        data.pop('_seq', None)
+        data.pop('_keyframe', None)
+        truck_state.update(data)
     except:
         pass
 
@@ -93,14 +90,12 @@ def main():
     print(f"Broker: {broker}".center(60))
     print("="*60)
     
-    try:
-        client = mqtt.Client(
-            client_id=f"controller_{truck_id}",
-            userdata=truck_id,
-            callback_api_version=mqtt.CallbackAPIVersion.VERSION2
-        )
-    except (AttributeError, TypeError):
-        client = mqtt.Client(client_id=f"controller_{truck_id}", userdata=truck_id)
+    if not MQTT_AVAILABLE:
+        print("ERRO: paho-mqtt não instalado")
+        print("Instale com: pip install paho-mqtt")
+        sys.exit(1)
+    
+    client = create_transport(TRANSPORT_PAHO, f"controller_{truck_id}", userdata=truck_id)
     
     client.on_connect = on_connect
     client.on_message = on_message
@@ -0,0 +1,81 @@
+import json
+import os
+import sys
+import time
+from config.settings import CAMPAIGN_CONFIG
+from src.simulation.fault_campaign import CampaignCase, aggregate, build_cases, run_campaign
+
+def _arg(name: str, default, cast=float):
+    if name not in sys.argv:
+        return default
+    idx = sys.argv.index(name)
+    if idx + 1 >= len(sys.argv):
+        return default
+    return cast(sys.argv[idx + 1])
+
+def _int_list(value: str) -> list:
+    return [int(n) for n in value.split(',')]
+
+def _progress(done: int, total: int):
+    if done == total or done % max(1, total // 20) == 0:
+        print(f"  {done}/{total} execuções", flush=True)
+
+def _print_group(name: str, group: dict):
+    print(f"\n  {name}: {group['runs']} execuções | falha detectada {group['detected']} | "
+          f"parada segura {group['safe_stops']} | sem parada {group['no_safe_stop']} | "
+          f"saiu do mapa {group['left_map']}")
+    for key, label, unit in (('detection_time', 'detecção', 's'), ('time_to_safe_stop', 'até parar', 's'),
+                             ('stop_distance', 'distância de parada', 'm'),
+                             ('lost_cycle_time', 'ciclo perdido', 's'), ('downtime', 'tempo em falha', 's')):
+        stats = group[key]
+        if stats:
+            print(f"    {label}: média {stats['avg']:.2f}{unit} | p95 {stats['p95']:.2f}{unit} | "
+                  f"máx {stats['max']:.2f}{unit}")
+    separation = group['min_separation']
+    print(f"    execuções com aproximações acima da referência: {group['runs_with_excess_close_calls']} | "
+          f"menor distância: {separation:.1f}m" if separation is not None else "    menor distância: -")
+
+def _save_unsafe(directory: str, cases: list):
+    os.makedirs(directory, exist_ok=True)
+    for case in cases:
+        scenario = CampaignCase(**case).to_scenario_dict()
+        with open(os.path.join(directory, f"{scenario['name']}.json"), 'w') as f:
+            json.dump(scenario, f, indent=2, ensure_ascii=False)
+
+def main():
+    config = dict(CAMPAIGN_CONFIG)
+    config['fleets'] = _arg('--fleets', config['fleets'], _int_list)
+    config['duration'] = _arg('--duration', config['duration'])
+    runs = _arg('--runs', config['runs'], int)
+    workers = _arg('--workers', config['workers'], int)
+    seed = _arg('--seed', 0, int)
+    output = _arg('--json', None, str)
+    save_unsafe = _arg('--save-unsafe', None, str)
+    
+    cases = build_cases(config, runs, seed)
+    print("="*70)
+    print("CAMPANHA DE INJEÇÃO DE FALHAS".center(70))
+    print("="*70)
+    print(f"{runs} execuções com falha + {len(cases) - runs} de referência | frotas {config['fleets']} | "
+          f"{config['duration']:.0f}s simulados | processos: {workers or os.cpu_count()}")
+    
+    start = time.perf_counter()
+    results = run_campaign(cases, workers, _progress)
+    wall = time.perf_counter() - start
+    report = aggregate(results)
+    
+    for name, group in report['groups'].items():
+        _print_group(name, group)
+    print(f"\n  {len(report['unsafe'])} execuções sem parada segura | "
+          f"{report['wall_time']:.0f}s somados de execução em {wall:.0f}s de relógio")
+    
+    if save_unsafe and report['unsafe']:
+        _save_unsafe(save_unsafe, report['unsafe'])
+        print(f"Cenários das execuções sem parada segura salvos em {save_unsafe}/ (use run_scenario.py)")
+    if output:
+        with open(output, 'w') as f:
+            json.dump({'config': config, 'seed': seed, 'report': report, 'results': results}, f, indent=2)
+        print(f"\nResultados salvos em {output}")
+
+if __name__ == "__main__":
+    main()
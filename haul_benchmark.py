@@ -0,0 +1,67 @@
+import json
+import sys
+from config.settings import BENCHMARK_CONFIG
+from src.simulation.haul_benchmark import HaulBenchmark
+
+def _arg(name: str, default, cast=float):
+    if name not in sys.argv:
+        return default
+    idx = sys.argv.index(name)
+    if idx + 1 >= len(sys.argv):
+        return default
+    return cast(sys.argv[idx + 1])
+
+def _int_list(value: str) -> list:
+    return [int(n) for n in value.split(',')]
+
+def _print_result(result: dict):
+    cycle = result['cycle_time']
+    print(f"\n  {result['trucks']} caminhões | {result['cycles']} ciclos | "
+          f"{result['tonnes_per_hour']:.0f} t/h")
+    if cycle:
+        print(f"    ciclo: média {cycle['avg']:.1f}s | p95 {cycle['p95']:.1f}s | máx {cycle['max']:.1f}s")
+    for site_id, wait in result['site_queue'].items():
+        print(f"    fila {site_id}: {wait['count']} atendimentos | espera média {wait['avg']:.1f}s | "
+              f"p95 {wait['p95']:.1f}s")
+    zones = result['zones']
+    if zones['grants']:
+        print(f"    zonas: {zones['grants']} concessões | espera média {zones['wait_avg']:.1f}s | "
+              f"p95 {zones['wait_p95']:.1f}s")
+    separation = result['min_separation']
+    print(f"    menor distância entre caminhões: {separation:.1f}m | aproximações perigosas: "
+          f"{result['close_calls']}" if separation is not None else "    menor distância: -")
+    print(f"    tempo parado em trânsito: {result['stalled_truck_time'] / 60.0:.1f} caminhão·min "
+          f"({result['stalled_fraction']:.1%}) | replanejamentos por falta de progresso: "
+          f"{result['dispatch_timeouts']}")
+    if not result['valid']:
+        print(f"    ⚠️ EXECUÇÃO INVÁLIDA: {'; '.join(result['invalid_reasons'])}")
+    print(f"    CPU por caminhão: {result['cpu_per_truck_ms']:.2f} ms/s | central: "
+          f"{result['central_cpu_ms']:.2f} ms/s | {result['realtime_factor']:.0f}x tempo real")
+    misses = {name: task['deadline_misses'] for name, task in result['tasks'].items() if task['deadline_misses']}
+    print(f"    prazos perdidos: {misses or 'nenhum'} | ciclos de simulação acima do período: "
+          f"{result['tick_deadline_misses']}/{result['ticks']}")
+
+def main():
+    fleets = _arg('--trucks', [BENCHMARK_CONFIG['trucks']], _int_list)
+    duration = _arg('--duration', BENCHMARK_CONFIG['duration'])
+    zones = '--no-zones' not in sys.argv
+    output = _arg('--json', None, str)
+
+    print("="*70)
+    print("BENCHMARK DE PRODUTIVIDADE DA FROTA".center(70))
+    print("="*70)
+    print(f"Frotas: {fleets} | {duration:.0f}s simulados | zonas {'ativas' if zones else 'desativadas'}")
+
+    results = []
+    for trucks in fleets:
+        result = HaulBenchmark(trucks, duration, BENCHMARK_CONFIG, zones=zones).run()
+        results.append(result)
+        _print_result(result)
+
+    if output:
+        with open(output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResultados salvos em {output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+import sys
+import time
+import threading
+from config.settings import (
+    CENTRAL_METRICS_CONFIG, LOAD_TEST_CONFIG, LOOPBACK_CONFIG, MQTT_CONFIG, TELEMETRY_CONFIG
+)
+from src.simulation.fleet_load_generator import FleetLoadGenerator, summarize
+from src.embedded.communication.transport import MQTT_AVAILABLE, TRANSPORT_PAHO, create_transport
+
+def _arg(name: str, default, cast=float):
+    if name not in sys.argv:
+        return default
+    idx = sys.argv.index(name)
+    if idx + 1 >= len(sys.argv):
+        return default
+    return cast(sys.argv[idx + 1])
+
+def _int_list(value: str) -> list:
+    return [int(n) for n in value.split(',')]
+
+def run_ramp(generator: FleetLoadGenerator, steps: list, step_duration: float,
+             expected_rate_per_truck: float, finished: threading.Event):
+    results = []
+    for size in steps:
+        print(f"\n[CARGA] {size} caminhões emulados por {step_duration:.0f}s...")
+        generator.set_fleet_size(size)
+        time.sleep(step_duration)
+        result = summarize(generator.reports, size, size * expected_rate_per_truck)
+        results.append(result)
+        _print_result(result)
+    finished.set()
+    return results
+
+def _print_result(result: dict):
+    if not result.get('samples'):
+        print(f"  {result['fleet_size']:>5} caminhões: sem métricas do sistema central")
+        return
+    print(f"  {result['fleet_size']:>5} caminhões | "
+          f"ingestão {result['ingest_rate']:8.1f}/{result['expected_rate']:.0f} msg/s | "
+          f"idade p95 {result['age_p95'] * 1000:7.1f} ms (máx {result['age_max'] * 1000:7.1f}) | "
+          f"render {result['render_avg'] * 1000:6.1f} ms (máx {result['render_max'] * 1000:6.1f}) | "
+          f"atraso do loop {result['render_gap_max'] * 1000:6.0f} ms")
+
+def main():
+    steps = _arg('--trucks', LOAD_TEST_CONFIG['trucks'], _int_list)
+    step_duration = _arg('--duration', LOAD_TEST_CONFIG['step_duration'])
+    state_rate = _arg('--state-rate', LOAD_TEST_CONFIG['state_rate'])
+    position_rate = _arg('--position-rate', LOAD_TEST_CONFIG['position_rate'])
+    broker_host = _arg('--broker', MQTT_CONFIG['broker_host'], str)
+    loopback = '--loopback' in sys.argv
+    
+    print("="*70)
+    print("GERADOR DE CARGA DA FROTA".center(70))
+    print("="*70)
+    print(f"Etapas: {steps} | estado {state_rate} Hz | posição {position_rate} Hz | "
+          f"{'loopback em processo' if loopback else f'broker {broker_host}'}")
+    
+    if not loopback and not MQTT_AVAILABLE:
+        print("ERRO: paho-mqtt não instalado (use --loopback ou pip install paho-mqtt)")
+        sys.exit(1)
+    
+    app = None
+    service = None
+    broker = None
+    if loopback:
+        from src.central.fleet_service import FleetService
+        from src.embedded.communication.loopback import LoopbackBroker, LoopbackTransport
+        
+        broker = LoopbackBroker(**LOOPBACK_CONFIG)
+        transport = LoopbackTransport(broker, "load_generator")
+        service = FleetService(transport=LoopbackTransport(broker, "mine_management"))
+        service.connect()
+        service.start()
+        if '--headless' not in sys.argv:
+            from src.central.mine_management import MineManagementGUI
+            app = MineManagementGUI(service)
+    else:
+        transport = create_transport(TRANSPORT_PAHO, "load_generator")
+    
+    generator = FleetLoadGenerator(
+        transport,
+        state_rate=state_rate,
+        position_rate=position_rate,
+        step_period=LOAD_TEST_CONFIG['step_period'],
+        payload_format=MQTT_CONFIG['payload_format'],
+        keyframe_interval=TELEMETRY_CONFIG['keyframe_interval'],
+        delta_tolerances=TELEMETRY_CONFIG['delta_tolerances'],
+        metrics_topic=CENTRAL_METRICS_CONFIG['topic']
+    )
+    generator.start_transport(broker_host, MQTT_CONFIG['broker_port'])
+    generator.start()
+    
+    finished = threading.Event()
+    ramp = threading.Thread(target=run_ramp, daemon=True,
+                            args=(generator, steps, step_duration, state_rate + position_rate, finished))
+    ramp.start()
+    
+    try:
+        if app is not None:
+            def _poll_finished():
+                if finished.is_set():
+                    app.root.quit()
+                else:
+                    app.root.after(500, _poll_finished)
+            app.root.after(500, _poll_finished)
+            app.run()
+        else:
+            while not finished.wait(0.5):
+                pass
+    except KeyboardInterrupt:
+        print("\nInterrompido")
+    finally:
+        generator.stop()
+        if service is not None:
+            service.stop()
+        if broker is not None:
+            broker.shutdown()
+    
+    print(f"\nMensagens publicadas: {generator.published} "
+          f"(falhas: {generator.failed}, passos atrasados: {generator.overruns})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+import shutil
+import sys
+import tempfile
+import time
+from config.settings import STORE_FORWARD_CONFIG
+from src.embedded.communication.loopback import LoopbackBroker, LoopbackTransport
+from src.embedded.communication.telemetry_codec import decode_payload
+from src.embedded.embedded_system import EmbeddedSystem
+
+class SwitchedTransport(LoopbackTransport):
+    
+    def __init__(self, broker: LoopbackBroker, client_id: str, clean_session: bool = True):
+        super().__init__(broker, client_id, clean_session=clean_session)
+        self.link_up = True
+    
+    def connect(self, host: str = "localhost", port: int = 1883, keepalive: int = 60) -> None:
+        self.reconnect()
+    
+    def reconnect(self) -> None:
+        # with the link cut the broker is unreachable, like a refused TCP connection
+        if not self.link_up:
+            raise ConnectionRefusedError("enlace desligado")
+        self.broker.attach(self)
+
+def _wait(condition, timeout: float) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.05)
+    return condition()
+
+def _drive(system: EmbeddedSystem, positions: range, clock: list):
+    for x in positions:
+        clock[0] += 1.0
+        system.shared_state.set_position(float(x), 0.0, 0.0, 0.0)
+        system.publish_telemetry(clock[0])
+
+def main():
+    steps = int(sys.argv[sys.argv.index('--steps') + 1]) if '--steps' in sys.argv else 10
+    directory = tempfile.mkdtemp(prefix='outage_test_')
+    STORE_FORWARD_CONFIG['directory'] = directory
+    
+    broker = LoopbackBroker()
+    received = []
+    observer = LoopbackTransport(broker, 'outage_observer', clean_session=False)
+    observer.on_message = lambda client, userdata, message: received.append(
+        (message.topic, decode_payload(message.payload)))
+    observer.connect()
+    for pattern in ('mine/truck/+/state', 'mine/truck/+/position', 'mine/truck/+/+/replay'):
+        observer.subscribe(pattern, qos=1)
+    
+    transport = SwitchedTransport(broker, 'truck_1', clean_session=False)
+    system = EmbeddedSystem(1, enable_mqtt=True, transport=transport)
+    client = system.mqtt_client
+    
+    print("\n" + "="*70)
+    print("TESTE DE QUEDA DE ENLACE (STORE-AND-FORWARD)".center(70))
+    print("="*70)
+    
+    failures = []
+    clock = [0.0]
+    try:
+        client.connect()
+        if not _wait(client.is_connected, 5.0):
+            failures.append("não conectou ao broker loopback")
+            return failures
+        _drive(system, range(0, steps), clock)
+        
+        transport.link_up = False
+        broker.disconnect_all()
+        observer.reconnect()
+        _wait(lambda: not client.is_connected(), 5.0)
+        _drive(system, range(steps, 2 * steps), clock)
+        buffered = len(client.store_forward)
+        print(f"  enlace desligado: {buffered} mensagens no buffer em disco")
+        if buffered != 2 * steps:
+            failures.append(f"esperadas {2 * steps} mensagens no buffer durante a queda, há {buffered}")
+        
+        transport.link_up = True
+        if not _wait(lambda: client.is_connected() and len(client.store_forward) == 0, 30.0):
+            failures.append(f"buffer não esvaziou após reconectar ({len(client.store_forward)} pendentes)")
+        _drive(system, range(2 * steps, 3 * steps), clock)
+        _wait(lambda: broker.pending() == 0, 2.0)
+        time.sleep(0.2)
+    finally:
+        client.disconnect()
+        broker.shutdown()
+        shutil.rmtree(directory, ignore_errors=True)
+    
+    def xs(suffix: str) -> list:
+        return [int(round(data['x'])) for topic, data in received if topic.endswith(suffix) and 'x' in data]
+    
+    offline = list(range(steps, 2 * steps))
+    replayed_state = xs('/state/replay')
+    replayed_position = xs('/position/replay')
+    expected_position = offline[::-1] if STORE_FORWARD_CONFIG['classes']['position'].get('order') == 'lifo' else offline
+    print(f"  estado reenviado: {replayed_state}")
+    print(f"  posição reenviada: {replayed_position}")
+    if replayed_state != offline:
+        failures.append(f"estado reenviado fora de ordem ou incompleto: {replayed_state}")
+    if replayed_position != expected_position:
+        failures.append(f"posição reenviada fora da ordem configurada: {replayed_position}")
+    
+    live = xs('/state')
+    if live != list(range(0, steps)) + list(range(2 * steps, 3 * steps)):
+        failures.append(f"estado ao vivo incompleto: {live}")
+    if client.messages_lost:
+        failures.append(f"{client.messages_lost} mensagens perdidas")
+    return failures
+
+if __name__ == "__main__":
+    failures = main()
+    for failure in failures:
+        print(f"  ❌ {failure}")
+    if failures:
+        sys.exit(1)
+    print("  ✓ telemetria da queda armazenada e reenviada em ordem após reconectar")
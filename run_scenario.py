@@ -0,0 +1,98 @@
+import csv
+import glob
+import json
+import os
+import sys
+from config.settings import SCENARIO_CONFIG
+from src.simulation.scenario import load_scenario
+from src.simulation.scenario_runner import ScenarioRunner
+
+def _arg(name: str, default, cast=float):
+    if name not in sys.argv:
+        return default
+    idx = sys.argv.index(name)
+    if idx + 1 >= len(sys.argv):
+        return default
+    return cast(sys.argv[idx + 1])
+
+def _paths() -> list:
+    paths, skip = [], False
+    for arg in sys.argv[1:]:
+        if skip:
+            skip = False
+        elif arg.startswith('--'):
+            skip = arg not in ('--verbose',)
+        else:
+            paths.append(arg)
+    if paths:
+        return paths
+    return sorted(path for pattern in ('*.json', '*.yaml', '*.yml')
+                  for path in glob.glob(os.path.join(SCENARIO_CONFIG['directory'], pattern)))
+
+def _print_result(result: dict):
+    scenario = result['scenario']
+    print(f"\n  {scenario['name']} | {scenario['trucks']} caminhões | {scenario['duration']:.0f}s | "
+          f"semente {scenario['seed']}")
+    for event in result['events']:
+        target = f"caminhão {event['truck']}" if event['truck'] is not None else "todos"
+        print(f"    t={event['time']:6.1f}s  {event['type']} ({target})")
+    for truck in result['fleet']:
+        route = f"rota concluída em {truck['route_completed_at']:.1f}s" if truck['route_completed_at'] else "rota pendente"
+        print(f"    Caminhão {truck['truck_id']}: ({truck['x']:.1f}, {truck['y']:.1f}) {truck['status']} | "
+              f"{truck['distance']:.0f}m | {route} | paradas por falha {truck['stops']} "
+              f"({truck['stopped_time']:.0f}s)" + (" | SAIU DO MAPA" if truck['left_map'] else ""))
+    separation = result['min_separation']
+    if separation is not None:
+        print(f"    menor distância entre caminhões: {separation:.1f}m | aproximações perigosas: "
+              f"{result['close_calls']}")
+    if scenario['dispatch']:
+        print(f"    {result['cycles']} ciclos | {result['tonnes_per_hour']:.0f} t/h | parado em trânsito "
+              f"{result['stalled_fraction']:.1%}")
+    if not result['valid']:
+        print(f"    ⚠️ EXECUÇÃO INVÁLIDA: {'; '.join(result['invalid_reasons'])}")
+
+def _write_trace(path: str, trace: list):
+    if not trace:
+        return
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(trace[0].keys()))
+        writer.writeheader()
+        writer.writerows(trace)
+
+def main():
+    paths = _paths()
+    seed = _arg('--seed', None, int)
+    duration = _arg('--duration', None)
+    output = _arg('--json', None, str)
+    trace = _arg('--trace', None, str)
+    
+    print("="*70)
+    print("EXECUÇÃO DE CENÁRIOS".center(70))
+    print("="*70)
+    if not paths:
+        print(f"Nenhum cenário encontrado em {SCENARIO_CONFIG['directory']}/")
+        return
+    
+    results = []
+    for path in paths:
+        scenario = load_scenario(path)
+        if seed is not None:
+            scenario.seed = seed
+        if duration is not None:
+            scenario.duration = duration
+        runner = ScenarioRunner(scenario)
+        result = runner.run(quiet='--verbose' not in sys.argv)
+        results.append(result)
+        _print_result(result)
+        if trace:
+            trace_path = trace if len(paths) == 1 else f"{os.path.splitext(trace)[0]}_{scenario.name}.csv"
+            _write_trace(trace_path, runner.trace)
+            print(f"    trajetórias salvas em {trace_path}")
+    
+    if output:
+        with open(output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResultados salvos em {output}")
+
+if __name__ == "__main__":
+    main()
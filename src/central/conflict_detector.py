@@ -0,0 +1,122 @@
+from dataclasses import dataclass
+from typing import List, Tuple
+import numpy as np
+
+@dataclass(frozen=True)
+class Conflict:
+    truck_a: int
+    truck_b: int
+    time_to_cpa: float
+    min_distance: float
+    distance_now: float
+    point: Tuple[float, float]
+    
+    def to_dict(self) -> dict:
+        return {
+            'trucks': [self.truck_a, self.truck_b],
+            'time': self.time_to_cpa,
+            'distance': self.min_distance,
+            'distance_now': self.distance_now,
+            'point': list(self.point),
+        }
+
+class ConflictDetector:
+    
+    def __init__(self, horizon: float = 10.0, safety_distance: float = 5.0, cell_size: float = None):
+        self.horizon = horizon
+        self.safety_distance = safety_distance
+        self.cell_size = cell_size
+        
+        self.last_candidates = 0
+    
+    def detect(self, ids: np.ndarray, x: np.ndarray, y: np.ndarray,
+               vx: np.ndarray, vy: np.ndarray) -> List[Conflict]:
+        if len(ids) < 2:
+            self.last_candidates = 0
+            return []
+        
+        first, second = self.candidate_pairs(x, y, vx, vy)
+        self.last_candidates = len(first)
+        if len(first) == 0:
+            return []
+        
+        px = x[second] - x[first]
+        py = y[second] - y[first]
+        rvx = vx[second] - vx[first]
+        rvy = vy[second] - vy[first]
+        
+        speed_sq = rvx * rvx + rvy * rvy
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t = np.where(speed_sq > 1e-9, -(px * rvx + py * rvy) / speed_sq, 0.0)
+        t = np.clip(t, 0.0, self.horizon)
+        
+        dx = px + rvx * t
+        dy = py + rvy * t
+        min_distance = np.hypot(dx, dy)
+        hits = np.flatnonzero(min_distance < self.safety_distance)
+        
+        distance_now = np.hypot(px, py)
+        mid_x = (x[first] + x[second] + (vx[first] + vx[second]) * t) / 2
+        mid_y = (y[first] + y[second] + (vy[first] + vy[second]) * t) / 2
+        
+        low_id = np.minimum(ids[first], ids[second])
+        high_id = np.maximum(ids[first], ids[second])
+        conflicts = [Conflict(int(low_id[i]), int(high_id[i]), float(t[i]),
+                              float(min_distance[i]), float(distance_now[i]),
+                              (float(mid_x[i]), float(mid_y[i])))
+                     for i in hits]
+        conflicts.sort(key=lambda conflict: (conflict.time_to_cpa, conflict.min_distance))
+        return conflicts
+    
+    def candidate_pairs(self, x: np.ndarray, y: np.ndarray,
+                        vx: np.ndarray, vy: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        margin = self.safety_distance / 2
+        end_x = x + vx * self.horizon
+        end_y = y + vy * self.horizon
+        
+        cell = self.cell_size
+        if not cell:
+            reach = np.hypot(vx, vy).max() * self.horizon
+            cell = max(self.safety_distance, reach + self.safety_distance)
+        
+        cx0 = np.floor((np.minimum(x, end_x) - margin) / cell).astype(np.int64)
+        cx1 = np.floor((np.maximum(x, end_x) + margin) / cell).astype(np.int64)
+        cy0 = np.floor((np.minimum(y, end_y) - margin) / cell).astype(np.int64)
+        cy1 = np.floor((np.maximum(y, end_y) + margin) / cell).astype(np.int64)
+        
+        members = []
+        keys = []
+        span_x = int((cx1 - cx0).max())
+        span_y = int((cy1 - cy0).max())
+        for ox in range(span_x + 1):
+            for oy in range(span_y + 1):
+                inside = (cx0 + ox <= cx1) & (cy0 + oy <= cy1)
+                rows = np.flatnonzero(inside)
+                members.append(rows)
+                keys.append(((cx0[rows] + ox) << 32) ^ ((cy0[rows] + oy) & 0xFFFFFFFF))
+        members = np.concatenate(members)
+        keys = np.concatenate(keys)
+        
+        order = np.argsort(keys, kind='stable')
+        members = members[order]
+        keys = keys[order]
+        
+        first = []
+        second = []
+        offset = 1
+        while offset < len(keys):
+            same = np.flatnonzero(keys[offset:] == keys[:-offset])
+            if len(same) == 0:
+                break
+            first.append(members[same])
+            second.append(members[same + offset])
+            offset += 1
+        if not first:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        
+        first = np.concatenate(first)
+        second = np.concatenate(second)
+        low = np.minimum(first, second)
+        high = np.maximum(first, second)
+        pairs = np.unique(low * len(x) + high)
+        return pairs // len(x), pairs % len(x)
@@ -0,0 +1,275 @@
+import json
+import math
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional, Tuple
+import numpy as np
+from src.central.telemetry_history import HISTORY_FIELDS, RollupTier
+from src.models.route_update import RouteOperation
+
+class APIError(Exception):
+    
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+def _number(source: dict, name: str, default, cast=float, minimum: float = None):
+    value = source.get(name, default)
+    try:
+        value = cast(value)
+    except (TypeError, ValueError):
+        raise APIError(400, f"'{name}' deve ser numérico: {value!r}")
+    if isinstance(value, float) and not math.isfinite(value):
+        raise APIError(400, f"'{name}' deve ser finito")
+    if minimum is not None and value < minimum:
+        raise APIError(400, f"'{name}' deve ser no mínimo {minimum:g}")
+    return value
+
+def _waypoints(raw) -> List[Tuple[float, float]]:
+    if not isinstance(raw, list):
+        raise APIError(400, "'waypoints' deve ser uma lista de pares [x, y]")
+    waypoints = []
+    for wp in raw:
+        if not isinstance(wp, (list, tuple)) or len(wp) != 2:
+            raise APIError(400, f"waypoint inválido: {wp!r}")
+        point = dict(zip(('x', 'y'), wp))
+        waypoints.append((_number(point, 'x', None), _number(point, 'y', None)))
+    return waypoints
+
+class FleetAPIHandler(BaseHTTPRequestHandler):
+    
+    service = None
+    
+    def do_GET(self):
+        self._handle(self._get)
+    
+    def do_POST(self):
+        self._handle(self._post)
+    
+    def _handle(self, method):
+        try:
+            method()
+        except APIError as e:
+            self._reply(e.code, {'error': e.message})
+        except Exception as e:
+            self._reply(500, {'error': f'erro interno: {e}'})
+    
+    def _get(self):
+        parts, query = self._parse_path()
+        if parts == ['fleet']:
+            snapshot = self.service.snapshot(_number(query, 'since', 0, int, minimum=0))
+            snapshot['trucks'] = {str(truck_id): data for truck_id, data in snapshot['trucks'].items()}
+            return self._reply(200, snapshot)
+        if parts == ['fleet', 'summary']:
+            return self._reply(200, self.service.summary())
+        if parts == ['fleet', 'near']:
+            trucks = self.service.near(_number(query, 'x', 0.0), _number(query, 'y', 0.0),
+                                       _number(query, 'radius', 10.0, minimum=0.0))
+            return self._reply(200, {'trucks': trucks})
+        if parts == ['fleet', 'conflicts']:
+            return self._reply(200, {'conflicts': self.service.conflict_list()})
+        if parts == ['dispatch']:
+            return self._reply(200, {'dispatch': self.service.dispatch_state()})
+        if parts == ['zones']:
+            return self._reply(200, {'zones': self.service.zone_list()})
+        if parts == ['metrics']:
+            return self._reply(200, self.service.metrics())
+        
+        truck_id = self._truck_id(parts)
+        if truck_id is None:
+            return self._reply(404, {'error': 'rota inexistente'})
+        
+        if len(parts) == 2:
+            data = self.service.truck(truck_id)
+            if data is None:
+                return self._reply(404, {'error': f'caminhão {truck_id} desconhecido'})
+            return self._reply(200, data)
+        if len(parts) != 3:
+            return self._reply(404, {'error': 'rota inexistente'})
+        if parts[2] == 'trail':
+            trail = self.service.trail(truck_id, _number(query, 'seconds', 300.0, minimum=0.0),
+                                       _number(query, 'tolerance', 0.0, minimum=0.0))
+            return self._reply(200, {'points': trail.tolist()})
+        if parts[2] == 'series':
+            field = query.get('field', 'velocity')
+            if field not in HISTORY_FIELDS:
+                raise APIError(404, f"campo desconhecido: {field} (disponíveis: {', '.join(HISTORY_FIELDS)})")
+            bucket = _number(query, 'bucket', 1.0)
+            if bucket not in self.service.history.tier_config:
+                tiers = ', '.join(f"{seconds:g}" for seconds in sorted(self.service.history.tier_config))
+                raise APIError(404, f"resolução desconhecida: {bucket:g}s (disponíveis: {tiers})")
+            stat = query.get('stat', 'mean')
+            if stat not in RollupTier.STATS:
+                raise APIError(400, f"estatística desconhecida: {stat} "
+                                    f"(disponíveis: {', '.join(RollupTier.STATS)})")
+            t, values = self.service.series(truck_id, field, bucket,
+                                            _number(query, 'seconds', 300.0, minimum=0.0), stat)
+            return self._reply(200, {'t': t.tolist(), 'values': values.tolist()})
+        return self._reply(404, {'error': 'rota inexistente'})
+    
+    def _post(self):
+        parts, _ = self._parse_path()
+        truck_id = self._truck_id(parts)
+        if truck_id is None or len(parts) != 3:
+            return self._reply(404, {'error': 'rota inexistente'})
+        
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            body = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            return self._reply(400, {'error': 'JSON inválido'})
+        if not isinstance(body, dict):
+            return self._reply(400, {'error': 'o corpo deve ser um objeto JSON'})
+        
+        if parts[2] == 'command':
+            command_type = body.get('type', '')
+            if not isinstance(command_type, str):
+                raise APIError(400, "'type' deve ser texto")
+            ok, message = self.service.send_command(truck_id, command_type)
+        elif parts[2] == 'setpoint':
+            ok, message = self.service.send_setpoint(truck_id, _number(body, 'velocity', 0.0),
+                                                     _number(body, 'angular', 0.0))
+        elif parts[2] == 'route':
+            try:
+                operation = RouteOperation(body.get('operation', RouteOperation.REPLACE.value))
+            except ValueError:
+                return self._reply(400, {'error': 'operação de rota inválida'})
+            ok, message = self.service.send_route(truck_id, _waypoints(body.get('waypoints', [])), operation)
+        else:
+            return self._reply(404, {'error': 'rota inexistente'})
+        return self._reply(200 if ok else 409, {'ok': ok, 'message': message})
+    
+    def log_message(self, format, *args):
+        pass
+    
+    def _parse_path(self):
+        url = urllib.parse.urlsplit(self.path)
+        parts = [part for part in url.path.split('/') if part]
+        query = {key: values[-1] for key, values in urllib.parse.parse_qs(url.query).items()}
+        return parts, query
+    
+    def _truck_id(self, parts: List[str]) -> Optional[int]:
+        if len(parts) < 2 or parts[0] != 'trucks' or not parts[1].isdigit():
+            return None
+        return int(parts[1])
+    
+    def _reply(self, code: int, body: dict):
+        payload = json.dumps(body).encode()
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+class FleetAPIServer(threading.Thread):
+    
+    def __init__(self, service, host: str = "127.0.0.1", port: int = 8765):
+        super().__init__(name="FleetAPIServer", daemon=True)
+        handler = type('BoundFleetAPIHandler', (FleetAPIHandler,), {'service': service})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self.address = self.httpd.server_address
+    
+    def run(self):
+        self.httpd.serve_forever(poll_interval=0.5)
+    
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+class FleetAPIClient:
+    
+    def __init__(self, base_url: str = "http://127.0.0.1:8765", timeout: float = 2.0):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+    
+    def snapshot(self, since: int = 0) -> dict:
+        try:
+            snapshot = self._get('/fleet', since=since)
+        except OSError as e:
+            return {'version': since, 'status': f"❌ Serviço central indisponível ({self.base_url}): {e}",
+                    'trucks': {}}
+        snapshot['trucks'] = {int(truck_id): data for truck_id, data in snapshot['trucks'].items()}
+        return snapshot
+    
+    def truck(self, truck_id: int) -> Optional[dict]:
+        try:
+            return self._get(f'/trucks/{truck_id}')
+        except urllib.error.HTTPError as e:
+            if e.code == 404:
+                return None
+            raise
+    
+    def trail(self, truck_id: int, seconds: float, tolerance: float = 0.0) -> np.ndarray:
+        try:
+            points = self._get(f'/trucks/{truck_id}/trail', seconds=seconds, tolerance=tolerance)['points']
+        except OSError:
+            return np.empty((0, 2))
+        return np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    
+    def series(self, truck_id: int, field: str, bucket_seconds: float, seconds: float,
+               stat: str = 'mean') -> Tuple[np.ndarray, np.ndarray]:
+        try:
+            data = self._get(f'/trucks/{truck_id}/series', field=field, bucket=bucket_seconds,
+                             seconds=seconds, stat=stat)
+        except OSError:
+            return np.empty(0), np.empty(0)
+        return np.asarray(data['t'], dtype=np.float64), np.asarray(data['values'], dtype=np.float64)
+    
+    def summary(self) -> dict:
+        return self._get('/fleet/summary')
+    
+    def near(self, x: float, y: float, radius: float) -> List[int]:
+        return self._get('/fleet/near', x=x, y=y, radius=radius)['trucks']
+    
+    def conflict_list(self) -> List[dict]:
+        return self._get('/fleet/conflicts')['conflicts']
+    
+    def dispatch_state(self) -> Optional[dict]:
+        return self._get('/dispatch')['dispatch']
+    
+    def zone_list(self) -> dict:
+        return self._get('/zones')['zones']
+    
+    def metrics(self) -> dict:
+        return self._get('/metrics')
+    
+    def record_render(self, started: float, finished: float):
+        pass
+    
+    def send_command(self, truck_id: int, command_type: str) -> Tuple[bool, str]:
+        return self._post(f'/trucks/{truck_id}/command', {'type': command_type})
+    
+    def send_setpoint(self, truck_id: int, velocity: float, angular: float = 0.0) -> Tuple[bool, str]:
+        return self._post(f'/trucks/{truck_id}/setpoint', {'velocity': velocity, 'angular': angular})
+    
+    def send_route(self, truck_id: int, waypoints: List,
+                   operation: RouteOperation = RouteOperation.REPLACE) -> Tuple[bool, str]:
+        return self._post(f'/trucks/{truck_id}/route',
+                          {'waypoints': [list(wp) for wp in waypoints], 'operation': operation.value})
+    
+    def _get(self, path: str, **params) -> dict:
+        url = self.base_url + path
+        if params:
+            url += '?' + urllib.parse.urlencode(params)
+        with urllib.request.urlopen(url, timeout=self.timeout) as response:
+            return json.loads(response.read())
+    
+    def _post(self, path: str, body: dict) -> Tuple[bool, str]:
+        request = urllib.request.Request(self.base_url + path, data=json.dumps(body).encode(),
+                                         headers={'Content-Type': 'application/json'}, method='POST')
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                result = json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            try:
+                result = json.loads(e.read())
+            except ValueError:
+                return False, f"❌ Erro do serviço central (HTTP {e.code})"
+        except OSError as e:
+            return False, f"❌ Serviço central indisponível: {e}"
+        return result.get('ok', False), result.get('message', result.get('error', ''))
@@ -0,0 +1,628 @@
+import json
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from config.settings import (
+    CENTRAL_METRICS_CONFIG, CENTRAL_SERVICE_CONFIG, CONFLICT_CONFIG, DISPATCH_CONFIG, HISTORY_CONFIG,
+    RECONNECT_CONFIG, ROUTE_CONFIG, TELEMETRY_CONFIG, ZONE_CONFIG
+)
+from src.models.route_update import RouteOperation, RouteUpdate
+from src.embedded.communication.route_stream import build_route_messages
+from src.embedded.communication.telemetry_codec import MODE_NAMES, decode_payload
+from src.central.state_reconstructor import StateReconstructor
+from src.central.ingest_metrics import IngestMetrics
+from src.central.truck_update_queue import TruckUpdateQueue
+from src.central.telemetry_history import TelemetryHistory
+from src.central.fleet_table import FleetTable
+from src.central.conflict_detector import Conflict, ConflictDetector
+from src.central.zone_reservation import Reservation, ZoneReservationManager
+from src.central.haul_dispatcher import HaulDispatcher
+from src.models.zone import zones_from_config
+from src.models.site import sites_from_config
+from src.embedded.communication.topic_router import TopicRouter
+from src.embedded.communication.reconnect import ReconnectManager
+from src.embedded.communication.transport import (
+    ERR_SUCCESS, MQTT_AVAILABLE, TRANSPORT_LOOPBACK, TRANSPORT_PAHO, Transport, create_transport
+)
+
+COMMAND_MESSAGES = {
+    'ENABLE_AUTOMATIC': "✅ Modo AUTOMÁTICO enviado para caminhão {truck_id}",
+    'DISABLE_AUTOMATIC': "✅ Modo MANUAL enviado para caminhão {truck_id}",
+    'EMERGENCY_STOP': "⚠ EMERGÊNCIA enviada para caminhão {truck_id}",
+    'RESET_FAULT': "✓ REARME enviado para caminhão {truck_id}",
+    'MOVE_FORWARD': "✓ Comando FRENTE enviado",
+    'MOVE_BACKWARD': "✓ Comando RÉ enviado",
+    'TURN_LEFT': "✓ Comando ESQUERDA enviado",
+    'TURN_RIGHT': "✓ Comando DIREITA enviado",
+    'ACCELERATE': "✓ Comando ACELERAR enviado",
+    'BRAKE': "✓ Comando FREIAR enviado",
+}
+
+FAULT_SAFE_COMMANDS = ('EMERGENCY_STOP', 'RESET_FAULT')
+
+class FleetService(threading.Thread):
+    
+    def __init__(self, broker_host: str = "localhost", broker_port: int = 1883,
+                 transport: Transport = None, transport_kind: str = TRANSPORT_PAHO,
+                 dispatch: bool = None):
+        super().__init__(name="FleetService", daemon=True)
+        
+        self.broker_host = broker_host
+        self.broker_port = broker_port
+        self.transport = transport
+        self.transport_kind = transport_kind
+        
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self.table = FleetTable()
+        self.version = 0
+        self._removed: Dict[int, int] = {}
+        self.status = "⏳ Aguardando conexão MQTT..."
+        self._route_seq: Dict[int, int] = {}
+        self._route_pending: Dict[int, Dict[int, dict]] = {}
+        self._route_plans: Dict[int, List] = {}
+        self.route_resends = 0
+        self.route_failures = 0
+        self.route_fallbacks = 0
+        
+        self.router = TopicRouter()
+        self.router.add_route("mine/truck/+/state", self._ingest_state)
+        self.router.add_route("mine/truck/+/position", self._ingest_position)
+        self.router.add_route("mine/truck/+/+/replay", self._ingest_replay)
+        self.router.add_route("mine/truck/+/route/ack", self._ingest_route_ack)
+        self.router.add_route("mine/truck/+/zone_request", self._ingest_zone_request)
+        self.router.add_route("mine/truck/+/zone_release", self._ingest_zone_release)
+        self.state_reconstructor = StateReconstructor(
+            request_keyframe=self._request_keyframe,
+            request_interval=TELEMETRY_CONFIG['keyframe_request_interval']
+        )
+        self.ingest_metrics = IngestMetrics()
+        self.update_queue = TruckUpdateQueue()
+        self.history = TelemetryHistory(HISTORY_CONFIG['raw_capacity'], HISTORY_CONFIG['tiers'])
+        self._last_metrics_publish = time.time()
+        self.conflict_detector = ConflictDetector(CONFLICT_CONFIG['horizon'],
+                                                  CONFLICT_CONFIG['safety_distance'],
+                                                  CONFLICT_CONFIG['cell_size'])
+        self.conflicts: List[Conflict] = []
+        self._last_conflict_check = 0.0
+        self.zones = ZoneReservationManager(
+            zones_from_config(ZONE_CONFIG['zones']) if ZONE_CONFIG['enabled'] else [],
+            clearance=ZONE_CONFIG['clearance'],
+            grace=ZONE_CONFIG['grace'],
+            max_duration=ZONE_CONFIG['max_duration'],
+            max_wait=ZONE_CONFIG['max_wait']
+        )
+        
+        self.dispatcher = None
+        if DISPATCH_CONFIG['enabled'] if dispatch is None else dispatch:
+            self.dispatcher = HaulDispatcher(
+                sites_from_config(DISPATCH_CONFIG['sites']),
+                speed=DISPATCH_CONFIG['speed'],
+                arrival_radius=DISPATCH_CONFIG['arrival_radius'],
+                service_radius=DISPATCH_CONFIG['service_radius'],
+                staging_distance=DISPATCH_CONFIG['staging_distance'],
+                staging_spacing=DISPATCH_CONFIG['staging_spacing'],
+                stop_speed=DISPATCH_CONFIG['stop_speed'],
+                cache_tolerance=DISPATCH_CONFIG['cache_tolerance'],
+                progress_timeout=DISPATCH_CONFIG['progress_timeout'],
+                progress_distance=DISPATCH_CONFIG['progress_distance'],
+                detour_distance=DISPATCH_CONFIG['detour_distance']
+            )
+        self._last_dispatch = 0.0
+        
+        self.mqtt_client = None
+        self.mqtt_connected = False
+        self._mqtt_loop_started = False
+        self.reconnect_manager = None
+    
+    def connect(self) -> bool:
+        if self.transport is None and self.transport_kind != TRANSPORT_LOOPBACK and not MQTT_AVAILABLE:
+            self.status = "❌ paho-mqtt não instalado - sem conexão MQTT"
+            return False
+        
+        self.mqtt_client = self.transport or create_transport(
+            self.transport_kind, "mine_management", clean_session=RECONNECT_CONFIG['clean_session'])
+        
+        self.mqtt_client.on_connect = self._on_mqtt_connect
+        self.mqtt_client.on_disconnect = self._on_mqtt_disconnect
+        self.mqtt_client.on_message = self._on_mqtt_message
+        
+        self.reconnect_manager = ReconnectManager(
+            self._connect_mqtt, lambda: self.mqtt_connected,
+            initial_delay=RECONNECT_CONFIG['initial_delay'],
+            max_delay=RECONNECT_CONFIG['max_delay'],
+            multiplier=RECONNECT_CONFIG['multiplier'],
+            jitter=RECONNECT_CONFIG['jitter'],
+            connect_timeout=RECONNECT_CONFIG['connect_timeout'],
+            name="Reconnect-central"
+        )
+        self.reconnect_manager.mark_connecting()
+        try:
+            self._connect_mqtt()
+        except Exception as e:
+            self.reconnect_manager.notify_failed()
+            self.update_queue.post_status(f"Erro MQTT: {e} - tentando reconectar")
+        self.reconnect_manager.start()
+        return True
+    
+    def run(self):
+        period = CENTRAL_SERVICE_CONFIG['apply_period']
+        while not self._stop_event.wait(period):
+            self._apply_pending_updates()
+            now = time.time()
+            self._expire_stale(now)
+            self._resend_routes(now)
+            self._update_zones(now)
+            if now - self._last_conflict_check >= CONFLICT_CONFIG['period']:
+                self._detect_conflicts(now)
+            if self.dispatcher and now - self._last_dispatch >= DISPATCH_CONFIG['period']:
+                self._dispatch(now)
+            if now - self._last_metrics_publish >= CENTRAL_METRICS_CONFIG['period']:
+                self._publish_metrics(now)
+    
+    def stop(self):
+        self._stop_event.set()
+        if self.reconnect_manager:
+            self.reconnect_manager.stop()
+        if self.mqtt_client:
+            self.mqtt_client.loop_stop()
+            self.mqtt_client.disconnect()
+    
+    def snapshot(self, since: int = 0) -> dict:
+        self._apply_pending_updates()
+        with self._lock:
+            changed = {truck_id: self.table.get(truck_id) for truck_id in self.table.changed_since(since)}
+            removed = [truck_id for truck_id, version in self._removed.items() if version > since]
+            return {'version': self.version, 'status': self.status, 'trucks': changed, 'removed': removed,
+                    'conflicts': [conflict.to_dict() for conflict in self.conflicts],
+                    'zones': self.zones.snapshot(time.time()),
+                    'dispatch': self.dispatcher.snapshot() if self.dispatcher else None}
+    
+    def truck(self, truck_id: int) -> Optional[dict]:
+        self._apply_pending_updates()
+        with self._lock:
+            return self.table.get(truck_id)
+    
+    def summary(self) -> dict:
+        self._apply_pending_updates()
+        with self._lock:
+            return {
+                'trucks': len(self.table),
+                'status_counts': self.table.status_counts(),
+                'in_fault': self.table.in_fault(),
+                'average_speed': self.table.mean('velocity'),
+                'average_temperature': self.table.mean('temperature'),
+                'conflicts': len(self.conflicts),
+            }
+    
+    def near(self, x: float, y: float, radius: float) -> List[int]:
+        self._apply_pending_updates()
+        with self._lock:
+            return self.table.within(x, y, radius)
+    
+    def conflict_list(self) -> List[dict]:
+        with self._lock:
+            return [conflict.to_dict() for conflict in self.conflicts]
+    
+    def zone_list(self) -> dict:
+        with self._lock:
+            return self.zones.snapshot(time.time())
+    
+    def dispatch_state(self) -> Optional[dict]:
+        with self._lock:
+            return self.dispatcher.snapshot() if self.dispatcher else None
+    
+    def trail(self, truck_id: int, seconds: float, tolerance: float = 0.0) -> np.ndarray:
+        return self.history.trail(truck_id, time.time() - seconds, tolerance)
+    
+    def series(self, truck_id: int, field: str, bucket_seconds: float, seconds: float,
+               stat: str = 'mean') -> Tuple[np.ndarray, np.ndarray]:
+        return self.history.series(truck_id, field, bucket_seconds, time.time() - seconds, stat)
+    
+    def metrics(self) -> dict:
+        metrics = self.ingest_metrics.snapshot(reset=False)
+        with self._lock:
+            metrics['trucks'] = len(self.table)
+        metrics['mqtt_connected'] = self.mqtt_connected
+        if self.reconnect_manager:
+            metrics['reconnect'] = self.reconnect_manager.get_metrics()
+        metrics['history_bytes'] = self.history.memory_bytes()
+        with self._lock:
+            metrics['routes'] = {'pending': sum(len(pending) for pending in self._route_pending.values()),
+                                 'resends': self.route_resends, 'failures': self.route_failures,
+                                 'fallbacks': self.route_fallbacks}
+            metrics['zones'] = self.zones.metrics()
+            if self.dispatcher:
+                metrics['dispatch'] = self.dispatcher.metrics()
+        return metrics
+    
+    def record_render(self, started: float, finished: float):
+        self.ingest_metrics.record_render(started, finished)
+    
+    def send_command(self, truck_id: int, command_type: str) -> Tuple[bool, str]:
+        message = COMMAND_MESSAGES.get(command_type)
+        if message is None:
+            return False, f"⚠ Comando desconhecido: {command_type}"
+        if command_type not in FAULT_SAFE_COMMANDS and self._has_fault(truck_id):
+            return False, "⚠ Caminhão com FALHA ATIVA! Use REARMAR primeiro"
+        if not self._publish(f"mine/truck/{truck_id}/command", json.dumps({"type": command_type})):
+            return False, "⚠ Sem conexão MQTT - comando não enviado"
+        if self.dispatcher and command_type == 'ENABLE_AUTOMATIC':
+            with self._lock:
+                self.dispatcher.resume(truck_id)
+        return True, message.format(truck_id=truck_id)
+    
+    def send_setpoint(self, truck_id: int, velocity: float, angular: float = 0.0) -> Tuple[bool, str]:
+        payload = json.dumps({"velocity": velocity, "angular": angular})
+        if not self._publish(f"mine/truck/{truck_id}/setpoint", payload):
+            return False, "⚠ Sem conexão MQTT - setpoint não enviado"
+        return True, f"Setpoint enviado para caminhão {truck_id}"
+    
+    def send_route(self, truck_id: int, waypoints: List,
+                   operation: RouteOperation = RouteOperation.REPLACE) -> Tuple[bool, str]:
+        if self._has_fault(truck_id):
+            return False, "⚠ Caminhão com FALHA ATIVA! Use REARMAR primeiro"
+        if not waypoints:
+            return False, "⚠ Adicione waypoints antes de enviar rota"
+        if self.mqtt_client is None:
+            return False, "⚠ Sem conexão MQTT - rota não enviada"
+        
+        if self.dispatcher:
+            with self._lock:
+                self.dispatcher.pause(truck_id)
+        count = self._publish_route(truck_id, waypoints, operation)
+        if count == 0:
+            if self.dispatcher:
+                with self._lock:
+                    self.dispatcher.resume(truck_id)
+            return False, "⚠ Sem conexão MQTT - rota não enviada"
+        return True, f"✓ Rota com {len(waypoints)} waypoints enviada ({count} mensagem(ns))"
+    
+    def _publish_route(self, truck_id: int, waypoints: List, operation: RouteOperation) -> int:
+        now = time.time()
+        with self._lock:
+            # each truck checks its own sequence for gaps, so the counter is kept per truck
+            seq = self._route_seq.get(truck_id, int(time.time() * 1000))
+            messages = build_route_messages(waypoints, seq, operation,
+                                            chunk_size=ROUTE_CONFIG['chunk_size'])
+            self._route_seq[truck_id] = max(message['seq'] for message in messages) + 1
+            # a new full route makes every unacknowledged piece of the previous one obsolete
+            pending = self._route_pending.setdefault(truck_id, {})
+            if operation == RouteOperation.REPLACE:
+                pending.clear()
+            for message in messages:
+                entry = pending.setdefault(message['seq'], {'messages': [], 'attempts': 0})
+                entry['messages'].append(message)
+                entry['due'] = now + ROUTE_CONFIG['ack_timeout']
+        published = sum(self._publish(f"mine/truck/{truck_id}/route", json.dumps(message))
+                        for message in messages)
+        if published == 0:
+            # nothing left the service: report the failure now instead of resending behind the caller's back
+            with self._lock:
+                for message in messages:
+                    pending.pop(message['seq'], None)
+            return published
+        with self._lock:
+            self._route_plans[truck_id] = RouteUpdate(operation, list(waypoints)).apply(
+                self._route_plans.get(truck_id, []))
+        return published
+    
+    def _fall_back_to_full_route(self, truck_id: int, reason: str):
+        with self._lock:
+            plan = list(self._route_plans.get(truck_id, []))
+            if plan:
+                self.route_fallbacks += 1
+        if plan:
+            print(f"[ROTA] Caminhão {truck_id}: {reason} - reenviando rota completa ({len(plan)} waypoints)")
+            self._publish_route(truck_id, plan, RouteOperation.REPLACE)
+    
+    def _ingest_route_ack(self, truck_id: int, payload: bytes):
+        data = json.loads(payload)
+        seq = data.get('seq')
+        if data.get('status') == 'gap':
+            self._recover_route_gap(truck_id, seq)
+            return
+        with self._lock:
+            pending = self._route_pending.get(truck_id, {})
+            if data.get('status') != 'rejected':
+                pending.pop(seq, None)
+                return
+            entry = pending.get(seq)
+            if entry is None:
+                return
+            # resent from run() after a short pause so a full route queue gets time to drain
+            entry['due'] = min(entry['due'], time.time() + ROUTE_CONFIG['resend_interval'])
+        print(f"[ROTA] Caminhão {truck_id} rejeitou seq {seq}: {data.get('detail', '')}")
+    
+    def _recover_route_gap(self, truck_id: int, seq: int):
+        with self._lock:
+            pending = self._route_pending.get(truck_id, {})
+            if seq not in pending:
+                return
+            # the truck parked this seq behind a missing one: keep it pending and resend the missing ones now
+            missing = [earlier for earlier in pending if earlier < seq]
+            for earlier in missing:
+                pending[earlier]['due'] = time.time()
+        if not missing:
+            self._fall_back_to_full_route(truck_id, f"seq anterior a {seq} perdida")
+    
+    def _resend_routes(self, now: float):
+        resend = []
+        fallback = {}
+        with self._lock:
+            for truck_id, pending in self._route_pending.items():
+                for seq, entry in sorted(pending.items()):
+                    if now < entry['due']:
+                        continue
+                    if entry['attempts'] >= ROUTE_CONFIG['max_resends']:
+                        del pending[seq]
+                        self.route_failures += 1
+                        print(f"[ROTA] Caminhão {truck_id}: seq {seq} sem confirmação após "
+                              f"{entry['attempts']} reenvios - desistindo")
+                        # later pieces can never be applied without this one
+                        if any(later > seq for later in pending):
+                            fallback[truck_id] = seq
+                        continue
+                    entry['attempts'] += 1
+                    entry['due'] = now + ROUTE_CONFIG['ack_timeout']
+                    self.route_resends += 1
+                    resend.extend((truck_id, message) for message in entry['messages'])
+        for truck_id, message in resend:
+            self._publish(f"mine/truck/{truck_id}/route", json.dumps(message))
+        for truck_id, seq in fallback.items():
+            self._fall_back_to_full_route(truck_id, f"seq {seq} perdida")
+    
+    def _has_fault(self, truck_id: int) -> bool:
+        self._apply_pending_updates()
+        with self._lock:
+            return self.table.has_fault(truck_id)
+    
+    def _publish(self, topic: str, payload: str, qos: int = 1) -> bool:
+        if self.mqtt_client is None or not self.mqtt_connected:
+            return False
+        return self.mqtt_client.publish(topic, payload, qos=qos).rc == ERR_SUCCESS
+    
+    def _connect_mqtt(self) -> bool:
+        if not self._mqtt_loop_started:
+            self.mqtt_client.connect(self.broker_host, self.broker_port, 60)
+            self.mqtt_client.loop_start()
+            self._mqtt_loop_started = True
+        else:
+            self.mqtt_client.reconnect()
+        return True
+    
+    def _on_mqtt_connect(self, client, userdata, flags, rc):
+        if rc == 0:
+            self.mqtt_connected = True
+            self.reconnect_manager.notify_connected()
+            self.update_queue.post_status(f"✅ Conectado ao broker MQTT ({self.broker_host})")
+            for pattern in self.router.patterns():
+                client.subscribe(pattern, qos=1)
+        else:
+            self.update_queue.post_status(f"❌ Falha na conexão MQTT (código {rc})")
+            self.reconnect_manager.notify_failed()
+    
+    def _on_mqtt_disconnect(self, client, userdata, rc):
+        self.mqtt_connected = False
+        self.reconnect_manager.notify_disconnected()
+        self.update_queue.post_status(f"⚠ Desconectado do broker MQTT (código {rc}) - reconectando")
+    
+    def _on_mqtt_message(self, client, userdata, msg):
+        try:
+            resolved = self.router.resolve(msg.topic)
+            if resolved is None or resolved.truck_id is None:
+                return
+            resolved.dispatch(msg.payload)
+        
+        except Exception as e:
+            print(f"[ERRO] Falha ao processar mensagem MQTT: {e}")
+            import traceback
+            traceback.print_exc()
+    
+    def _ingest_state(self, truck_id: int, payload: bytes):
+        data = decode_payload(payload)
+        self.ingest_metrics.record_message(data.get('timestamp'))
+        fields = self.state_reconstructor.apply(truck_id, data)
+        if fields is None:
+            return
+        fields['last_update'] = time.time()
+        self.history.record(truck_id, fields.get('timestamp') or fields['last_update'], fields)
+        self.update_queue.put(truck_id, fields)
+    
+    def _ingest_position(self, truck_id: int, payload: bytes):
+        data = decode_payload(payload)
+        self.ingest_metrics.record_message(data.get('timestamp'))
+        data['last_update'] = time.time()
+        self.history.record(truck_id, data.get('timestamp') or data['last_update'], data)
+        self.update_queue.put(truck_id, data)
+    
+    def _ingest_replay(self, truck_id: int, payload: bytes):
+        data = decode_payload(payload)
+        self.ingest_metrics.record_message()
+        self.update_queue.increment(truck_id, 'replayed')
+        timestamp = data.get('timestamp')
+        if timestamp is None:
+            return
+        
+        self.history.record(truck_id, timestamp, data)
+        # buffered while offline, so usually older than what the truck sent live since reconnecting
+        with self._lock:
+            live = (self.table.get(truck_id) or {}).get('timestamp')
+        if live is None or timestamp > live:
+            self.update_queue.put_if_newer(truck_id, data, timestamp)
+    
+    def _ingest_zone_request(self, truck_id: int, payload: bytes):
+        data = json.loads(payload)
+        with self._lock:
+            reservation = self.zones.request(truck_id, data.get('zone'), time.time(),
+                                             float(data.get('eta', 0.0)), float(data.get('duration', 10.0)))
+        if reservation is None:
+            print(f"[ZONA] Caminhão {truck_id} pediu zona desconhecida: {data.get('zone')}")
+        else:
+            # answered even while waiting, so the truck knows a reservation service is there
+            self._publish_zone_grant(reservation, time.time())
+    
+    def _ingest_zone_release(self, truck_id: int, payload: bytes):
+        data = json.loads(payload)
+        with self._lock:
+            self.zones.release(truck_id, data.get('zone'), time.time())
+    
+    def _update_zones(self, now: float):
+        with self._lock:
+            granted = self.zones.update(now)
+        for reservation in granted:
+            print(f"[ZONA] {reservation.zone_id} concedida ao caminhão {reservation.truck_id} "
+                  f"após {now - reservation.requested_at:.1f}s")
+            self._publish_zone_grant(reservation, now)
+    
+    def _publish_zone_grant(self, reservation: Reservation, now: float):
+        with self._lock:
+            payload = json.dumps(self.zones.response(reservation, now))
+        self._publish(f"mine/truck/{reservation.truck_id}/zone_grant", payload)
+    
+    def _apply_pending_updates(self):
+        with self._lock:
+            updates, status = self.update_queue.drain()
+            if status is not None:
+                self.status = status
+            if not updates:
+                return
+            
+            self.version += 1
+            for truck_id, fields in updates.items():
+                if truck_id not in self.table:
+                    print(f"✓ Caminhão {truck_id} conectado")
+                    self._removed.pop(truck_id, None)
+                for field, amount in fields.pop('_increments', {}).items():
+                    self.table.increment(truck_id, field, amount)
+                self.table.update(truck_id, fields, self.version)
+    
+    def _expire_stale(self, now: float):
+        timeout = CENTRAL_SERVICE_CONFIG['stale_timeout']
+        with self._lock:
+            stale = self.table.truck_ids()[now - self.table.column('last_update') > timeout].tolist()
+            if not stale:
+                return
+            self.version += 1
+            for truck_id in stale:
+                self.table.remove(truck_id)
+                # kept so snapshot(since) can tell clients to drop the truck
+                self._removed[truck_id] = self.version
+                self._route_pending.pop(truck_id, None)
+                self._route_plans.pop(truck_id, None)
+                if self.dispatcher:
+                    self.dispatcher.forget(truck_id)
+        for truck_id in stale:
+            print(f"✗ Caminhão {truck_id} removido (sem telemetria há mais de {timeout:.0f}s)")
+    
+    def _detect_conflicts(self, now: float):
+        self._last_conflict_check = now
+        with self._lock:
+            ids = self.table.truck_ids().copy()
+            x = self.table.column('x').copy()
+            y = self.table.column('y').copy()
+            theta = np.nan_to_num(self.table.column('theta'))
+            velocity = np.nan_to_num(self.table.column('velocity'))
+            last_update = self.table.column('last_update').copy()
+        
+        fresh = ~np.isnan(x) & ~np.isnan(y) & (now - last_update <= CONFLICT_CONFIG['max_age'])
+        conflicts = self.conflict_detector.detect(ids[fresh], x[fresh], y[fresh],
+                                                  (velocity * np.cos(theta))[fresh],
+                                                  (velocity * np.sin(theta))[fresh])
+        
+        known = {(conflict.truck_a, conflict.truck_b) for conflict in self.conflicts}
+        for conflict in conflicts:
+            if (conflict.truck_a, conflict.truck_b) not in known:
+                print(f"[CONFLITO] Caminhões {conflict.truck_a} e {conflict.truck_b}: "
+                      f"{conflict.min_distance:.1f}m em {conflict.time_to_cpa:.1f}s")
+        with self._lock:
+            self.conflicts = conflicts
+    
+    def _dispatch(self, now: float):
+        self._last_dispatch = now
+        automatic = MODE_NAMES.index('AUTOMATIC_REMOTE')
+        with self._lock:
+            ids = self.table.truck_ids().copy()
+            x = self.table.column('x').copy()
+            y = self.table.column('y').copy()
+            velocity = np.nan_to_num(self.table.column('velocity'))
+            available = ((self.table.column('mode') == automatic) & ~self.table.fault_mask()
+                         & ~np.isnan(x) & ~np.isnan(y)
+                         & (now - self.table.column('last_update') <= DISPATCH_CONFIG['max_age']))
+            assignments = self.dispatcher.update(now, ids, x, y, velocity, available)
+        
+        for assignment in assignments:
+            if assignment.called:
+                print(f"[DESPACHO] Caminhão {assignment.truck_id} → {assignment.site_id} (ETA {assignment.eta:.0f}s)")
+            else:
+                print(f"[DESPACHO] Caminhão {assignment.truck_id} → fila de {assignment.site_id} "
+                      f"(ETA {assignment.eta:.0f}s)")
+            self._publish_route(assignment.truck_id, assignment.route(), RouteOperation.REPLACE)
+    
+    def _request_keyframe(self, truck_id: int):
+        if self.mqtt_client:
+            self.mqtt_client.publish(f"mine/truck/{truck_id}/keyframe_request", "{}", qos=1)
+    
+    def _publish_metrics(self, now: float):
+        self._last_metrics_publish = now
+        metrics = self.ingest_metrics.snapshot(now)
+        with self._lock:
+            metrics['trucks'] = len(self.table)
+            metrics['zones'] = self.zones.metrics()
+            if self.dispatcher:
+                metrics['dispatch'] = self.dispatcher.metrics()
+        if self.mqtt_client and self.mqtt_connected:
+            self.mqtt_client.publish(CENTRAL_METRICS_CONFIG['topic'], json.dumps(metrics), qos=0)
+
+def start_loopback_fleet(fleet_size: int):
+    from config.settings import LOOPBACK_CONFIG
+    from src.embedded.embedded_system import EmbeddedSystem
+    from src.embedded.communication.loopback import LoopbackBroker, LoopbackTransport
+    
+    broker = LoopbackBroker(**LOOPBACK_CONFIG)
+    systems = []
+    for truck_id in range(1, fleet_size + 1):
+        system = EmbeddedSystem(truck_id, enable_mqtt=True,
+                                transport=LoopbackTransport(broker, f"truck_{truck_id}"),
+                                start_pose=(10.0 + (truck_id - 1) % 8 * 10.0,
+                                            10.0 + (truck_id - 1) // 8 * 10.0, 0.0))
+        system.start()
+        threading.Thread(target=system.run, name=f"Telemetry-{truck_id}", daemon=True).start()
+        systems.append(system)
+    return broker, systems
+
+def main(loopback_fleet: int = 0, api_port: int = None, dispatch: bool = None):
+    from src.central.fleet_api import FleetAPIServer
+    
+    broker, systems, transport = None, [], None
+    if loopback_fleet:
+        from src.embedded.communication.loopback import LoopbackTransport
+        broker, systems = start_loopback_fleet(loopback_fleet)
+        transport = LoopbackTransport(broker, "mine_management")
+    
+    service = FleetService(transport=transport, dispatch=dispatch)
+    service.connect()
+    service.start()
+    
+    api_server = FleetAPIServer(service, CENTRAL_SERVICE_CONFIG['api_host'],
+                                api_port or CENTRAL_SERVICE_CONFIG['api_port'])
+    api_server.start()
+    print(f"API do serviço central em http://{api_server.address[0]}:{api_server.address[1]}")
+    
+    last_status = None
+    try:
+        while True:
+            time.sleep(1.0)
+            if service.status != last_status:
+                last_status = service.status
+                print(last_status)
+    except KeyboardInterrupt:
+        print("\nEncerrando serviço central...")
+    finally:
+        api_server.stop()
+        service.stop()
+        for system in systems:
+            system.stop()
+        if broker:
+            broker.shutdown()
@@ -0,0 +1,168 @@
+from typing import Dict, List, Optional
+import numpy as np
+from src.embedded.communication.telemetry_codec import (
+    MODE_NAMES, STATE_FLAG_FIELDS, STATE_FLOAT_FIELDS, STATUS_NAMES, UNKNOWN_CODE
+)
+
+FLOAT_COLUMNS = STATE_FLOAT_FIELDS + ('timestamp', 'last_update')
+FLAG_COLUMNS = STATE_FLAG_FIELDS
+CODE_COLUMNS = {'status': STATUS_NAMES, 'mode': MODE_NAMES}
+COUNT_COLUMNS = ('replayed',)
+FAULT_STATUSES = ('FAULT', 'EMERGENCY')
+
+def _code(names: list, name: str) -> int:
+    try:
+        return names.index(name)
+    except ValueError:
+        return UNKNOWN_CODE
+
+class FleetTable:
+    
+    def __init__(self, capacity: int = 64):
+        self.capacity = capacity
+        self.size = 0
+        self._rows: Dict[int, int] = {}
+        
+        self.ids = np.zeros(capacity, dtype=np.int64)
+        self.versions = np.zeros(capacity, dtype=np.int64)
+        self.columns: Dict[str, np.ndarray] = {name: self._blank(name, capacity) for name in
+                                               FLOAT_COLUMNS + FLAG_COLUMNS + tuple(CODE_COLUMNS) + COUNT_COLUMNS}
+        self._fault_codes = [STATUS_NAMES.index(name) for name in FAULT_STATUSES if name in STATUS_NAMES]
+    
+    def __len__(self) -> int:
+        return self.size
+    
+    def __contains__(self, truck_id: int) -> bool:
+        return truck_id in self._rows
+    
+    def row(self, truck_id: int) -> int:
+        row = self._rows.get(truck_id)
+        if row is not None:
+            return row
+        
+        if self.size == self.capacity:
+            self._grow(self.capacity * 2)
+        row = self.size
+        self.size += 1
+        self._rows[truck_id] = row
+        self.ids[row] = truck_id
+        self.versions[row] = 0
+        return row
+    
+    def update(self, truck_id: int, fields: dict, version: int = None) -> None:
+        row = self.row(truck_id)
+        for name, value in fields.items():
+            column = self.columns.get(name)
+            if column is None or value is None:
+                continue
+            if name in CODE_COLUMNS:
+                column[row] = _code(CODE_COLUMNS[name], value)
+            else:
+                column[row] = value
+        if version is not None:
+            self.versions[row] = version
+    
+    def increment(self, truck_id: int, field: str, amount: int = 1, version: int = None) -> None:
+        row = self.row(truck_id)
+        self.columns[field][row] += amount
+        if version is not None:
+            self.versions[row] = version
+    
+    def remove(self, truck_id: int) -> None:
+        row = self._rows.pop(truck_id, None)
+        if row is None:
+            return
+        
+        last = self.size - 1
+        if row != last:
+            moved_id = int(self.ids[last])
+            self.ids[row] = moved_id
+            self.versions[row] = self.versions[last]
+            for column in self.columns.values():
+                column[row] = column[last]
+            self._rows[moved_id] = row
+        for name, column in self.columns.items():
+            column[last] = self._blank(name, 1)[0]
+        self.size = last
+    
+    def get(self, truck_id: int) -> Optional[dict]:
+        row = self._rows.get(truck_id)
+        if row is None:
+            return None
+        
+        data = {'truck_id': truck_id}
+        for name in FLOAT_COLUMNS:
+            value = self.columns[name][row]
+            if not np.isnan(value):
+                data[name] = float(value)
+        for name in FLAG_COLUMNS:
+            data[name] = bool(self.columns[name][row])
+        for name, names in CODE_COLUMNS.items():
+            code = int(self.columns[name][row])
+            if code < len(names):
+                data[name] = names[code]
+        for name in COUNT_COLUMNS:
+            if self.columns[name][row]:
+                data[name] = int(self.columns[name][row])
+        return data
+    
+    def column(self, name: str) -> np.ndarray:
+        return self.columns[name][:self.size]
+    
+    def truck_ids(self) -> np.ndarray:
+        return self.ids[:self.size]
+    
+    def changed_since(self, version: int) -> List[int]:
+        return self.truck_ids()[self.versions[:self.size] > version].tolist()
+    
+    def fault_mask(self) -> np.ndarray:
+        mask = np.isin(self.column('status'), self._fault_codes)
+        for name in FLAG_COLUMNS:
+            mask |= self.column(name)
+        return mask
+    
+    def has_fault(self, truck_id: int) -> bool:
+        row = self._rows.get(truck_id)
+        if row is None:
+            return False
+        return any(bool(self.columns[name][row]) for name in FLAG_COLUMNS)
+    
+    def in_fault(self) -> List[int]:
+        return self.truck_ids()[self.fault_mask()].tolist()
+    
+    def within(self, x: float, y: float, radius: float) -> List[int]:
+        distances = np.hypot(self.column('x') - x, self.column('y') - y)
+        return self.truck_ids()[distances <= radius].tolist()
+    
+    def mean(self, field: str) -> float:
+        values = self.column(field)
+        valid = values[~np.isnan(values)]
+        return float(valid.mean()) if len(valid) else 0.0
+    
+    def status_counts(self) -> Dict[str, int]:
+        codes = self.column('status')
+        counts = np.bincount(codes[codes < len(STATUS_NAMES)], minlength=len(STATUS_NAMES))
+        result = {name: int(count) for name, count in zip(STATUS_NAMES, counts)}
+        result['UNKNOWN'] = int(np.count_nonzero(codes >= len(STATUS_NAMES)))
+        return result
+    
+    def _grow(self, capacity: int) -> None:
+        for attr in ('ids', 'versions'):
+            array = np.zeros(capacity, dtype=np.int64)
+            array[:self.size] = getattr(self, attr)[:self.size]
+            setattr(self, attr, array)
+        for name, column in self.columns.items():
+            array = self._blank(name, capacity)
+            array[:self.size] = column[:self.size]
+            self.columns[name] = array
+        self.capacity = capacity
+    
+    @staticmethod
+    def _blank(name: str, capacity: int) -> np.ndarray:
+        if name in FLAG_COLUMNS:
+            return np.zeros(capacity, dtype=bool)
+        if name in CODE_COLUMNS:
+            return np.full(capacity, UNKNOWN_CODE, dtype=np.uint8)
+        if name in COUNT_COLUMNS:
+            return np.zeros(capacity, dtype=np.int64)
+        return np.full(capacity, np.nan, dtype=np.float64)
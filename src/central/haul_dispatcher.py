@@ -0,0 +1,339 @@
+import math
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from src.models.site import SITE_DUMP, SITE_LOAD, Site
+
+NEXT_KIND = {SITE_LOAD: SITE_DUMP, SITE_DUMP: SITE_LOAD}
+
+def linear_sum_assignment(cost: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    cost = np.asarray(cost, dtype=np.float64)
+    transposed = cost.shape[0] > cost.shape[1]
+    if transposed:
+        cost = cost.T
+    n, m = cost.shape
+    
+    # Hungarian method with row/column potentials; the inner scan over columns is vectorized
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    owner = np.zeros(m + 1, dtype=np.int64)
+    way = np.zeros(m + 1, dtype=np.int64)
+    for i in range(1, n + 1):
+        owner[0] = i
+        j0 = 0
+        minv = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[j0] = True
+            i0 = owner[j0]
+            free = ~used
+            free[0] = False
+            
+            reduced = cost[i0 - 1] - u[i0] - v[1:]
+            improve = free[1:] & (reduced < minv[1:])
+            minv[1:][improve] = reduced[improve]
+            way[1:][improve] = j0
+            
+            j1 = int(np.argmin(np.where(free, minv, np.inf)))
+            delta = minv[j1]
+            u[owner[used]] += delta
+            v[used] -= delta
+            minv[free] -= delta
+            j0 = j1
+            if owner[j0] == 0:
+                break
+        
+        while j0:
+            j1 = way[j0]
+            owner[j0] = owner[j1]
+            j0 = j1
+    
+    columns = np.flatnonzero(owner[1:])
+    rows = owner[1:][columns] - 1
+    if transposed:
+        rows, columns = columns, rows
+    order = np.argsort(rows)
+    return rows[order], columns[order]
+
+@dataclass
+class HaulAssignment:
+    truck_id: int
+    site_id: str
+    kind: str
+    assigned_at: float
+    eta: float
+    target: Tuple[float, float] = (0.0, 0.0)
+    called: bool = False
+    arrived_at: Optional[float] = None
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    detour: Optional[Tuple[float, float]] = None
+    best_distance: float = math.inf
+    progress_at: float = 0.0
+    stalls: int = 0
+    
+    def en_route(self) -> bool:
+        return self.started_at is None and (self.arrived_at is None or self.called)
+    
+    def route(self) -> List[Tuple[float, float]]:
+        return [self.detour, self.target] if self.detour is not None else [self.target]
+    
+    def to_dict(self) -> dict:
+        return {
+            'site': self.site_id,
+            'kind': self.kind,
+            'eta': self.eta,
+            'target': list(self.target),
+            'called': self.called,
+            'arrived': self.arrived_at is not None,
+            'in_service': self.started_at is not None,
+            'detour': list(self.detour) if self.detour is not None else None,
+            'stalls': self.stalls,
+        }
+
+class HaulDispatcher:
+    
+    def __init__(self, sites: List[Site], speed: float = 4.0, arrival_radius: float = 10.0,
+                 service_radius: float = 3.0, stop_speed: float = 0.5, cache_tolerance: float = 1.0,
+                 staging_distance: float = 15.0, staging_spacing: float = 8.0,
+                 progress_timeout: float = 30.0, progress_distance: float = 2.0, detour_distance: float = 8.0):
+        self.sites = sites
+        self.speed = speed
+        self.arrival_radius = arrival_radius
+        self.service_radius = service_radius
+        self.staging_distance = staging_distance
+        self.staging_spacing = staging_spacing
+        self.stop_speed = stop_speed
+        self.cache_tolerance = cache_tolerance
+        self.progress_timeout = progress_timeout
+        self.progress_distance = progress_distance
+        self.detour_distance = detour_distance
+        
+        self._sites_by_id: Dict[str, Site] = {site.site_id: site for site in sites}
+        self._site_x = np.array([site.x for site in sites], dtype=np.float64)
+        self._site_y = np.array([site.y for site in sites], dtype=np.float64)
+        self._service = np.array([site.service_time for site in sites], dtype=np.float64)
+        self._centre = (float(self._site_x.mean()), float(self._site_y.mean())) if sites else (0.0, 0.0)
+        self._columns = {kind: np.flatnonzero([site.kind == kind for site in sites])
+                         for kind in NEXT_KIND}
+        
+        self.assignments: Dict[int, HaulAssignment] = {}
+        self._next_kind: Dict[int, str] = {}
+        self.paused = set()
+        self.completed = deque(maxlen=10000)
+        
+        self._cache_ids = np.empty(0, dtype=np.int64)
+        self._cache_x = np.empty(0)
+        self._cache_y = np.empty(0)
+        self._cache_travel = np.empty((0, len(sites)))
+        
+        self.rounds = 0
+        self.dispatched = 0
+        self.cycles = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.last_solve = 0.0
+        self.timeouts = 0
+    
+    def site(self, site_id: str) -> Site:
+        return self._sites_by_id[site_id]
+    
+    def pause(self, truck_id: int):
+        self.paused.add(truck_id)
+        self.assignments.pop(truck_id, None)
+    
+    def resume(self, truck_id: int):
+        self.paused.discard(truck_id)
+    
+    def forget(self, truck_id: int):
+        self.paused.discard(truck_id)
+        self.assignments.pop(truck_id, None)
+    
+    def update(self, now: float, ids: np.ndarray, x: np.ndarray, y: np.ndarray,
+               velocity: np.ndarray, available: np.ndarray) -> List[HaulAssignment]:
+        travel = self._travel_times(ids, x, y)
+        rows = {int(truck_id): row for row, truck_id in enumerate(ids.tolist())}
+        
+        for truck_id in list(self.assignments):
+            row = rows.get(truck_id)
+            if row is None or not available[row]:
+                del self.assignments[truck_id]
+        
+        idle = {kind: [] for kind in NEXT_KIND}
+        for truck_id, row in rows.items():
+            if not available[row] or truck_id in self.paused:
+                continue
+            assignment = self.assignments.get(truck_id)
+            if assignment is None:
+                idle[self._next_kind.get(truck_id, SITE_LOAD)].append(row)
+                continue
+            
+            # arrival marks joining the site queue (at the staging point or the site itself);
+            # service needs the truck to have been called in and be stopped at the site
+            site = self.site(assignment.site_id)
+            stopped = abs(velocity[row]) <= self.stop_speed
+            if (assignment.arrived_at is None and stopped and
+                    np.hypot(x[row] - assignment.target[0], y[row] - assignment.target[1]) <= self.arrival_radius):
+                assignment.arrived_at = now
+            if (assignment.called and assignment.started_at is None and stopped
+                    and np.hypot(x[row] - site.x, y[row] - site.y) <= self.service_radius):
+                assignment.started_at = now
+                assignment.arrived_at = assignment.arrived_at or now
+            if assignment.started_at is not None and now - assignment.started_at >= site.service_time:
+                assignment.finished_at = now
+                self.completed.append(assignment)
+                del self.assignments[truck_id]
+                self._next_kind[truck_id] = NEXT_KIND[assignment.kind]
+                if assignment.kind == SITE_DUMP:
+                    self.cycles += 1
+                idle[self._next_kind[truck_id]].append(row)
+        
+        replanned = [assignment for truck_id, assignment in self.assignments.items()
+                     if self._stalled(now, assignment, float(x[rows[truck_id]]), float(y[rows[truck_id]]))]
+        
+        dispatched = []
+        if idle[SITE_LOAD] or idle[SITE_DUMP]:
+            start = time.perf_counter()
+            for kind, group in idle.items():
+                if group:
+                    dispatched.extend(self._assign(now, kind, ids, np.array(group), travel, x, y))
+            self.last_solve = time.perf_counter() - start
+            self.rounds += 1
+            self.dispatched += len(dispatched)
+        routed = {assignment.truck_id: assignment for assignment in replanned + dispatched + self._call_next()}
+        return list(routed.values())
+    
+    def snapshot(self) -> dict:
+        assigned = {}
+        for assignment in self.assignments.values():
+            assigned.setdefault(assignment.site_id, []).append(assignment.truck_id)
+        return {
+            'sites': [{'id': site.site_id, 'kind': site.kind, 'x': site.x, 'y': site.y,
+                       'trucks': sorted(assigned.get(site.site_id, []))}
+                      for site in self.sites],
+            'assignments': {truck_id: assignment.to_dict()
+                            for truck_id, assignment in self.assignments.items()},
+        }
+    
+    def metrics(self) -> dict:
+        return {
+            'rounds': self.rounds,
+            'dispatched': self.dispatched,
+            'cycles': self.cycles,
+            'active': len(self.assignments),
+            'paused': len(self.paused),
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
+            'last_solve': self.last_solve,
+            'timeouts': self.timeouts,
+        }
+    
+    def _call_next(self) -> List[HaulAssignment]:
+        called = []
+        for site in self.sites:
+            queue = [a for a in self.assignments.values() if a.site_id == site.site_id]
+            if not queue or any(a.called for a in queue):
+                continue
+            
+            # first come, first served among trucks already waiting at the staging point
+            assignment = min(queue, key=lambda a: (a.arrived_at is None, a.arrived_at or 0.0, a.assigned_at))
+            assignment.called = True
+            assignment.target = (site.x, site.y)
+            assignment.detour = None
+            assignment.best_distance = math.inf
+            called.append(assignment)
+        return called
+    
+    def _stalled(self, now: float, assignment: HaulAssignment, x: float, y: float) -> bool:
+        # waiting at the staging point or in service is expected; anything else must keep closing in
+        if not assignment.en_route():
+            return False
+        goal = assignment.detour if assignment.detour is not None else assignment.target
+        distance = float(np.hypot(x - goal[0], y - goal[1]))
+        if assignment.detour is not None and distance <= self.arrival_radius:
+            assignment.detour = None
+            assignment.best_distance = math.inf
+            return False
+        if distance <= assignment.best_distance - self.progress_distance:
+            assignment.best_distance = distance
+            assignment.progress_at = now
+            return False
+        if now - assignment.progress_at < self.progress_timeout:
+            return False
+        
+        # re-plan through a sidestep, to the right first so two trucks stuck head-on pass each other
+        assignment.stalls += 1
+        self.timeouts += 1
+        dx, dy = assignment.target[0] - x, assignment.target[1] - y
+        norm = max(float(np.hypot(dx, dy)), 1e-6)
+        side = 1.0 if assignment.stalls % 2 else -1.0
+        assignment.detour = (x + side * dy / norm * self.detour_distance,
+                             y - side * dx / norm * self.detour_distance)
+        assignment.best_distance = math.inf
+        return True
+    
+    def _staging_point(self, site: Site, x: float, y: float) -> Tuple[float, float]:
+        waiting = sum(1 for a in self.assignments.values() if a.site_id == site.site_id and not a.called)
+        dx, dy = x - site.x, y - site.y
+        norm = np.hypot(dx, dy)
+        if norm < self.staging_distance:
+            # a truck already at the site would be queued out past it; queue it on the inner side instead
+            dx, dy = self._centre[0] - site.x, self._centre[1] - site.y
+            norm = np.hypot(dx, dy)
+        if norm < 1e-6:
+            dx, dy, norm = 0.0, -1.0, 1.0
+        distance = self.staging_distance + waiting * self.staging_spacing
+        return float(site.x + dx / norm * distance), float(site.y + dy / norm * distance)
+    
+    def _assign(self, now: float, kind: str, ids: np.ndarray, group: np.ndarray,
+                travel: np.ndarray, x: np.ndarray, y: np.ndarray) -> List[HaulAssignment]:
+        columns = self._columns[kind]
+        if len(columns) == 0:
+            return []
+        
+        # each site is expanded into queue slots so several trucks can share it,
+        # slot k costing k extra service times on top of the trucks already assigned there
+        queued = np.array([sum(1 for a in self.assignments.values() if a.site_id == self.sites[c].site_id)
+                           for c in columns], dtype=np.float64)
+        slots = np.arange(len(group), dtype=np.float64)
+        wait = (queued[:, None] + slots[None, :]) * self._service[columns][:, None]
+        cost = (travel[group][:, columns][:, :, None] + wait[None, :, :]).reshape(len(group), -1)
+        
+        rows, slot_columns = linear_sum_assignment(cost)
+        dispatched = []
+        for row, slot_column in zip(rows, slot_columns):
+            site = self.sites[columns[slot_column // len(group)]]
+            truck_id = int(ids[group[row]])
+            assignment = HaulAssignment(truck_id, site.site_id, kind, now, float(cost[row, slot_column]))
+            if any(a.site_id == site.site_id for a in self.assignments.values()):
+                assignment.target = self._staging_point(site, float(x[group[row]]), float(y[group[row]]))
+            else:
+                assignment.called = True
+                assignment.target = (site.x, site.y)
+            self.assignments[truck_id] = assignment
+            self._next_kind[truck_id] = kind
+            dispatched.append(assignment)
+        return dispatched
+    
+    def _travel_times(self, ids: np.ndarray, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        if not np.array_equal(ids, self._cache_ids):
+            stale = np.ones(len(ids), dtype=bool)
+            self._cache_ids = ids.copy()
+            self._cache_x = x.copy()
+            self._cache_y = y.copy()
+            self._cache_travel = np.empty((len(ids), len(self.sites)))
+        else:
+            moved = np.hypot(x - self._cache_x, y - self._cache_y)
+            stale = ~(moved <= self.cache_tolerance)
+        
+        self.cache_misses += int(stale.sum())
+        self.cache_hits += int(len(ids) - stale.sum())
+        if stale.any():
+            self._cache_x[stale] = x[stale]
+            self._cache_y[stale] = y[stale]
+            distance = np.hypot(x[stale][:, None] - self._site_x[None, :],
+                                y[stale][:, None] - self._site_y[None, :])
+            self._cache_travel[stale] = distance / self.speed
+        return self._cache_travel
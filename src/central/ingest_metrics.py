@@ -0,0 +1,62 @@
+import math
+import threading
+import time
+from collections import deque
+from typing import Dict
+
+class IngestMetrics:
+    
+    def __init__(self, max_samples: int = 20000):
+        self._lock = threading.Lock()
+        self._ages = deque(maxlen=max_samples)
+        self._renders = deque(maxlen=1000)
+        self._window_start = time.time()
+        self._messages = 0
+        self._last_render_end = None
+        self._render_gap_max = 0.0
+        
+        self.total_messages = 0
+    
+    def record_message(self, sent_timestamp: float = None, now: float = None):
+        now = time.time() if now is None else now
+        with self._lock:
+            self._messages += 1
+            self.total_messages += 1
+            if sent_timestamp:
+                self._ages.append(now - sent_timestamp)
+    
+    def record_render(self, started: float, finished: float):
+        with self._lock:
+            self._renders.append(finished - started)
+            if self._last_render_end is not None:
+                self._render_gap_max = max(self._render_gap_max, started - self._last_render_end)
+            self._last_render_end = finished
+    
+    def snapshot(self, now: float = None, reset: bool = True) -> Dict[str, float]:
+        now = time.time() if now is None else now
+        with self._lock:
+            elapsed = max(now - self._window_start, 1e-6)
+            ages = sorted(self._ages)
+            renders = list(self._renders)
+            
+            snapshot = {
+                'timestamp': now,
+                'window': elapsed,
+                'messages': self._messages,
+                'ingest_rate': self._messages / elapsed,
+                'age_avg': sum(ages) / len(ages) if ages else 0.0,
+                'age_p95': ages[math.ceil(0.95 * len(ages)) - 1] if ages else 0.0,
+                'age_max': ages[-1] if ages else 0.0,
+                'render_count': len(renders),
+                'render_avg': sum(renders) / len(renders) if renders else 0.0,
+                'render_max': max(renders) if renders else 0.0,
+                'render_gap_max': self._render_gap_max,
+            }
+            
+            if reset:
+                self._window_start = now
+                self._messages = 0
+                self._ages.clear()
+                self._renders.clear()
+                self._render_gap_max = 0.0
+            return snapshot
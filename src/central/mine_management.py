@@ -1,23 +1,55 @@
 import tkinter as tk
 from tkinter import ttk
-import json
+import bisect
+import math
 import time
-from typing import Dict, Tuple, List
-try:
-    import paho.mqtt.client as mqtt
-    MQTT_AVAILABLE = True
-except ImportError:
-    MQTT_AVAILABLE = False
+from typing import Dict, List, Optional
+from config.settings import CENTRAL_SERVICE_CONFIG, CONFLICT_CONFIG, HISTORY_CONFIG, MAP_CONFIG
+from src.models.route_update import RouteOperation
+from src.central.viewport import SpatialGrid, Viewport
+from src.central.fleet_api import FleetAPIClient, FleetAPIServer
+from src.central.fleet_service import FleetService, start_loopback_fleet
+
+def _nice_spacing(raw: float) -> float:
+    magnitude = 10 ** math.floor(math.log10(raw))
+    for step in (1, 2, 5, 10):
+        if raw <= step * magnitude:
+            return step * magnitude
+    return 10 * magnitude
 
 class MineManagementGUI:
     
-    def __init__(self, broker_host: str = "localhost", broker_port: int = 1883):
-        self.broker_host = broker_host
-        self.broker_port = broker_port
+    def __init__(self, fleet):
+        self.fleet = fleet
         
         self.trucks: Dict[int, dict] = {}
         self.selected_truck_id: int = None
         self._last_truck_count: int = 0
+        self._fleet_version = 0
+        self._fleet_status = None
+        self._truck_items: Dict[int, dict] = {}
+        self._truck_render_keys: Dict[int, tuple] = {}
+        self._waiting_item = None
+        self._list_ids: List[int] = []
+        self._list_texts: Dict[int, str] = {}
+        self._detail_cache: Dict[str, tuple] = {}
+        self.viewport = Viewport(MAP_CONFIG['width'], MAP_CONFIG['height'],
+                                 min_scale=MAP_CONFIG['min_scale'], max_scale=MAP_CONFIG['max_scale'])
+        self.spatial = SpatialGrid(MAP_CONFIG['spatial_cell'])
+        self._viewport_fitted = False
+        self._grid_transform = (0.0, 0.0, 1.0)
+        self._drag_anchor = None
+        self._drag_version = 0
+        self._shown_trucks = set()
+        self._out_of_map = set()
+        self._lod_active = False
+        self._trail_item = None
+        self._last_chart_update = 0.0
+        self._conflicts: List[dict] = []
+        self._conflicts_changed = False
+        self._zones: dict = {}
+        self._dispatch: Optional[dict] = None
+        self._dirty_trucks = set()
         
         self.root = tk.Tk()
         self.root.title("Sistema de Gestão da Mina")
@@ -27,10 +59,6 @@ class MineManagementGUI:
         self.auto_frame = None
         
         self._setup_gui()
-        
-        self.mqtt_client = None
-        if MQTT_AVAILABLE:
-            self._setup_mqtt()
     
     def _setup_gui(self):
         style = ttk.Style()
@@ -64,7 +92,8 @@ class MineManagementGUI:
                             font=('Segoe UI', 10), foreground='#718096')
         subtitle.pack()
         
-        map_frame = ttk.LabelFrame(main_frame, text=" 🗺️  Mapa da Mina (100m × 75m) ", 
+        map_frame = ttk.LabelFrame(main_frame,
+                                   text=f" 🗺️  Mapa da Mina ({MAP_CONFIG['width']:g}m × {MAP_CONFIG['height']:g}m) ",
                                    style='Section.TLabelframe', padding="10")
         map_frame.grid(row=1, column=0, padx=(0, 10), pady=5, sticky=(tk.W, tk.E, tk.N, tk.S))
         map_frame.columnconfigure(0, weight=1)
@@ -74,6 +103,13 @@ class MineManagementGUI:
                                highlightbackground='#4a5568', width=800, height=600)
         self.canvas.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         self.canvas.bind('<Configure>', self._on_canvas_resize)
+        self.canvas.bind('<MouseWheel>', self._on_map_wheel)
+        self.canvas.bind('<Button-4>', self._on_map_wheel)
+        self.canvas.bind('<Button-5>', self._on_map_wheel)
+        self.canvas.bind('<ButtonPress-1>', self._on_map_press)
+        self.canvas.bind('<B1-Motion>', self._on_map_drag)
+        self.canvas.bind('<ButtonRelease-1>', self._on_map_release)
+        self.canvas.bind('<Double-Button-1>', self._on_map_reset)
         
         control_outer = ttk.Frame(main_frame)
         control_outer.grid(row=1, column=1, padx=5, pady=5, sticky=(tk.N, tk.W, tk.E, tk.S))
@@ -144,6 +180,16 @@ class MineManagementGUI:
                                                foreground='#2d3748')
             self.info_labels[label].pack(side=tk.LEFT)
         
+        self.history_canvas = tk.Canvas(info_frame, height=70, bg='#f7fafc', highlightthickness=1,
+                                        highlightbackground='#cbd5e0')
+        self.history_canvas.grid(row=len(labels), column=0, sticky=(tk.W, tk.E), pady=(8, 0))
+        self._chart_items = {
+            'velocity': self.history_canvas.create_line(0, 0, 0, 0, fill='#3182ce', width=2),
+            'temperature': self.history_canvas.create_line(0, 0, 0, 0, fill='#dd6b20', width=2),
+            'legend': self.history_canvas.create_text(4, 4, anchor=tk.NW, fill='#4a5568',
+                                                      font=('Segoe UI', 8), text=""),
+        }
+        
         cmd_frame = ttk.LabelFrame(control_container, text=" 🎮 Comandos ", 
                                    style='Section.TLabelframe', padding="10")
         cmd_frame.grid(row=2, column=0, pady=(0, 10), sticky=(tk.W, tk.E))
@@ -226,6 +272,8 @@ class MineManagementGUI:
         
         ttk.Button(self.auto_frame, text="🚀 Enviar Rota Completa", style='Action.TButton',
                   command=self._send_route).pack(fill=tk.X)
+        ttk.Button(self.auto_frame, text="➕ Estender Rota Atual",
+                  command=lambda: self._send_route(RouteOperation.APPEND)).pack(fill=tk.X, pady=(5, 0))
         
         self.waypoints = []
         
@@ -235,100 +283,109 @@ class MineManagementGUI:
         self.status_bar.grid(row=1, column=0, sticky=(tk.W, tk.E))
         
         self._draw_map_grid()
+        self._draw_overlay()
         
         self.root.update_idletasks()
         
         self._update_display()
     
-    def _setup_mqtt(self):
-        try:
-            self.mqtt_client = mqtt.Client(
-                client_id="mine_management",
-                callback_api_version=mqtt.CallbackAPIVersion.VERSION2
-            )
-        except (AttributeError, TypeError):
-            self.mqtt_client = mqtt.Client(client_id="mine_management")
-        
-        self.mqtt_client.on_connect = self._on_mqtt_connect
-        self.mqtt_client.on_message = self._on_mqtt_message
-        
-        try:
-            self.mqtt_client.connect(self.broker_host, self.broker_port, 60)
-            self.mqtt_client.loop_start()
-        except Exception as e:
-            self.status_bar.config(text=f"Erro MQTT: {e}")
-    
-    def _on_mqtt_connect(self, client, userdata, flags, rc, properties=None):
-        if rc == 0:
-            self.status_bar.config(text=f"✅ Conectado ao broker MQTT ({self.broker_host})")
-            client.subscribe("mine/truck/+/state", qos=1)
-            client.subscribe("mine/truck/+/position", qos=1)
-        else:
-            self.status_bar.config(text=f"❌ Falha na conexão MQTT (código {rc})")
-    
-    def _on_mqtt_message(self, client, userdata, msg):
-        try:
-            parts = msg.topic.split('/')
-            truck_id = int(parts[2])
-            
-            payload = json.loads(msg.payload.decode('utf-8'))
+    def _apply_pending_updates(self):
+        snapshot = self.fleet.snapshot(self._fleet_version)
+        self._fleet_version = snapshot['version']
+        if snapshot['status'] != self._fleet_status:
+            self._fleet_status = snapshot['status']
+            self.status_bar.config(text=self._fleet_status)
+        
+        conflicts = snapshot.get('conflicts', [])
+        if conflicts != self._conflicts:
+            self._conflicts = conflicts
+            self._conflicts_changed = True
+        
+        zones = snapshot.get('zones', {})
+        if zones != self._zones:
+            self._zones = zones
+            self._draw_zones()
+        
+        dispatch = snapshot.get('dispatch')
+        if dispatch != self._dispatch:
+            self._dispatch = dispatch
+            self._draw_sites()
+        
+        for truck_id in snapshot.get('removed', []):
+            if self.trucks.pop(truck_id, None) is not None:
+                self._remove_truck_items(truck_id)
+                self._out_of_map.discard(truck_id)
+                self._dirty_trucks.add(truck_id)
+        
+        for truck_id, truck in snapshot['trucks'].items():
+            self.trucks[truck_id] = truck
+            self._dirty_trucks.add(truck_id)
             
-            if truck_id not in self.trucks:
-                self.trucks[truck_id] = {}
-                print(f"✓ Caminhão {truck_id} conectado")
-            
-            if msg.topic.endswith('/state'):
-                self.trucks[truck_id].update(payload)
-            elif msg.topic.endswith('/position'):
-                self.trucks[truck_id].update(payload)
-            
-            self.trucks[truck_id]['last_update'] = time.time()
-            
-        except Exception as e:
-            print(f"[ERRO] Falha ao processar mensagem MQTT: {e}")
-            import traceback
-            traceback.print_exc()
+            x = truck.get('x', MAP_CONFIG['width'] / 2)
+            y = truck.get('y', MAP_CONFIG['height'] / 2)
+            self.spatial.update(truck_id, x, y)
+            inside = (-10.0 <= x <= MAP_CONFIG['width'] + 10.0 and
+                      -10.0 <= y <= MAP_CONFIG['height'] + 10.0)
+            if not inside and truck_id not in self._out_of_map:
+                print(f"[AVISO] Truck {truck_id} muito fora dos limites: x={x:.1f}, y={y:.1f}")
+                self._out_of_map.add(truck_id)
+            elif inside:
+                self._out_of_map.discard(truck_id)
     
     def _draw_map_grid(self):
         self.canvas.delete('grid')
         
-        width = self.canvas.winfo_width()
-        height = self.canvas.winfo_height()
-        
-        if width <= 1:
-            width = 800
-        if height <= 1:
-            height = 600
+        map_width = MAP_CONFIG['width']
+        map_height = MAP_CONFIG['height']
+        spacing = MAP_CONFIG['grid_spacing'] or _nice_spacing(max(map_width, map_height) / 10)
         
-        grid_spacing_x = width / 10
-        grid_spacing_y = height / 7.5
-        
-        for i in range(11):
-            x = i * grid_spacing_x
-            self.canvas.create_line(x, 0, x, height, fill='#2d3748', width=1, tags='grid')
+        for i in range(int(map_width // spacing) + 1):
+            x0, y0 = self.viewport.world_to_canvas(i * spacing, 0.0)
+            x1, y1 = self.viewport.world_to_canvas(i * spacing, map_height)
+            self.canvas.create_line(x0, y0, x1, y1, fill='#2d3748', width=1, tags='grid')
             if i % 2 == 0:
-                self.canvas.create_text(x, height - 10, text=f'{i*10}m', 
+                self.canvas.create_text(x0, y0 - 10, text=f'{i * spacing:g}m',
                                        fill='#718096', font=('Segoe UI', 8), tags='grid')
         
-        for i in range(8):
-            y = i * grid_spacing_y
-            self.canvas.create_line(0, y, width, y, fill='#2d3748', width=1, tags='grid')
+        for i in range(int(map_height // spacing) + 1):
+            x0, y0 = self.viewport.world_to_canvas(0.0, i * spacing)
+            x1, y1 = self.viewport.world_to_canvas(map_width, i * spacing)
+            self.canvas.create_line(x0, y0, x1, y1, fill='#2d3748', width=1, tags='grid')
             if i % 2 == 0:
-                self.canvas.create_text(10, y + 10, text=f'{int((7.5-i)*10)}m', 
+                self.canvas.create_text(x0 + 10, y0 - 10, text=f'{i * spacing:g}m',
                                        fill='#718096', font=('Segoe UI', 8), tags='grid', anchor=tk.W)
         
+        self.canvas.tag_lower('grid')
+        self._grid_transform = self.viewport.origin() + (self.viewport.scale,)
+    
+    def _sync_grid(self):
+        origin_x, origin_y, scale = self._grid_transform
+        new_x, new_y = self.viewport.origin()
+        if self.viewport.scale != scale:
+            factor = self.viewport.scale / scale
+            self.canvas.scale('grid', origin_x, origin_y, factor, factor)
+        self.canvas.move('grid', new_x - origin_x, new_y - origin_y)
+        self._grid_transform = (new_x, new_y, self.viewport.scale)
+    
+    def _draw_overlay(self):
+        self.canvas.delete('overlay')
+        
+        width = self.viewport.canvas_width
+        height = self.viewport.canvas_height
+        
         self.canvas.create_rectangle(width/2 - 150, 5, width/2 + 150, 35, 
-                                     fill='#2d3748', outline='#4a5568', width=2, tags='grid')
-        self.canvas.create_text(width/2, 20, text="ÁREA DA MINA - 100m × 75m", 
-                               fill='#e2e8f0', font=('Segoe UI', 12, 'bold'), tags='grid')
+                                     fill='#2d3748', outline='#4a5568', width=2, tags='overlay')
+        self.canvas.create_text(width/2, 20,
+                               text=f"ÁREA DA MINA - {MAP_CONFIG['width']:g}m × {MAP_CONFIG['height']:g}m",
+                               fill='#e2e8f0', font=('Segoe UI', 12, 'bold'), tags='overlay')
         
         legend_x = width - 120
         legend_y = height - 90
         
         self.canvas.create_rectangle(legend_x - 10, legend_y - 5, legend_x + 110, legend_y + 80,
-                                     fill='#2d3748', outline='#4a5568', width=2, tags='grid')
+                                     fill='#2d3748', outline='#4a5568', width=2, tags='overlay')
         self.canvas.create_text(legend_x + 50, legend_y + 5, text="Legenda", 
-                               fill='#e2e8f0', font=('Segoe UI', 9, 'bold'), tags='grid')
+                               fill='#e2e8f0', font=('Segoe UI', 9, 'bold'), tags='overlay')
         
         legends = [
             (legend_y + 20, '#48bb78', 'Operando'),
@@ -339,10 +396,12 @@ class MineManagementGUI:
         for y, color, text in legends:
             self.canvas.create_polygon(
                 legend_x, y, legend_x + 8, y - 6, legend_x + 8, y + 6,
-                fill=color, outline='white', width=1, tags='grid'
+                fill=color, outline='white', width=1, tags='overlay'
             )
             self.canvas.create_text(legend_x + 15, y, text=text, fill='#e2e8f0',
-                                   font=('Segoe UI', 8), anchor=tk.W, tags='grid')
+                                   font=('Segoe UI', 8), anchor=tk.W, tags='overlay')
+        
+        self.canvas.tag_raise('overlay')
     
     def _on_canvas_resize(self, event):
         """Redesenha o grid quando o canvas é redimensionado"""
@@ -352,14 +411,171 @@ class MineManagementGUI:
         self._resize_timer = self.root.after(100, self._redraw_canvas)
     
     def _redraw_canvas(self):
-        """Redesenha todo o conteúdo do canvas"""
-        self._draw_map_grid()
-        self._draw_trucks()
+        """Ajusta a viewport ao novo tamanho do canvas sem recriar o grid"""
+        width = self.canvas.winfo_width()
+        height = self.canvas.winfo_height()
+        if width <= 1 or height <= 1:
+            return
+        
+        self.viewport.resize(width, height)
+        if not self._viewport_fitted:
+            self.viewport.fit()
+            self._viewport_fitted = True
+        self._sync_grid()
+        self._draw_overlay()
+        self._draw_trucks(force=True)
+    
+    def _on_map_wheel(self, event):
+        if getattr(event, 'num', None) == 5 or event.delta < 0:
+            factor = 1.0 / MAP_CONFIG['zoom_step']
+        else:
+            factor = MAP_CONFIG['zoom_step']
+        if self.viewport.zoom(factor, event.x, event.y) != 1.0:
+            self._on_viewport_changed()
+        return "break"
+    
+    def _on_map_press(self, event):
+        self._drag_anchor = (event.x, event.y)
+        self._drag_version = self.viewport.version
+    
+    def _on_map_drag(self, event):
+        if self._drag_anchor is None:
+            return
+        dx = event.x - self._drag_anchor[0]
+        dy = event.y - self._drag_anchor[1]
+        self._drag_anchor = (event.x, event.y)
+        
+        self.viewport.pan(dx, dy)
+        for tag in ('grid', 'zone', 'site', 'trail', 'conflict', 'truck', 'cluster'):
+            self.canvas.move(tag, dx, dy)
+        self._grid_transform = self.viewport.origin() + (self.viewport.scale,)
+    
+    def _on_map_release(self, event):
+        if self._drag_anchor is not None:
+            self._drag_anchor = None
+            if self.viewport.version != self._drag_version:
+                self._on_viewport_changed()
+    
+    def _on_map_reset(self, event):
+        self.viewport.fit()
+        self._on_viewport_changed()
+    
+    def _on_viewport_changed(self):
+        self._sync_grid()
+        self._draw_zones()
+        self._draw_sites()
+        self._draw_trucks(force=True)
+        self._draw_trail()
+        self._draw_conflicts()
+    
+    def _draw_trail(self):
+        points = []
+        if self.selected_truck_id is not None:
+            tolerance = HISTORY_CONFIG['trail_tolerance_px'] / self.viewport.scale
+            trail = self.fleet.trail(self.selected_truck_id, HISTORY_CONFIG['trail_seconds'], tolerance)
+            for x, y in trail:
+                points.extend(self.viewport.world_to_canvas(x, y))
+        
+        if len(points) < 4:
+            if self._trail_item is not None:
+                self.canvas.itemconfig(self._trail_item, state=tk.HIDDEN)
+            return
+        
+        if self._trail_item is None:
+            self._trail_item = self.canvas.create_line(*points, fill='#63b3ed', width=2,
+                                                       dash=(4, 3), tags='trail')
+            self.canvas.tag_raise('trail', 'grid')
+        else:
+            self.canvas.coords(self._trail_item, *points)
+            self.canvas.itemconfig(self._trail_item, state=tk.NORMAL)
+    
+    def _draw_zones(self):
+        self.canvas.delete('zone')
+        for zone_id, zone in self._zones.items():
+            points = [c for x, y in zone['polygon'] for c in self.viewport.world_to_canvas(x, y)]
+            color = '#ed8936' if zone['holder'] is not None else '#a0aec0'
+            self.canvas.create_polygon(*points, outline=color, fill=color, stipple='gray12',
+                                       width=2, tags='zone')
+            
+            label = zone_id if zone['holder'] is None else f"{zone_id}: {zone['holder']}"
+            if zone['queue']:
+                label += f" (+{len(zone['queue'])})"
+            x, y = zone['polygon'][0]
+            px, py = self.viewport.world_to_canvas(x, y)
+            self.canvas.create_text(px + 4, py - 8, text=label, anchor='w', fill=color,
+                                    font=('Segoe UI', 8), tags='zone')
+        
+        if self._zones:
+            self.canvas.tag_raise('zone', 'grid')
+    
+    def _draw_sites(self):
+        self.canvas.delete('site')
+        if not self._dispatch:
+            return
+        
+        for site in self._dispatch['sites']:
+            px, py = self.viewport.world_to_canvas(site['x'], site['y'])
+            color = '#48bb78' if site['kind'] == 'load' else '#b7791f'
+            self.canvas.create_rectangle(px - 7, py - 7, px + 7, py + 7, outline=color, width=2, tags='site')
+            label = site['id'] if not site['trucks'] else f"{site['id']} ({len(site['trucks'])})"
+            self.canvas.create_text(px, py + 16, text=label, fill=color, font=('Segoe UI', 8), tags='site')
+        self.canvas.tag_raise('site', 'grid')
+    
+    def _draw_conflicts(self):
+        self._conflicts_changed = False
+        self.canvas.delete('conflict')
+        
+        ring = max(6.0, CONFLICT_CONFIG['safety_distance'] / 2 * self.viewport.scale)
+        for conflict in self._conflicts:
+            ends = []
+            for truck_id in conflict['trucks']:
+                data = self.trucks.get(truck_id)
+                if data is not None and 'x' in data and 'y' in data:
+                    ends.extend(self.viewport.world_to_canvas(data['x'], data['y']))
+            if len(ends) == 4:
+                self.canvas.create_line(*ends, fill='#f56565', width=2, dash=(6, 3), tags='conflict')
+            
+            px, py = self.viewport.world_to_canvas(*conflict['point'])
+            self.canvas.create_oval(px - ring, py - ring, px + ring, py + ring,
+                                    outline='#f56565', width=2, tags='conflict')
+            self.canvas.create_text(px, py - ring - 8, text=f"{conflict['time']:.0f}s",
+                                    fill='#feb2b2', font=('Segoe UI', 8, 'bold'), tags='conflict')
+        
+        if self._conflicts:
+            self.canvas.tag_raise('conflict', 'grid')
+    
+    def _draw_history_chart(self):
+        self._last_chart_update = time.time()
+        width = max(self.history_canvas.winfo_width(), 100)
+        height = max(self.history_canvas.winfo_height(), 40)
+        since = self._last_chart_update - HISTORY_CONFIG['chart_seconds']
+        
+        legend = []
+        for field, unit in (('velocity', 'm/s'), ('temperature', '°C')):
+            item = self._chart_items[field]
+            if self.selected_truck_id is None:
+                self.history_canvas.itemconfig(item, state=tk.HIDDEN)
+                continue
+            t, values = self.fleet.series(self.selected_truck_id, field, HISTORY_CONFIG['chart_bucket'],
+                                          HISTORY_CONFIG['chart_seconds'])
+            if len(values) < 2:
+                self.history_canvas.itemconfig(item, state=tk.HIDDEN)
+                continue
+            
+            low, high = float(values.min()), float(values.max())
+            span = high - low or 1.0
+            xs = (t - since) / HISTORY_CONFIG['chart_seconds'] * (width - 4) + 2
+            ys = height - 4 - (values - low) / span * (height - 20)
+            coords = [c for point in zip(xs.tolist(), ys.tolist()) for c in point]
+            self.history_canvas.coords(item, *coords)
+            self.history_canvas.itemconfig(item, state=tk.NORMAL)
+            legend.append(f"{field[:4]} {low:.1f}–{high:.1f} {unit}")
+        
+        self.history_canvas.itemconfig(self._chart_items['legend'], text="  ".join(legend))
     
     def _update_display(self):
-
-        current_selection = self.truck_listbox.curselection()
-        selected_index = current_selection[0] if current_selection else None
+        render_start = time.time()
+        self._apply_pending_updates()
         
         if self.trucks:
             truck_count = len(self.trucks)
@@ -367,196 +583,294 @@ class MineManagementGUI:
                 print(f"[INFO] {truck_count} caminhão(ões) no sistema")
             self._last_truck_count = truck_count
         
-        self.truck_listbox.delete(0, tk.END)
-        restore_index = None
-        for idx, (truck_id, data) in enumerate(sorted(self.trucks.items())):
-            status = data.get('status', 'UNKNOWN')
-            electrical_fault = data.get('electrical_fault', False)
-            hydraulic_fault = data.get('hydraulic_fault', False)
-            emergency = data.get('emergency_stop', False)
-            
-            fault_indicator = ""
-            if emergency:
-                fault_indicator = " ⚠️ EMERGÊNCIA"
-            elif electrical_fault:
-                fault_indicator = " ⚡ FALHA ELÉTRICA"
-            elif hydraulic_fault:
-                fault_indicator = " 🔧 FALHA HIDRÁULICA"
-            
-            display_text = f"Caminhão {truck_id} - {status}{fault_indicator}"
-            self.truck_listbox.insert(tk.END, display_text)
-            
-            if self.selected_truck_id == truck_id:
-                restore_index = idx
-        
-        if restore_index is not None:
-            self.truck_listbox.selection_set(restore_index)
-            self.truck_listbox.see(restore_index)
-        elif selected_index is not None and selected_index < self.truck_listbox.size():
-            self.truck_listbox.selection_set(selected_index)
+        self._sync_truck_list(self._dirty_trucks)
         
-        self._draw_trucks()
+        self._draw_trucks(self._dirty_trucks)
+        if self._conflicts_changed or any(truck_id in self._dirty_trucks
+                                          for conflict in self._conflicts for truck_id in conflict['trucks']):
+            self._draw_conflicts()
+        if self.selected_truck_id in self._dirty_trucks:
+            self._update_selected_truck_info()
+            self._draw_trail()
+            if render_start - self._last_chart_update >= HISTORY_CONFIG['chart_refresh']:
+                self._draw_history_chart()
+        self._dirty_trucks = set()
         
-        self._update_selected_truck_info()
+        self.fleet.record_render(render_start, time.time())
         
         self.root.after(500, self._update_display)
     
-    def _draw_trucks(self):
-        import math
+    def _truck_row_text(self, truck_id: int, data: dict) -> str:
+        status = data.get('status', 'UNKNOWN')
+        
+        fault_indicator = ""
+        if data.get('emergency_stop', False):
+            fault_indicator = " ⚠️ EMERGÊNCIA"
+        elif data.get('electrical_fault', False):
+            fault_indicator = " ⚡ FALHA ELÉTRICA"
+        elif data.get('hydraulic_fault', False):
+            fault_indicator = " 🔧 FALHA HIDRÁULICA"
+        
+        return f"Caminhão {truck_id} - {status}{fault_indicator}"
+    
+    def _sync_truck_list(self, dirty: set):
+        for index in reversed(range(len(self._list_ids))):
+            if self._list_ids[index] not in self.trucks:
+                self.truck_listbox.delete(index)
+                self._list_texts.pop(self._list_ids.pop(index), None)
+        
+        for truck_id in sorted(dirty):
+            data = self.trucks.get(truck_id)
+            if data is None:
+                continue
+            text = self._truck_row_text(truck_id, data)
+            
+            if truck_id not in self._list_texts:
+                index = bisect.bisect_left(self._list_ids, truck_id)
+                self._list_ids.insert(index, truck_id)
+                self.truck_listbox.insert(index, text)
+            elif self._list_texts[truck_id] != text:
+                index = bisect.bisect_left(self._list_ids, truck_id)
+                selected = self.truck_listbox.selection_includes(index)
+                self.truck_listbox.delete(index)
+                self.truck_listbox.insert(index, text)
+                if selected:
+                    self.truck_listbox.selection_set(index)
+            self._list_texts[truck_id] = text
+    
+    def _draw_trucks(self, dirty: set = None, force: bool = False):
+        if force:
+            self._truck_render_keys.clear()
         
-        self.canvas.delete('truck')
+        if not self.trucks:
+            center = (self.viewport.canvas_width / 2, self.viewport.canvas_height / 2)
+            if self._waiting_item is None:
+                self._waiting_item = self.canvas.create_text(
+                    *center, text="⏳ Aguardando conexão de caminhões...",
+                    fill='#718096', font=('Segoe UI', 14), tags='waiting')
+            else:
+                self.canvas.coords(self._waiting_item, *center)
+        elif self._waiting_item is not None:
+            self.canvas.delete(self._waiting_item)
+            self._waiting_item = None
         
-        width = self.canvas.winfo_width()
-        height = self.canvas.winfo_height()
+        for truck_id in [tid for tid in self._truck_items if tid not in self.trucks]:
+            self._remove_truck_items(truck_id)
         
-        if width <= 1:
-            width = 800
-        if height <= 1:
-            height = 600
+        if self.viewport.scale < MAP_CONFIG['cluster_below_scale']:
+            if force or dirty is None or dirty or not self._lod_active:
+                self._draw_clusters()
+            return
         
-        scale_x = width / 100
-        scale_y = height / 75
+        if self._lod_active:
+            self.canvas.delete('cluster')
+            self._lod_active = False
+            self._truck_render_keys.clear()
+            force = True
         
-        if not self.trucks:
-            center_x = width / 2
-            center_y = height / 2
-            self.canvas.create_text(center_x, center_y, 
-                                   text="⏳ Aguardando conexão de caminhões...",
-                                   fill='#718096', font=('Segoe UI', 14), tags='truck')
-            return  # Sem caminhões para desenhar
-        
-        for truck_id, data in self.trucks.items():
-            x = data.get('x', 50.0)  # Default no centro se não houver dados
-            y = data.get('y', 37.5)
-            theta = data.get('theta', 0)
-            
-            px = x * scale_x
-            py = (75 - y) * scale_y
-            
-            if px < -100 or px > width + 100 or py < -100 or py > height + 100:
-                print(f"[AVISO] Truck {truck_id} muito fora dos limites: x={x:.1f}, y={y:.1f} (px={px:.0f}, py={py:.0f})")
+        if force or dirty is None:
+            margin = MAP_CONFIG['cull_margin_px']
+            candidates = set(self.spatial.query(*self.viewport.visible_bounds(margin)))
+            candidates |= self._shown_trucks
+        else:
+            candidates = dirty
+        
+        for truck_id in candidates:
+            self._render_truck(truck_id)
+    
+    def _draw_clusters(self):
+        self._lod_active = True
+        self.canvas.delete('cluster')
+        
+        visible = self.spatial.query(*self.viewport.visible_bounds(MAP_CONFIG['cull_margin_px']))
+        radius = MAP_CONFIG['cluster_radius_px'] / self.viewport.scale
+        
+        shown = set()
+        for cx, cy, members in self.spatial.cluster(visible, radius):
+            if len(members) == 1:
+                self._render_truck(members[0], visible=True)
+                shown.add(members[0])
                 continue
             
-            status = data.get('status', 'UNKNOWN')
-            if status == 'RUNNING':
-                color = '#48bb78'
-                outline_color = '#38a169'
-            elif status == 'FAULT' or status == 'EMERGENCY':
+            statuses = [self.trucks[truck_id].get('status', 'UNKNOWN') for truck_id in members]
+            if any(status in ('FAULT', 'EMERGENCY') for status in statuses):
                 color = '#f56565'
-                outline_color = '#e53e3e'
+            elif all(status == 'RUNNING' for status in statuses):
+                color = '#48bb78'
             else:
                 color = '#f6ad55'
-                outline_color = '#ed8936'
-            
-            size = 18
-            
-            front_x = px + size * math.cos(theta)
-            front_y = py - size * math.sin(theta)
-            
-            left_x = px + (size * 0.7) * math.cos(theta + 2.5)
-            left_y = py - (size * 0.7) * math.sin(theta + 2.5)
-            
-            right_x = px + (size * 0.7) * math.cos(theta - 2.5)
-            right_y = py - (size * 0.7) * math.sin(theta - 2.5)
-            
-            shadow_offset = 3
-            points_shadow = [
-                front_x + shadow_offset, front_y + shadow_offset,
-                left_x + shadow_offset, left_y + shadow_offset,
-                right_x + shadow_offset, right_y + shadow_offset
-            ]
-            self.canvas.create_polygon(points_shadow, fill='#000000', outline='',
-                                      stipple='gray50', tags='truck')
-            
-            points = [front_x, front_y, left_x, left_y, right_x, right_y]
-            self.canvas.create_polygon(points, fill=color, outline=outline_color,
-                                      width=2, tags='truck')
-            
-            highlight_size = size * 0.4
-            highlight_x = px + highlight_size * math.cos(theta)
-            highlight_y = py - highlight_size * math.sin(theta)
-            self.canvas.create_oval(highlight_x - 3, highlight_y - 3,
-                                   highlight_x + 3, highlight_y + 3,
-                                   fill='white', outline='', tags='truck')
             
-            label_y = py - 30
-            self.canvas.create_rectangle(px - 25, label_y - 12, px + 25, label_y + 12,
-                                         fill='#2d3748', outline='#4a5568', width=1, tags='truck')
-            self.canvas.create_text(px, label_y, text=f"T{truck_id}",
-                                   fill='white', font=('Segoe UI', 10, 'bold'), tags='truck')
-            
-            velocity = data.get('velocity', 0)
-            if abs(velocity) > 0.1:
-                vel_text = f"{velocity:.1f}m/s"
-                self.canvas.create_text(px, py + 30, text=vel_text,
-                                       fill='#90cdf4', font=('Segoe UI', 9), tags='truck')
+            px, py = self.viewport.world_to_canvas(cx, cy)
+            marker_radius = min(30, 10 + 2 * math.sqrt(len(members)))
+            self.canvas.create_oval(px - marker_radius, py - marker_radius,
+                                    px + marker_radius, py + marker_radius,
+                                    fill=color, outline='white', width=2, tags='cluster')
+            self.canvas.create_text(px, py, text=str(len(members)), fill='white',
+                                    font=('Segoe UI', 10, 'bold'), tags='cluster')
+        
+        for truck_id in self._shown_trucks - shown:
+            self._render_truck(truck_id, visible=False)
+    
+    def _render_truck(self, truck_id: int, visible: bool = None):
+        data = self.trucks.get(truck_id)
+        if data is None:
+            return
+        
+        x = data.get('x', MAP_CONFIG['width'] / 2)  # Default no centro se não houver dados
+        y = data.get('y', MAP_CONFIG['height'] / 2)
+        theta = data.get('theta', 0)
+        
+        px, py = self.viewport.world_to_canvas(x, y)
+        if visible is None:
+            visible = self.viewport.contains(x, y, MAP_CONFIG['cull_margin_px'])
+        
+        status = data.get('status', 'UNKNOWN')
+        velocity = data.get('velocity', 0)
+        vel_text = f"{velocity:.1f}m/s" if abs(velocity) > 0.1 else ""
+        
+        key = (round(px), round(py), round(theta, 2), status, vel_text, visible)
+        previous = self._truck_render_keys.get(truck_id)
+        if previous == key:
+            return
+        self._truck_render_keys[truck_id] = key
+        
+        items = self._truck_items.get(truck_id)
+        if not visible:
+            self._shown_trucks.discard(truck_id)
+            if items:
+                for item in items.values():
+                    self.canvas.itemconfig(item, state=tk.HIDDEN)
+            return
+        self._shown_trucks.add(truck_id)
+        
+        if status == 'RUNNING':
+            color = '#48bb78'
+            outline_color = '#38a169'
+        elif status == 'FAULT' or status == 'EMERGENCY':
+            color = '#f56565'
+            outline_color = '#e53e3e'
+        else:
+            color = '#f6ad55'
+            outline_color = '#ed8936'
+        
+        geometry = self._truck_geometry(px, py, theta)
+        
+        if items is None:
+            self._truck_items[truck_id] = {
+                'shadow': self.canvas.create_polygon(geometry['shadow'], fill='#000000', outline='',
+                                                     stipple='gray50', tags='truck'),
+                'body': self.canvas.create_polygon(geometry['body'], fill=color, outline=outline_color,
+                                                   width=2, tags='truck'),
+                'highlight': self.canvas.create_oval(geometry['highlight'], fill='white',
+                                                     outline='', tags='truck'),
+                'label_bg': self.canvas.create_rectangle(geometry['label_bg'], fill='#2d3748',
+                                                         outline='#4a5568', width=1, tags='truck'),
+                'label': self.canvas.create_text(geometry['label'], text=f"T{truck_id}", fill='white',
+                                                 font=('Segoe UI', 10, 'bold'), tags='truck'),
+                'velocity': self.canvas.create_text(geometry['velocity'], text=vel_text, fill='#90cdf4',
+                                                    font=('Segoe UI', 9), tags='truck'),
+            }
+            self.canvas.tag_raise('overlay')
+            return
+        
+        for name, item in items.items():
+            self.canvas.coords(item, *geometry[name])
+        if previous is None or previous[3] != status or not previous[-1]:
+            self.canvas.itemconfig(items['body'], fill=color, outline=outline_color)
+        if previous is None or previous[4] != vel_text:
+            self.canvas.itemconfig(items['velocity'], text=vel_text)
+        if previous is None or not previous[-1]:
+            for item in items.values():
+                self.canvas.itemconfig(item, state=tk.NORMAL)
+    
+    def _truck_geometry(self, px: float, py: float, theta: float, size: float = 18) -> dict:
+        front_x = px + size * math.cos(theta)
+        front_y = py - size * math.sin(theta)
+        
+        left_x = px + (size * 0.7) * math.cos(theta + 2.5)
+        left_y = py - (size * 0.7) * math.sin(theta + 2.5)
+        
+        right_x = px + (size * 0.7) * math.cos(theta - 2.5)
+        right_y = py - (size * 0.7) * math.sin(theta - 2.5)
+        
+        shadow_offset = 3
+        highlight_size = size * 0.4
+        highlight_x = px + highlight_size * math.cos(theta)
+        highlight_y = py - highlight_size * math.sin(theta)
+        label_y = py - 30
+        
+        return {
+            'shadow': [front_x + shadow_offset, front_y + shadow_offset,
+                       left_x + shadow_offset, left_y + shadow_offset,
+                       right_x + shadow_offset, right_y + shadow_offset],
+            'body': [front_x, front_y, left_x, left_y, right_x, right_y],
+            'highlight': [highlight_x - 3, highlight_y - 3, highlight_x + 3, highlight_y + 3],
+            'label_bg': [px - 25, label_y - 12, px + 25, label_y + 12],
+            'label': [px, label_y],
+            'velocity': [px, py + 30],
+        }
+    
+    def _remove_truck_items(self, truck_id: int):
+        for item in self._truck_items.pop(truck_id, {}).values():
+            self.canvas.delete(item)
+        self._truck_render_keys.pop(truck_id, None)
+        self._shown_trucks.discard(truck_id)
+        self.spatial.remove(truck_id)
     
     def _on_truck_select(self, event):
         selection = self.truck_listbox.curselection()
         if not selection:
             return
         
-        text = self.truck_listbox.get(selection[0])
-        truck_id = int(text.split()[1])
+        truck_id = self._list_ids[selection[0]]
         
         self.selected_truck_id = truck_id
         
         if truck_id in self.trucks:
-            data = self.trucks[truck_id]
-            self.info_labels['Status:'].config(text=data.get('status', '-'))
-            self.info_labels['Modo:'].config(text=data.get('mode', '-'))
-            x = data.get('x', 0)
-            y = data.get('y', 0)
-            self.info_labels['Posição:'].config(text=f"({x:.1f}, {y:.1f})")
-            self.info_labels['Velocidade:'].config(text=f"{data.get('velocity', 0):.1f} m/s")
-            
-            # Temperatura com indicador de status
-            temp = data.get('temperature', 0)
-            if temp > 120.0:
-                temp_text = f"{temp:.1f}°C 🔴 FALHA"
-                temp_color = '#e53e3e'
-            elif temp > 95.0:
-                temp_text = f"{temp:.1f}°C 🟡 ALERTA"
-                temp_color = '#dd6b20'
-            else:
-                temp_text = f"{temp:.1f}°C 🟢"
-                temp_color = '#2d3748'
-            self.info_labels['Temperatura:'].config(text=temp_text, foreground=temp_color)
-            
-            electrical_fault = data.get('electrical_fault', False)
-            hydraulic_fault = data.get('hydraulic_fault', False)
-            self.info_labels['Falha Elétrica:'].config(text='SIM ⚡' if electrical_fault else 'NÃO')
-            self.info_labels['Falha Hidráulica:'].config(text='SIM 🔧' if hydraulic_fault else 'NÃO')
-            
-            self._update_control_visibility(data.get('mode', '-'))
+            self._update_selected_truck_info()
+            self._update_control_visibility(self.trucks[truck_id].get('mode', '-'))
+            self._draw_trail()
+            self._draw_history_chart()
     
     def _update_selected_truck_info(self):
-        if self.selected_truck_id and self.selected_truck_id in self.trucks:
-            data = self.trucks[self.selected_truck_id]
-            self.info_labels['Status:'].config(text=data.get('status', '-'))
-            self.info_labels['Modo:'].config(text=data.get('mode', '-'))
-            x = data.get('x', 0)
-            y = data.get('y', 0)
-            self.info_labels['Posição:'].config(text=f"({x:.1f}, {y:.1f})")
-            self.info_labels['Velocidade:'].config(text=f"{data.get('velocity', 0):.1f} m/s")
-            
-            # Temperatura com indicador de status
-            temp = data.get('temperature', 0)
-            if temp > 120.0:
-                temp_text = f"{temp:.1f}°C 🔴FALHA"
-                temp_color = '#e53e3e'
-            elif temp > 95.0:
-                temp_text = f"{temp:.1f}°C 🟡ALERTA"
-                temp_color = '#dd6b20'
+        if not self.selected_truck_id or self.selected_truck_id not in self.trucks:
+            return
+        
+        data = self.trucks[self.selected_truck_id]
+        x = data.get('x', 0)
+        y = data.get('y', 0)
+        
+        # Temperatura com indicador de status
+        temp = data.get('temperature', 0)
+        if temp > 120.0:
+            temp_text = f"{temp:.1f}°C 🔴 FALHA"
+            temp_color = '#e53e3e'
+        elif temp > 95.0:
+            temp_text = f"{temp:.1f}°C 🟡 ALERTA"
+            temp_color = '#dd6b20'
+        else:
+            temp_text = f"{temp:.1f}°C 🟢"
+            temp_color = '#2d3748'
+        
+        values = {
+            'Status:': (data.get('status', '-'), None),
+            'Modo:': (data.get('mode', '-'), None),
+            'Posição:': (f"({x:.1f}, {y:.1f})", None),
+            'Velocidade:': (f"{data.get('velocity', 0):.1f} m/s", None),
+            'Temperatura:': (temp_text, temp_color),
+            'Falha Elétrica:': ('SIM ⚡' if data.get('electrical_fault', False) else 'NÃO', None),
+            'Falha Hidráulica:': ('SIM 🔧' if data.get('hydraulic_fault', False) else 'NÃO', None),
+        }
+        
+        for label, value in values.items():
+            if self._detail_cache.get(label) == value:
+                continue
+            self._detail_cache[label] = value
+            text, color = value
+            if color is None:
+                self.info_labels[label].config(text=text)
             else:
-                temp_text = f"{temp:.1f}°C 🟢"
-                temp_color = '#2d3748'
-            self.info_labels['Temperatura:'].config(text=temp_text, foreground=temp_color)
-            
-            electrical_fault = data.get('electrical_fault', False)
-            hydraulic_fault = data.get('hydraulic_fault', False)
-            self.info_labels['Falha Elétrica:'].config(text='SIM ⚡' if electrical_fault else 'NÃO')
-            self.info_labels['Falha Hidráulica:'].config(text='SIM 🔧' if hydraulic_fault else 'NÃO')
+                self.info_labels[label].config(text=text, foreground=color)
     
     def _update_control_visibility(self, mode: str):
         if mode == 'MANUAL':
@@ -576,180 +890,70 @@ class MineManagementGUI:
 
         return self.selected_truck_id
     
-    def _check_truck_has_fault(self, truck_id: int) -> bool:
-        """Verifica se o caminhão tem alguma falha ativa"""
-        if truck_id in self.trucks:
-            data = self.trucks[truck_id]
-            return (data.get('electrical_fault', False) or 
-                   data.get('hydraulic_fault', False) or
-                   data.get('emergency_stop', False))
-        return False
-    
-    def _send_auto_command(self):
+    def _send_command(self, command_type: str) -> bool:
         truck_id = self._get_selected_truck_id()
         if not truck_id:
             self.status_bar.config(text="⚠ Selecione um caminhão primeiro")
-            return
+            return False
         
-        if self._check_truck_has_fault(truck_id):
-            self.status_bar.config(text="⚠ Caminhão com FALHA ATIVA! Use REARMAR primeiro")
-            return
-        
-        if self.mqtt_client:
-            payload = json.dumps({"type": "ENABLE_AUTOMATIC"})
-            self.mqtt_client.publish(f"mine/truck/{truck_id}/command", payload, qos=1)
-            self.status_bar.config(text=f"✅ Modo AUTOMÁTICO enviado para caminhão {truck_id}")
+        ok, message = self.fleet.send_command(truck_id, command_type)
+        self.status_bar.config(text=message)
+        return ok
+    
+    def _send_auto_command(self):
+        if self._send_command("ENABLE_AUTOMATIC"):
             self._update_control_visibility('AUTOMATIC')
     
     def _send_manual_command(self):
-        truck_id = self._get_selected_truck_id()
-        if not truck_id:
-            self.status_bar.config(text="⚠ Selecione um caminhão primeiro")
-            return
-        
-        if self._check_truck_has_fault(truck_id):
-            self.status_bar.config(text="⚠ Caminhão com FALHA ATIVA! Use REARMAR primeiro")
-            return
-        
-        if self.mqtt_client:
-            payload = json.dumps({"type": "DISABLE_AUTOMATIC"})
-            self.mqtt_client.publish(f"mine/truck/{truck_id}/command", payload, qos=1)
-            self.status_bar.config(text=f"✅ Modo MANUAL enviado para caminhão {truck_id}")
+        if self._send_command("DISABLE_AUTOMATIC"):
             self._update_control_visibility('MANUAL')
     
     def _send_emergency(self):
-        truck_id = self._get_selected_truck_id()
-        if not truck_id:
-            self.status_bar.config(text="⚠ Selecione um caminhão primeiro")
-            return
-        if self.mqtt_client:
-            payload = json.dumps({"type": "EMERGENCY_STOP"})
-            self.mqtt_client.publish(f"mine/truck/{truck_id}/command", payload, qos=1)
-            self.status_bar.config(text=f"⚠ EMERGÊNCIA enviada para caminhão {truck_id}")
+        self._send_command("EMERGENCY_STOP")
     
     def _send_setpoint(self):
         truck_id = self._get_selected_truck_id()
         if not truck_id:
             self.status_bar.config(text="⚠ Selecione um caminhão primeiro")
             return
-        if not self.mqtt_client:
-            return
         
         try:
             velocity = float(self.velocity_entry.get())
-            payload = json.dumps({"velocity": velocity, "angular": 0.0})
-            self.mqtt_client.publish(f"mine/truck/{truck_id}/setpoint", payload, qos=1)
-            self.status_bar.config(text=f"Setpoint enviado para caminhão {truck_id}")
         except ValueError:
             self.status_bar.config(text="Erro: velocidade inválida")
+            return
+        _, message = self.fleet.send_setpoint(truck_id, velocity, 0.0)
+        self.status_bar.config(text=message)
     
     def _send_reset_fault(self):
-        truck_id = self._get_selected_truck_id()
-        if not truck_id:
-            self.status_bar.config(text="⚠ Selecione um caminhão primeiro")
-            return
-        if self.mqtt_client:
-            payload = json.dumps({"type": "RESET_FAULT"})
-            self.mqtt_client.publish(f"mine/truck/{truck_id}/command", payload, qos=1)
-            self.status_bar.config(text=f"✓ REARME enviado para caminhão {truck_id}")
+        self._send_command("RESET_FAULT")
     
     def _send_forward(self):
-        truck_id = self._get_selected_truck_id()
-        if not truck_id:
-            self.status_bar.config(text="⚠ Selecione um caminhão primeiro")
-            return
-        
-        if self._check_truck_has_fault(truck_id):
-            self.status_bar.config(text="⚠ Caminhão com FALHA ATIVA! Use REARMAR primeiro")
-            return
-        
-        if self.mqtt_client:
-            payload = json.dumps({"type": "MOVE_FORWARD"})
-            self.mqtt_client.publish(f"mine/truck/{truck_id}/command", payload, qos=1)
-            self.status_bar.config(text=f"✓ Comando FRENTE enviado")
+        self._send_command("MOVE_FORWARD")
     
     def _send_backward(self):
-        truck_id = self._get_selected_truck_id()
-        if not truck_id:
-            self.status_bar.config(text="⚠ Selecione um caminhão primeiro")
-            return
-        
-        if self._check_truck_has_fault(truck_id):
-            self.status_bar.config(text="⚠ Caminhão com FALHA ATIVA! Use REARMAR primeiro")
-            return
-        
-        if self.mqtt_client:
-            payload = json.dumps({"type": "MOVE_BACKWARD"})
-            self.mqtt_client.publish(f"mine/truck/{truck_id}/command", payload, qos=1)
-            self.status_bar.config(text=f"✓ Comando RÉ enviado")
+        self._send_command("MOVE_BACKWARD")
     
     def _send_left(self):
-        truck_id = self._get_selected_truck_id()
-        if not truck_id:
-            self.status_bar.config(text="⚠ Selecione um caminhão primeiro")
-            return
-        
-        if self._check_truck_has_fault(truck_id):
-            self.status_bar.config(text="⚠ Caminhão com FALHA ATIVA! Use REARMAR primeiro")
-            return
-        
-        if self.mqtt_client:
-            payload = json.dumps({"type": "TURN_LEFT"})
-            self.mqtt_client.publish(f"mine/truck/{truck_id}/command", payload, qos=1)
-            self.status_bar.config(text=f"✓ Comando ESQUERDA enviado")
+        self._send_command("TURN_LEFT")
     
     def _send_right(self):
-        truck_id = self._get_selected_truck_id()
-        if not truck_id:
-            self.status_bar.config(text="⚠ Selecione um caminhão primeiro")
-            return
-        
-        if self._check_truck_has_fault(truck_id):
-            self.status_bar.config(text="⚠ Caminhão com FALHA ATIVA! Use REARMAR primeiro")
-            return
-        
-        if self.mqtt_client:
-            payload = json.dumps({"type": "TURN_RIGHT"})
-            self.mqtt_client.publish(f"mine/truck/{truck_id}/command", payload, qos=1)
-            self.status_bar.config(text=f"✓ Comando DIREITA enviado")
+        self._send_command("TURN_RIGHT")
     
     def _send_accelerate(self):
-        truck_id = self._get_selected_truck_id()
-        if not truck_id:
-            self.status_bar.config(text="⚠ Selecione um caminhão primeiro")
-            return
-        
-        if self._check_truck_has_fault(truck_id):
-            self.status_bar.config(text="⚠ Caminhão com FALHA ATIVA! Use REARMAR primeiro")
-            return
-        
-        if self.mqtt_client:
-            payload = json.dumps({"type": "ACCELERATE"})
-            self.mqtt_client.publish(f"mine/truck/{truck_id}/command", payload, qos=1)
-            self.status_bar.config(text=f"✓ Comando ACELERAR enviado")
+        self._send_command("ACCELERATE")
     
     def _send_brake(self):
-        truck_id = self._get_selected_truck_id()
-        if not truck_id:
-            self.status_bar.config(text="⚠ Selecione um caminhão primeiro")
-            return
-        
-        if self._check_truck_has_fault(truck_id):
-            self.status_bar.config(text="⚠ Caminhão com FALHA ATIVA! Use REARMAR primeiro")
-            return
-        
-        if self.mqtt_client:
-            payload = json.dumps({"type": "BRAKE"})
-            self.mqtt_client.publish(f"mine/truck/{truck_id}/command", payload, qos=1)
-            self.status_bar.config(text=f"✓ Comando FREIAR enviado")
+        self._send_command("BRAKE")
     
     def _add_waypoint(self):
         try:
             x = float(self.waypoint_x_entry.get())
             y = float(self.waypoint_y_entry.get())
             
-            if not (0 <= x <= 100 and 0 <= y <= 75):
-                self.status_bar.config(text="⚠ Waypoint fora dos limites (0-100m, 0-75m)")
+            if not (0 <= x <= MAP_CONFIG['width'] and 0 <= y <= MAP_CONFIG['height']):
+                self.status_bar.config(text=f"⚠ Waypoint fora dos limites "
+                                            f"(0-{MAP_CONFIG['width']:g}m, 0-{MAP_CONFIG['height']:g}m)")
                 return
             
             self.waypoints.append([x, y])
@@ -782,39 +986,51 @@ class MineManagementGUI:
         self.waypoints_listbox.delete(0, tk.END)
         self.status_bar.config(text="✓ Todos os waypoints foram removidos")
     
-    def _send_route(self):
+    def _send_route(self, operation: RouteOperation = RouteOperation.REPLACE):
         truck_id = self._get_selected_truck_id()
         if not truck_id:
             self.status_bar.config(text="⚠ Selecione um caminhão primeiro")
             return
         
-        if self._check_truck_has_fault(truck_id):
-            self.status_bar.config(text="⚠ Caminhão com FALHA ATIVA! Use REARMAR primeiro")
-            return
-        
-        if not self.waypoints:
-            self.status_bar.config(text="⚠ Adicione waypoints antes de enviar rota")
-            return
-        
-        if self.mqtt_client:
-            payload = json.dumps({"waypoints": self.waypoints})
-            self.mqtt_client.publish(f"mine/truck/{truck_id}/route", payload, qos=1)
-            self.status_bar.config(text=f"✓ Rota com {len(self.waypoints)} waypoints enviada")
+        _, message = self.fleet.send_route(truck_id, self.waypoints, operation)
+        self.status_bar.config(text=message)
     
     def run(self):
         self.root.mainloop()
-    
-    def cleanup(self):
-        if self.mqtt_client:
-            self.mqtt_client.loop_stop()
-            self.mqtt_client.disconnect()
 
-def main():
-    app = MineManagementGUI()
+def main(loopback_fleet: int = 0, api_port: int = None, api_url: str = None, dispatch: bool = None):
+    if api_url:
+        app = MineManagementGUI(FleetAPIClient(api_url, CENTRAL_SERVICE_CONFIG['api_timeout']))
+        app.run()
+        return
+    
+    broker, systems, transport = None, [], None
+    if loopback_fleet:
+        from src.embedded.communication.loopback import LoopbackTransport
+        broker, systems = start_loopback_fleet(loopback_fleet)
+        transport = LoopbackTransport(broker, "mine_management")
+    
+    service = FleetService(transport=transport, dispatch=dispatch)
+    service.connect()
+    service.start()
+    
+    api_server = None
+    if api_port:
+        api_server = FleetAPIServer(service, CENTRAL_SERVICE_CONFIG['api_host'], api_port)
+        api_server.start()
+        print(f"API do serviço central em http://{api_server.address[0]}:{api_server.address[1]}")
+    
+    app = MineManagementGUI(service)
     try:
         app.run()
     finally:
-        app.cleanup()
+        if api_server:
+            api_server.stop()
+        service.stop()
+        for system in systems:
+            system.stop()
+        if broker:
+            broker.shutdown()
 
 if __name__ == "__main__":
     main()
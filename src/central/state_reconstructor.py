@@ -0,0 +1,70 @@
+import time
+from typing import Callable, Dict, Optional
+
+class StateReconstructor:
+    
+    def __init__(self,
+                 request_keyframe: Callable[[int], None] = None,
+                 request_interval: float = 2.0):
+        self.request_keyframe = request_keyframe
+        self.request_interval = request_interval
+        
+        self._last_seq: Dict[int, int] = {}
+        self._synced: Dict[int, bool] = {}
+        self._last_request: Dict[int, float] = {}
+        
+        self.keyframes = 0
+        self.deltas = 0
+        self.gaps = 0
+        self.duplicates = 0
+    
+    def apply(self, truck_id: int, payload: dict) -> Optional[dict]:
+        seq = payload.pop('_seq', None)
+        keyframe = payload.pop('_keyframe', False)
+        
+        if seq is None:
+            return payload
+        
+        last_seq = self._last_seq.get(truck_id)
+        
+        if keyframe:
+            self.keyframes += 1
+            self._last_seq[truck_id] = seq
+            self._synced[truck_id] = True
+            return payload
+        
+        if last_seq is not None and self._seq_delta(last_seq, seq) <= 0:
+            self.duplicates += 1
+            return None
+        
+        self.deltas += 1
+        if last_seq is None or self._seq_delta(last_seq, seq) != 1:
+            self.gaps += 1
+            self._synced[truck_id] = False
+        
+        self._last_seq[truck_id] = seq
+        if not self._synced.get(truck_id, False):
+            self._ask_keyframe(truck_id)
+        
+        return payload
+    
+    def is_synced(self, truck_id: int) -> bool:
+        return self._synced.get(truck_id, False)
+    
+    def forget(self, truck_id: int) -> None:
+        self._last_seq.pop(truck_id, None)
+        self._synced.pop(truck_id, None)
+        self._last_request.pop(truck_id, None)
+    
+    def _ask_keyframe(self, truck_id: int) -> None:
+        now = time.time()
+        if now - self._last_request.get(truck_id, 0.0) < self.request_interval:
+            return
+        self._last_request[truck_id] = now
+        if self.request_keyframe:
+            self.request_keyframe(truck_id)
+    
+    @staticmethod
+    def _seq_delta(last_seq: int, seq: int) -> int:
+        delta = (seq - last_seq) & 0xFFFFFFFF
+        return delta - 0x100000000 if delta >= 0x80000000 else delta
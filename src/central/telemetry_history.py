@@ -0,0 +1,242 @@
+import threading
+from typing import Dict, Optional, Sequence, Tuple
+import numpy as np
+
+HISTORY_FIELDS = ('x', 'y', 'velocity', 'temperature')
+
+def douglas_peucker(points: np.ndarray, tolerance: float) -> np.ndarray:
+    if len(points) < 3 or tolerance <= 0:
+        return points
+    
+    keep = np.zeros(len(points), dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        
+        segment = points[end] - points[start]
+        offsets = points[start + 1:end] - points[start]
+        length = np.hypot(segment[0], segment[1])
+        if length == 0.0:
+            distances = np.hypot(offsets[:, 0], offsets[:, 1])
+        else:
+            distances = np.abs(segment[0] * offsets[:, 1] - segment[1] * offsets[:, 0]) / length
+        
+        idx = int(np.argmax(distances))
+        if distances[idx] > tolerance:
+            split = start + 1 + idx
+            keep[split] = True
+            stack.append((start, split))
+            stack.append((split, end))
+    
+    return points[keep]
+
+class SampleRing:
+    
+    def __init__(self, capacity: int, fields: Sequence[str]):
+        self.capacity = capacity
+        self.fields = tuple(fields)
+        self.t = np.zeros(capacity, dtype=np.float64)
+        self.values = np.zeros((capacity, len(self.fields)), dtype=np.float32)
+        self._head = 0
+        self.size = 0
+    
+    def append(self, t: float, values: Sequence[float]) -> None:
+        self.t[self._head] = t
+        self.values[self._head] = values
+        self._head = (self._head + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+    
+    def insert(self, t: float, values: Sequence[float]) -> bool:
+        times, rows = self.since(-np.inf)
+        idx = int(np.searchsorted(times, t, side='right'))
+        if self.size == self.capacity and idx == 0:
+            return False
+        times = np.insert(times, idx, t)[-self.capacity:]
+        rows = np.insert(rows, idx, values, axis=0)[-self.capacity:]
+        self.size = len(times)
+        self.t[:self.size] = times
+        self.values[:self.size] = rows
+        self._head = self.size % self.capacity
+        return True
+    
+    def index_of(self, t: float) -> Optional[int]:
+        matches = np.flatnonzero(self.t[:self.size] == t)
+        return int(matches[0]) if len(matches) else None
+    
+    def last_time(self) -> Optional[float]:
+        if self.size == 0:
+            return None
+        return float(self.t[(self._head - 1) % self.capacity])
+    
+    def since(self, t0: float) -> Tuple[np.ndarray, np.ndarray]:
+        if self.size < self.capacity:
+            t = self.t[:self.size]
+            values = self.values[:self.size]
+        else:
+            order = np.r_[self._head:self.capacity, 0:self._head]
+            t = self.t[order]
+            values = self.values[order]
+        start = int(np.searchsorted(t, t0))
+        return t[start:], values[start:]
+
+class RollupTier:
+    
+    STATS = ('mean', 'min', 'max', 'last')
+    
+    def __init__(self, bucket_seconds: float, capacity: int, fields: Sequence[str] = HISTORY_FIELDS):
+        self.bucket_seconds = bucket_seconds
+        self.fields = tuple(fields)
+        self.ring = SampleRing(capacity, [f"{field}_{stat}" for field in self.fields for stat in self.STATS]
+                               + ['count'])
+        
+        self._bucket = None
+        self._count = 0
+        self._sum = np.zeros(len(self.fields))
+        self._min = np.zeros(len(self.fields))
+        self._max = np.zeros(len(self.fields))
+        self._last = np.zeros(len(self.fields))
+    
+    def add(self, t: float, values: np.ndarray) -> None:
+        bucket = int(t // self.bucket_seconds)
+        if self._bucket is not None and bucket != self._bucket:
+            self.flush()
+        
+        if self._count == 0:
+            self._bucket = bucket
+            self._sum[:] = values
+            self._min[:] = values
+            self._max[:] = values
+        else:
+            self._sum += values
+            np.minimum(self._min, values, out=self._min)
+            np.maximum(self._max, values, out=self._max)
+        self._last[:] = values
+        self._count += 1
+    
+    def flush(self) -> None:
+        if self._count == 0:
+            return
+        stats = np.stack([self._sum / self._count, self._min, self._max, self._last], axis=1)
+        self.ring.append(self._bucket * self.bucket_seconds, np.append(stats.ravel(), self._count))
+        self._count = 0
+    
+    def backfill(self, t: float, values: np.ndarray) -> None:
+        bucket = int(t // self.bucket_seconds)
+        if self._count and bucket == self._bucket:
+            self._sum += values
+            np.minimum(self._min, values, out=self._min)
+            np.maximum(self._max, values, out=self._max)
+            self._count += 1
+            return
+        
+        start = bucket * self.bucket_seconds
+        idx = self.ring.index_of(start)
+        if idx is None:
+            self.ring.insert(start, np.append(np.repeat(values, len(self.STATS)), 1))
+            return
+        
+        # closed bucket: mean, min and max absorb the sample; 'last' stays with the newer live data
+        row = self.ring.values[idx]
+        count = row[-1]
+        stats = row[:-1].reshape(len(self.fields), len(self.STATS))
+        stats[:, 0] = (stats[:, 0] * count + values) / (count + 1)
+        stats[:, 1] = np.minimum(stats[:, 1], values)
+        stats[:, 2] = np.maximum(stats[:, 2], values)
+        row[:-1] = stats.ravel()
+        row[-1] = count + 1
+    
+    def series(self, field: str, stat: str = 'mean', since: float = 0.0) -> Tuple[np.ndarray, np.ndarray]:
+        column = self.fields.index(field) * len(self.STATS) + self.STATS.index(stat)
+        t, values = self.ring.since(since)
+        return t, values[:, column]
+
+class TruckHistory:
+    
+    def __init__(self, raw_capacity: int, tiers: Dict[float, int]):
+        self.raw = SampleRing(raw_capacity, HISTORY_FIELDS)
+        self.tiers = {seconds: RollupTier(seconds, capacity) for seconds, capacity in tiers.items()}
+        self.latest = np.full(len(HISTORY_FIELDS), np.nan)
+    
+    def record(self, t: float, fields: dict) -> bool:
+        last_time = self.raw.last_time()
+        if last_time is not None and t <= last_time:
+            return self._backfill(t, fields)
+        
+        for idx, name in enumerate(HISTORY_FIELDS):
+            value = fields.get(name)
+            if value is not None:
+                self.latest[idx] = value
+        if np.isnan(self.latest[0]) or np.isnan(self.latest[1]):
+            return False
+        
+        values = np.nan_to_num(self.latest)
+        self.raw.append(t, values)
+        for tier in self.tiers.values():
+            tier.add(t, values)
+        return True
+    
+    def _backfill(self, t: float, fields: dict) -> bool:
+        # replayed telemetry arrives after newer live samples; missing fields come from the sample before it
+        times, rows = self.raw.since(-np.inf)
+        idx = int(np.searchsorted(times, t))
+        if idx < len(times) and times[idx] == t:
+            return False
+        values = rows[max(idx - 1, 0)].astype(np.float64)
+        for column, name in enumerate(HISTORY_FIELDS):
+            value = fields.get(name)
+            if value is not None:
+                values[column] = value
+        
+        self.raw.insert(t, values)
+        for tier in self.tiers.values():
+            tier.backfill(t, values)
+        return True
+
+class TelemetryHistory:
+    
+    def __init__(self, raw_capacity: int = 3000, tiers: Dict[float, int] = None):
+        self.raw_capacity = raw_capacity
+        self.tier_config = tiers or {1.0: 900, 10.0: 4320, 60.0: 720}
+        self._lock = threading.Lock()
+        self._trucks: Dict[int, TruckHistory] = {}
+    
+    def record(self, truck_id: int, t: float, fields: dict) -> bool:
+        with self._lock:
+            history = self._trucks.get(truck_id)
+            if history is None:
+                history = self._trucks[truck_id] = TruckHistory(self.raw_capacity, self.tier_config)
+            return history.record(t, fields)
+    
+    def trail(self, truck_id: int, since: float, tolerance: float = 0.0) -> np.ndarray:
+        with self._lock:
+            history = self._trucks.get(truck_id)
+            if history is None:
+                return np.empty((0, 2))
+            _, values = history.raw.since(since)
+            points = values[:, :2].astype(np.float64)
+        return douglas_peucker(points, tolerance)
+    
+    def series(self, truck_id: int, field: str, bucket_seconds: float, since: float = 0.0,
+               stat: str = 'mean') -> Tuple[np.ndarray, np.ndarray]:
+        with self._lock:
+            history = self._trucks.get(truck_id)
+            if history is None:
+                return np.empty(0), np.empty(0)
+            t, values = history.tiers[bucket_seconds].series(field, stat, since)
+            return t.copy(), values.astype(np.float64)
+    
+    def forget(self, truck_id: int) -> None:
+        with self._lock:
+            self._trucks.pop(truck_id, None)
+    
+    def memory_bytes(self) -> int:
+        with self._lock:
+            total = 0
+            for history in self._trucks.values():
+                rings = [history.raw] + [tier.ring for tier in history.tiers.values()]
+                total += sum(ring.t.nbytes + ring.values.nbytes for ring in rings)
+            return total
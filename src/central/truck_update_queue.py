@@ -0,0 +1,56 @@
+import threading
+from typing import Dict, Optional, Tuple
+
+class TruckUpdateQueue:
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending: Dict[int, dict] = {}
+        self._status: Optional[str] = None
+        
+        self.received = 0
+        self.coalesced = 0
+    
+    def put(self, truck_id: int, fields: dict) -> None:
+        with self._lock:
+            self.received += 1
+            pending = self._pending.get(truck_id)
+            if pending is None:
+                self._pending[truck_id] = dict(fields)
+            else:
+                self.coalesced += 1
+                pending.update(fields)
+    
+    def put_if_newer(self, truck_id: int, fields: dict, timestamp: float) -> bool:
+        with self._lock:
+            pending = self._pending.get(truck_id)
+            if pending is not None and (pending.get('timestamp') or 0.0) >= timestamp:
+                return False
+            self.received += 1
+            if pending is None:
+                self._pending[truck_id] = dict(fields)
+            else:
+                self.coalesced += 1
+                pending.update(fields)
+            return True
+    
+    def increment(self, truck_id: int, field: str, amount: int = 1) -> None:
+        with self._lock:
+            self.received += 1
+            pending = self._pending.setdefault(truck_id, {})
+            increments = pending.setdefault('_increments', {})
+            increments[field] = increments.get(field, 0) + amount
+    
+    def post_status(self, text: str) -> None:
+        with self._lock:
+            self._status = text
+    
+    def drain(self) -> Tuple[Dict[int, dict], Optional[str]]:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            status, self._status = self._status, None
+        return pending, status
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._pending)
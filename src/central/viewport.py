@@ -0,0 +1,160 @@
+import math
+from collections import defaultdict
+from typing import Dict, Iterable, List, Tuple
+
+class Viewport:
+    
+    def __init__(self,
+                 world_width: float = 100.0,
+                 world_height: float = 75.0,
+                 canvas_width: int = 800,
+                 canvas_height: int = 600,
+                 min_scale: float = 0.01,
+                 max_scale: float = 200.0):
+        self.world_width = world_width
+        self.world_height = world_height
+        self.canvas_width = canvas_width
+        self.canvas_height = canvas_height
+        self.min_scale = min_scale
+        self.max_scale = max_scale
+        
+        self.center_x = world_width / 2
+        self.center_y = world_height / 2
+        self.scale = 1.0
+        self.version = 0
+        
+        self.fit()
+    
+    def fit(self) -> None:
+        self.center_x = self.world_width / 2
+        self.center_y = self.world_height / 2
+        self.scale = self._clamp_scale(min(self.canvas_width / self.world_width,
+                                           self.canvas_height / self.world_height))
+        self.version += 1
+    
+    def resize(self, canvas_width: int, canvas_height: int) -> None:
+        if (canvas_width, canvas_height) == (self.canvas_width, self.canvas_height):
+            return
+        self.canvas_width = canvas_width
+        self.canvas_height = canvas_height
+        self.version += 1
+    
+    def world_to_canvas(self, x: float, y: float) -> Tuple[float, float]:
+        return (self.canvas_width / 2 + (x - self.center_x) * self.scale,
+                self.canvas_height / 2 - (y - self.center_y) * self.scale)
+    
+    def canvas_to_world(self, px: float, py: float) -> Tuple[float, float]:
+        return (self.center_x + (px - self.canvas_width / 2) / self.scale,
+                self.center_y - (py - self.canvas_height / 2) / self.scale)
+    
+    def origin(self) -> Tuple[float, float]:
+        return self.world_to_canvas(0.0, 0.0)
+    
+    def visible_bounds(self, margin_px: float = 0.0) -> Tuple[float, float, float, float]:
+        x0, y1 = self.canvas_to_world(-margin_px, -margin_px)
+        x1, y0 = self.canvas_to_world(self.canvas_width + margin_px, self.canvas_height + margin_px)
+        return x0, y0, x1, y1
+    
+    def contains(self, x: float, y: float, margin_px: float = 0.0) -> bool:
+        px, py = self.world_to_canvas(x, y)
+        return (-margin_px <= px <= self.canvas_width + margin_px and
+                -margin_px <= py <= self.canvas_height + margin_px)
+    
+    def zoom(self, factor: float, anchor_px: float = None, anchor_py: float = None) -> float:
+        if anchor_px is None:
+            anchor_px, anchor_py = self.canvas_width / 2, self.canvas_height / 2
+        
+        anchor_x, anchor_y = self.canvas_to_world(anchor_px, anchor_py)
+        new_scale = self._clamp_scale(self.scale * factor)
+        applied = new_scale / self.scale
+        if applied == 1.0:
+            return 1.0
+        
+        self.scale = new_scale
+        self.center_x = anchor_x - (anchor_px - self.canvas_width / 2) / self.scale
+        self.center_y = anchor_y + (anchor_py - self.canvas_height / 2) / self.scale
+        self.version += 1
+        return applied
+    
+    def pan(self, dx_px: float, dy_px: float) -> None:
+        if dx_px == 0 and dy_px == 0:
+            return
+        self.center_x -= dx_px / self.scale
+        self.center_y += dy_px / self.scale
+        self.version += 1
+    
+    def _clamp_scale(self, scale: float) -> float:
+        return max(self.min_scale, min(self.max_scale, scale))
+
+class SpatialGrid:
+    
+    def __init__(self, cell_size: float = 50.0):
+        self.cell_size = cell_size
+        self._cells: Dict[Tuple[int, int], set] = defaultdict(set)
+        self._positions: Dict[int, Tuple[float, float]] = {}
+        self._cell_of: Dict[int, Tuple[int, int]] = {}
+    
+    def update(self, item_id: int, x: float, y: float) -> None:
+        cell = self._cell(x, y)
+        previous = self._cell_of.get(item_id)
+        if previous != cell:
+            if previous is not None:
+                self._discard(item_id, previous)
+            self._cells[cell].add(item_id)
+            self._cell_of[item_id] = cell
+        self._positions[item_id] = (x, y)
+    
+    def remove(self, item_id: int) -> None:
+        cell = self._cell_of.pop(item_id, None)
+        if cell is not None:
+            self._discard(item_id, cell)
+        self._positions.pop(item_id, None)
+    
+    def position(self, item_id: int) -> Tuple[float, float]:
+        return self._positions[item_id]
+    
+    def query(self, x0: float, y0: float, x1: float, y1: float) -> List[int]:
+        cx0, cy0 = self._cell(x0, y0)
+        cx1, cy1 = self._cell(x1, y1)
+        
+        if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) > len(self._cells):
+            cells = [cell for cell in self._cells
+                     if cx0 <= cell[0] <= cx1 and cy0 <= cell[1] <= cy1]
+        else:
+            cells = [(cx, cy) for cx in range(cx0, cx1 + 1) for cy in range(cy0, cy1 + 1)
+                     if (cx, cy) in self._cells]
+        
+        result = []
+        for cell in cells:
+            for item_id in self._cells[cell]:
+                x, y = self._positions[item_id]
+                if x0 <= x <= x1 and y0 <= y <= y1:
+                    result.append(item_id)
+        return result
+    
+    def cluster(self, item_ids: Iterable[int], radius: float) -> List[Tuple[float, float, List[int]]]:
+        groups: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        for item_id in item_ids:
+            x, y = self._positions[item_id]
+            groups[(math.floor(x / radius), math.floor(y / radius))].append(item_id)
+        
+        clusters = []
+        for members in groups.values():
+            xs = [self._positions[item_id][0] for item_id in members]
+            ys = [self._positions[item_id][1] for item_id in members]
+            clusters.append((sum(xs) / len(xs), sum(ys) / len(ys), members))
+        return clusters
+    
+    def __len__(self) -> int:
+        return len(self._positions)
+    
+    def _cell(self, x: float, y: float) -> Tuple[int, int]:
+        return math.floor(x / self.cell_size), math.floor(y / self.cell_size)
+    
+    def _discard(self, item_id: int, cell: Tuple[int, int]) -> None:
+        members = self._cells.get(cell)
+        if members is None:
+            return
+        members.discard(item_id)
+        if not members:
+            del self._cells[cell]
@@ -0,0 +1,158 @@
+import math
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from src.models.zone import Zone
+
+@dataclass
+class Reservation:
+    truck_id: int
+    zone_id: str
+    requested_at: float
+    eta: float
+    duration: float
+    start: float = 0.0
+    end: float = 0.0
+    granted_at: Optional[float] = None
+
+class ZoneReservationManager:
+    
+    def __init__(self, zones: List[Zone], clearance: float = 1.0, grace: float = 5.0,
+                 max_duration: float = 60.0, max_wait: float = 120.0):
+        self.zones: Dict[str, Zone] = {zone.zone_id: zone for zone in zones}
+        self.clearance = clearance
+        self.grace = grace
+        self.max_duration = max_duration
+        self.max_wait = max_wait
+        
+        self._schedules: Dict[str, List[Reservation]] = {zone_id: [] for zone_id in self.zones}
+        self._last_seen: Dict[tuple, float] = {}
+        self.waits = deque(maxlen=1000)
+        
+        self.requests = 0
+        self.grants = 0
+        self.releases = 0
+        self.expired = 0
+    
+    def request(self, truck_id: int, zone_id: str, now: float, eta: float = 0.0,
+                duration: float = 10.0) -> Optional[Reservation]:
+        schedule = self._schedules.get(zone_id)
+        if schedule is None:
+            return None
+        
+        self._last_seen[(truck_id, zone_id)] = now
+        duration = min(max(duration, 0.0), self.max_duration)
+        for reservation in schedule:
+            if reservation.truck_id == truck_id:
+                if reservation.granted_at is None:
+                    reservation.eta = now + max(eta, 0.0)
+                    reservation.duration = duration
+                    self._reschedule(zone_id, now)
+                return reservation
+        
+        self.requests += 1
+        reservation = Reservation(truck_id, zone_id, now, now + max(eta, 0.0), duration)
+        schedule.append(reservation)
+        self._reschedule(zone_id, now)
+        # a free zone is granted right away so the truck does not slow down for nothing
+        if self.holder(zone_id) is None and reservation is min(schedule, key=lambda r: r.start):
+            self._grant(reservation, now)
+        return reservation
+    
+    def release(self, truck_id: int, zone_id: str, now: float) -> bool:
+        schedule = self._schedules.get(zone_id)
+        if schedule is None:
+            return False
+        
+        for reservation in schedule:
+            if reservation.truck_id == truck_id:
+                schedule.remove(reservation)
+                self._last_seen.pop((truck_id, zone_id), None)
+                self.releases += 1
+                self._reschedule(zone_id, now)
+                return True
+        return False
+    
+    def update(self, now: float) -> List[Reservation]:
+        granted = []
+        for zone_id, schedule in self._schedules.items():
+            stale = [r for r in schedule if self._is_stale(r, now)]
+            for reservation in stale:
+                schedule.remove(reservation)
+                self._last_seen.pop((reservation.truck_id, reservation.zone_id), None)
+                self.expired += 1
+            if stale:
+                self._reschedule(zone_id, now)
+            
+            if not schedule or any(r.granted_at is not None for r in schedule):
+                continue
+            
+            reservation = min(schedule, key=lambda r: r.start)
+            self._grant(reservation, now)
+            granted.append(reservation)
+        return granted
+    
+    def response(self, reservation: Reservation, now: float) -> dict:
+        if reservation.granted_at is not None:
+            return {'zone': reservation.zone_id, 'granted': True,
+                    'expires_in': reservation.end + self.grace - now}
+        return {'zone': reservation.zone_id, 'granted': False,
+                'start_in': max(reservation.start - now, 0.0)}
+    
+    def holder(self, zone_id: str) -> Optional[int]:
+        for reservation in self._schedules.get(zone_id, []):
+            if reservation.granted_at is not None:
+                return reservation.truck_id
+        return None
+    
+    def snapshot(self, now: float) -> Dict[str, dict]:
+        return {
+            zone_id: {
+                'polygon': [list(point) for point in self.zones[zone_id].polygon],
+                'holder': self.holder(zone_id),
+                'queue': [{'truck_id': r.truck_id, 'start_in': max(r.start - now, 0.0)}
+                          for r in sorted(schedule, key=lambda r: r.start) if r.granted_at is None],
+            }
+            for zone_id, schedule in self._schedules.items()
+        }
+    
+    def metrics(self) -> dict:
+        waits = sorted(self.waits)
+        return {
+            'requests': self.requests,
+            'grants': self.grants,
+            'releases': self.releases,
+            'expired': self.expired,
+            'wait_avg': sum(waits) / len(waits) if waits else 0.0,
+            'wait_p50': waits[math.ceil(0.5 * len(waits)) - 1] if waits else 0.0,
+            'wait_p95': waits[math.ceil(0.95 * len(waits)) - 1] if waits else 0.0,
+            'wait_max': waits[-1] if waits else 0.0,
+        }
+    
+    def _grant(self, reservation: Reservation, now: float):
+        reservation.granted_at = now
+        reservation.start = now
+        # held until the truck, arriving at its ETA, has crossed
+        reservation.end = max(now, reservation.eta) + reservation.duration + self.clearance
+        self.grants += 1
+        self.waits.append(now - reservation.requested_at)
+        self._reschedule(reservation.zone_id, now)
+    
+    def _is_stale(self, reservation: Reservation, now: float) -> bool:
+        if reservation.granted_at is not None:
+            return now > reservation.end + self.grace
+        last_seen = self._last_seen.get((reservation.truck_id, reservation.zone_id), reservation.requested_at)
+        return now - last_seen > self.max_wait
+    
+    def _reschedule(self, zone_id: str, now: float):
+        schedule = self._schedules[zone_id]
+        cursor = now
+        for reservation in schedule:
+            if reservation.granted_at is not None:
+                cursor = max(cursor, reservation.end)
+        
+        for reservation in sorted((r for r in schedule if r.granted_at is None),
+                                  key=lambda r: (r.eta, r.requested_at)):
+            reservation.start = max(cursor, reservation.eta)
+            reservation.end = reservation.start + reservation.duration + self.clearance
+            cursor = reservation.end
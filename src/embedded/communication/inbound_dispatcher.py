@@ -0,0 +1,158 @@
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Callable, Dict, Hashable, Optional
+
+class InboundQueue:
+    
+    def __init__(self, name: str, maxsize: int = 100, coalesce: bool = False):
+        self.name = name
+        self.maxsize = maxsize
+        self.coalesce = coalesce
+        
+        self._items = OrderedDict() if coalesce else deque()
+        self._condition = threading.Condition()
+        self._closed = False
+        
+        self.enqueued = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.processed = 0
+        self.max_depth = 0
+    
+    def put(self, item: Any, key: Hashable = None) -> bool:
+        with self._condition:
+            if self.coalesce and key in self._items:
+                self._items[key] = item
+                self.coalesced += 1
+                return True
+            
+            if len(self._items) >= self.maxsize:
+                if not self.coalesce:
+                    self.dropped += 1
+                    return False
+                self._items.popitem(last=False)
+                self.dropped += 1
+            
+            if self.coalesce:
+                self._items[key] = item
+            else:
+                self._items.append(item)
+            
+            self.enqueued += 1
+            self.max_depth = max(self.max_depth, len(self._items))
+            self._condition.notify()
+            return True
+    
+    def get(self, timeout: float = None) -> Optional[Any]:
+        with self._condition:
+            if not self._items and not self._closed:
+                self._condition.wait(timeout)
+            if not self._items:
+                return None
+            
+            if self.coalesce:
+                _, item = self._items.popitem(last=False)
+            else:
+                item = self._items.popleft()
+            self.processed += 1
+            return item
+    
+    def depth(self) -> int:
+        with self._condition:
+            return len(self._items)
+    
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+    
+    def reopen(self) -> None:
+        with self._condition:
+            self._closed = False
+    
+    def get_stats(self) -> Dict[str, int]:
+        with self._condition:
+            return {
+                'depth': len(self._items),
+                'max_depth': self.max_depth,
+                'enqueued': self.enqueued,
+                'coalesced': self.coalesced,
+                'dropped': self.dropped,
+                'processed': self.processed
+            }
+
+class InboundWorker(threading.Thread):
+    
+    def __init__(self, inbound_queue: InboundQueue, handler: Callable[[Any], None]):
+        super().__init__(name=f"Inbound-{inbound_queue.name}", daemon=True)
+        
+        self.inbound_queue = inbound_queue
+        self.handler = handler
+        self._stop_event = threading.Event()
+        
+        self.errors = 0
+        self.busy_time = 0.0
+    
+    def run(self):
+        while not self._stop_event.is_set():
+            item = self.inbound_queue.get(timeout=0.5)
+            if item is None:
+                continue
+            
+            start_time = time.perf_counter()
+            try:
+                self.handler(item)
+            except Exception as e:
+                self.errors += 1
+                print(f"[{self.name}] Erro: {e}")
+            self.busy_time += time.perf_counter() - start_time
+    
+    def stop(self):
+        self._stop_event.set()
+        self.inbound_queue.close()
+
+class InboundDispatcher:
+    
+    def __init__(self, queue_config: Dict[str, dict]):
+        self._queues = {
+            name: InboundQueue(name, cfg.get('maxsize', 100), cfg.get('coalesce', False))
+            for name, cfg in queue_config.items()
+        }
+        self._handlers: Dict[str, Callable[[Any], None]] = {}
+        self._workers: Dict[str, InboundWorker] = {}
+    
+    def register(self, message_class: str, handler: Callable[[Any], None]) -> None:
+        self._handlers[message_class] = handler
+    
+    def submit(self, message_class: str, item: Any, key: Hashable = None) -> bool:
+        inbound_queue = self._queues.get(message_class)
+        if inbound_queue is None:
+            return False
+        return inbound_queue.put(item, key)
+    
+    def start(self) -> None:
+        for name, inbound_queue in self._queues.items():
+            if name in self._workers or name not in self._handlers:
+                continue
+            inbound_queue.reopen()
+            worker = InboundWorker(inbound_queue, self._handlers[name])
+            self._workers[name] = worker
+            worker.start()
+    
+    def stop(self) -> None:
+        for worker in self._workers.values():
+            worker.stop()
+        for worker in self._workers.values():
+            worker.join(timeout=1.0)
+        self._workers.clear()
+    
+    def get_metrics(self) -> Dict[str, dict]:
+        metrics = {}
+        for name, inbound_queue in self._queues.items():
+            metrics[name] = inbound_queue.get_stats()
+            worker = self._workers.get(name)
+            if worker:
+                metrics[name]['errors'] = worker.errors
+                metrics[name]['busy_time'] = worker.busy_time
+        return metrics
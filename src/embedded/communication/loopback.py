@@ -0,0 +1,222 @@
+import heapq
+import itertools
+import random
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple, Union
+from src.embedded.communication.transport import (
+    ERR_NO_CONN, ERR_SUCCESS, PublishResult, Transport, TransportMessage
+)
+
+def topic_matches(pattern: str, topic: str) -> bool:
+    pattern_levels = pattern.split('/')
+    topic_levels = topic.split('/')
+    
+    for idx, level in enumerate(pattern_levels):
+        if level == '#':
+            return True
+        if idx >= len(topic_levels):
+            return False
+        if level != '+' and level != topic_levels[idx]:
+            return False
+    return len(pattern_levels) == len(topic_levels)
+
+class LoopbackBroker:
+    
+    def __init__(self,
+                 latency: float = 0.0,
+                 jitter: float = 0.0,
+                 loss: float = 0.0,
+                 seed: Optional[int] = None):
+        self.latency = latency
+        self.jitter = jitter
+        self.loss = loss
+        self._random = random.Random(seed)
+        
+        self._lock = threading.Lock()
+        self._condition = threading.Condition(self._lock)
+        self._clients: Dict[str, 'LoopbackTransport'] = {}
+        self._subscriptions: Dict[str, Dict[str, int]] = defaultdict(dict)
+        self._match_cache: Dict[str, List[Tuple['LoopbackTransport', int]]] = {}
+        
+        self._pending: List[tuple] = []
+        self._sequence = itertools.count()
+        self._running = True
+        
+        self._topic_stats: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {'published': 0, 'delivered': 0, 'dropped': 0, 'bytes': 0})
+        
+        self._thread = threading.Thread(target=self._delivery_loop,
+                                        name="LoopbackBroker", daemon=True)
+        self._thread.start()
+    
+    def attach(self, client: 'LoopbackTransport') -> None:
+        with self._condition:
+            previous = self._clients.get(client.client_id)
+            self._clients[client.client_id] = client
+            if client.clean_session:
+                self._subscriptions.pop(client.client_id, None)
+            session_present = bool(self._subscriptions.get(client.client_id))
+            self._match_cache.clear()
+        if previous is not None and previous is not client:
+            self._schedule(0.0, previous._on_broker_disconnect, 7)
+        self._schedule(0.0, client._on_broker_connect, session_present)
+    
+    def detach(self, client: 'LoopbackTransport') -> None:
+        with self._condition:
+            if self._clients.get(client.client_id) is client:
+                del self._clients[client.client_id]
+            self._match_cache.clear()
+    
+    def subscribe(self, client: 'LoopbackTransport', pattern: str, qos: int) -> None:
+        with self._condition:
+            self._subscriptions[client.client_id][pattern] = qos
+            self._match_cache.clear()
+    
+    def unsubscribe(self, client: 'LoopbackTransport', pattern: str) -> None:
+        with self._condition:
+            self._subscriptions[client.client_id].pop(pattern, None)
+            self._match_cache.clear()
+    
+    def publish(self, topic: str, payload: bytes, qos: int = 0, retain: bool = False) -> None:
+        with self._condition:
+            stats = self._topic_stats[topic]
+            stats['published'] += 1
+            stats['bytes'] += len(payload)
+            
+            targets = self._match_cache.get(topic)
+            if targets is None:
+                targets = self._resolve(topic)
+                self._match_cache[topic] = targets
+            
+            now = time.monotonic()
+            for client, sub_qos in targets:
+                if self.loss > 0.0 and self._random.random() < self.loss:
+                    stats['dropped'] += 1
+                    continue
+                delay = self.latency
+                if self.jitter > 0.0:
+                    delay += self._random.uniform(0.0, self.jitter)
+                message = TransportMessage(topic, payload, min(qos, sub_qos), retain)
+                heapq.heappush(self._pending, (now + delay, next(self._sequence),
+                                               client._deliver, (message,), topic))
+            self._condition.notify()
+    
+    def disconnect_all(self, rc: int = 7) -> None:
+        with self._condition:
+            clients = list(self._clients.values())
+            self._clients.clear()
+            self._match_cache.clear()
+        for client in clients:
+            self._schedule(0.0, client._on_broker_disconnect, rc)
+    
+    def get_topic_stats(self) -> Dict[str, Dict[str, int]]:
+        with self._condition:
+            return {topic: dict(stats) for topic, stats in self._topic_stats.items()}
+    
+    def pending(self) -> int:
+        with self._condition:
+            return len(self._pending)
+    
+    def shutdown(self) -> None:
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+    
+    def _resolve(self, topic: str) -> List[Tuple['LoopbackTransport', int]]:
+        targets = []
+        for client_id, patterns in self._subscriptions.items():
+            client = self._clients.get(client_id)
+            if client is None:
+                continue
+            matched = [qos for pattern, qos in patterns.items() if topic_matches(pattern, topic)]
+            if matched:
+                targets.append((client, max(matched)))
+        return targets
+    
+    def _schedule(self, delay: float, callback, *args) -> None:
+        with self._condition:
+            heapq.heappush(self._pending, (time.monotonic() + delay, next(self._sequence),
+                                           callback, args, None))
+            self._condition.notify()
+    
+    def _delivery_loop(self) -> None:
+        while True:
+            with self._condition:
+                while self._running and not self._pending:
+                    self._condition.wait()
+                if not self._running:
+                    return
+                due = self._pending[0][0]
+                wait = due - time.monotonic()
+                if wait > 0:
+                    self._condition.wait(wait)
+                    continue
+                _, _, callback, args, topic = heapq.heappop(self._pending)
+                
+                if topic is not None:
+                    self._topic_stats[topic]['delivered'] += 1
+            
+            try:
+                callback(*args)
+            except Exception as e:
+                print(f"[LoopbackBroker] Erro em callback: {e}")
+
+class LoopbackTransport(Transport):
+    
+    def __init__(self, broker: LoopbackBroker, client_id: str, userdata: Any = None,
+                 clean_session: bool = True):
+        super().__init__(client_id, userdata, clean_session)
+        self.broker = broker
+        self.connected = False
+    
+    def connect(self, host: str = "localhost", port: int = 1883, keepalive: int = 60) -> None:
+        self.broker.attach(self)
+    
+    def reconnect(self) -> None:
+        self.broker.attach(self)
+    
+    def disconnect(self) -> None:
+        was_connected = self.connected
+        self.connected = False
+        self.broker.detach(self)
+        if was_connected:
+            self._notify_disconnect(0)
+    
+    def subscribe(self, topic: str, qos: int = 0) -> None:
+        self.broker.subscribe(self, topic, qos)
+    
+    def unsubscribe(self, topic: str) -> None:
+        self.broker.unsubscribe(self, topic)
+    
+    def publish(self, topic: str, payload: Union[bytes, str] = b"", qos: int = 0,
+                retain: bool = False) -> PublishResult:
+        if not self.connected:
+            return PublishResult(rc=ERR_NO_CONN)
+        if isinstance(payload, str):
+            payload = payload.encode('utf-8')
+        self.broker.publish(topic, payload, qos, retain)
+        return PublishResult(rc=ERR_SUCCESS)
+    
+    def _on_broker_connect(self, session_present: bool = False) -> None:
+        self.connected = True
+        self._notify_connect(0, {'session present': session_present})
+    
+    def _on_broker_disconnect(self, rc: int) -> None:
+        self.connected = False
+        self._notify_disconnect(rc)
+    
+    def _deliver(self, message: TransportMessage) -> None:
+        if self.connected:
+            self._notify_message(message)
+
+_default_broker: Optional[LoopbackBroker] = None
+_default_broker_lock = threading.Lock()
+
+def get_default_broker() -> LoopbackBroker:
+    global _default_broker
+    with _default_broker_lock:
+        if _default_broker is None:
+            _default_broker = LoopbackBroker()
+        return _default_broker
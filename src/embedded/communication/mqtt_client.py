@@ -1,12 +1,22 @@
 import json
 import threading
 from typing import Callable, Optional
-try:
-    import paho.mqtt.client as mqtt
-    MQTT_AVAILABLE = True
-except ImportError:
-    MQTT_AVAILABLE = False
-    print("AVISO: paho-mqtt não instalado. Comunicação MQTT desabilitada.")
+from config.settings import INBOUND_CONFIG, RECONNECT_CONFIG
+from src.embedded.communication.telemetry_codec import (
+    FORMAT_JSON, STATE_FLAG_FIELDS, decode_payload, encode_position, encode_state,
+    encode_state_delta
+)
+from src.embedded.communication.state_delta import StateDeltaTracker
+from src.embedded.communication.inbound_dispatcher import InboundDispatcher
+from src.embedded.communication.topic_router import TopicRouter
+from src.embedded.communication.store_forward import StoreAndForwardBuffer, TelemetryDrainer
+from src.embedded.communication.reconnect import ReconnectManager
+from src.embedded.communication.transport import (
+    ERR_SUCCESS, MQTT_AVAILABLE, TRANSPORT_LOOPBACK, TRANSPORT_PAHO, Transport, create_transport
+)
+
+if not MQTT_AVAILABLE:
+    print("AVISO: paho-mqtt não instalado. Apenas o transporte loopback está disponível.")
     print("Instale com: pip install paho-mqtt")
 
 class MQTTClient:
@@ -15,145 +25,325 @@ class MQTTClient:
                  truck_id: int,
                  broker_host: str = "localhost",
                  broker_port: int = 1883,
-                 qos: int = 1):
+                 qos: int = 1,
+                 payload_format: str = FORMAT_JSON,
+                 delta_mode: bool = False,
+                 keyframe_interval: float = 10.0,
+                 delta_tolerances: dict = None,
+                 inbound_queues: dict = None,
+                 transport: Transport = None,
+                 transport_kind: str = TRANSPORT_PAHO,
+                 store_forward: StoreAndForwardBuffer = None,
+                 drain_rate: float = 50.0,
+                 reconnect: dict = None):
         self.truck_id = truck_id
         self.broker_host = broker_host
         self.broker_port = broker_port
         self.qos = qos
+        self.payload_format = payload_format
+        
+        self.delta_tracker = None
+        if delta_mode:
+            self.delta_tracker = StateDeltaTracker(keyframe_interval, delta_tolerances,
+                                                   field_groups=[STATE_FLAG_FIELDS])
         
         self.client = None
         self.connected = False
         self._callbacks = {}
         
-        if not MQTT_AVAILABLE:
-            return
+        self.store_forward = store_forward
+        self.drain_rate = drain_rate
+        self._drainer = None
+        self.messages_lost = 0
         
-        try:
-            self.client = mqtt.Client(
-                client_id=f"truck_{truck_id}",
-                callback_api_version=mqtt.CallbackAPIVersion.VERSION2
-            )
-        except (AttributeError, TypeError):
-
-            self.client = mqtt.Client(client_id=f"truck_{truck_id}")
+        self.reconnect_config = dict(RECONNECT_CONFIG, **(reconnect or {}))
+        self._reconnect_manager = None
+        self._loop_started = False
+        self._subscribed = set()
+        self.resubscriptions = 0
+        
+        self.inbound_queues = inbound_queues or INBOUND_CONFIG
+        self.inbound = InboundDispatcher(self.inbound_queues)
+        for message_class in self.inbound_queues:
+            self.inbound.register(message_class, self._dispatch)
+        
+        own_prefix = f"mine/truck/{truck_id}"
+        self.router = TopicRouter()
+        self.router.add_route(f"{own_prefix}/command", self._handle_command, 'command')
+        self.router.add_route(f"{own_prefix}/setpoint", self._handle_setpoint, 'command')
+        self.router.add_route(f"{own_prefix}/keyframe_request", self._handle_keyframe_request, 'command')
+        self.router.add_route(f"{own_prefix}/route", self._handle_route, 'route')
+        self.router.add_route(f"{own_prefix}/zone_grant", self._handle_zone_grant, 'route')
+        self.router.add_route("mine/truck/+/position", self._handle_position, 'position')
+        
+        if transport is None:
+            if transport_kind != TRANSPORT_LOOPBACK and not MQTT_AVAILABLE:
+                return
+            transport = create_transport(transport_kind, f"truck_{truck_id}",
+                                         clean_session=self.reconnect_config['clean_session'])
         
+        self.client = transport
         self.client.on_connect = self._on_connect
         self.client.on_disconnect = self._on_disconnect
         self.client.on_message = self._on_message
     
     def connect(self) -> bool:
-        if not MQTT_AVAILABLE or self.client is None:
+        if self.client is None:
             return False
         
+        self.inbound.start()
+        self._start_drainer()
+        
+        start_manager = self._reconnect_manager is None
+        if start_manager:
+            self._reconnect_manager = ReconnectManager(
+                self._attempt_connect, self.is_connected,
+                initial_delay=self.reconnect_config['initial_delay'],
+                max_delay=self.reconnect_config['max_delay'],
+                multiplier=self.reconnect_config['multiplier'],
+                jitter=self.reconnect_config['jitter'],
+                connect_timeout=self.reconnect_config['connect_timeout'],
+                name=f"Reconnect-{self.truck_id}"
+            )
+        
+        self._reconnect_manager.mark_connecting()
         try:
-            self.client.connect(self.broker_host, self.broker_port, 60)
-            self.client.loop_start()
-            return True
+            connected = self._attempt_connect()
         except Exception as e:
             print(f"[MQTT] Erro ao conectar: {e}")
-            return False
+            self._reconnect_manager.notify_failed()
+            connected = False
+        
+        if start_manager:
+            self._reconnect_manager.start()
+        return connected
+    
+    def _attempt_connect(self) -> bool:
+        if not self._loop_started:
+            self.client.connect(self.broker_host, self.broker_port, 60)
+            self.client.loop_start()
+            self._loop_started = True
+        else:
+            self.client.reconnect()
+        return True
     
     def disconnect(self):
+        if self._reconnect_manager:
+            self._reconnect_manager.stop()
+            self._reconnect_manager.join(timeout=1.0)
+            self._reconnect_manager = None
         if self.client:
             self.client.loop_stop()
             self.client.disconnect()
+        self.inbound.stop()
+        if self._drainer:
+            self._drainer.stop()
+            self._drainer.join(timeout=1.0)
+            self._drainer = None
+        if self.store_forward is not None:
+            self.store_forward.close()
+    
+    def _start_drainer(self):
+        if self.store_forward is None or self._drainer is not None:
+            return
+        self._drainer = TelemetryDrainer(self.store_forward, self._publish_replay,
+                                         self.is_connected, self.drain_rate)
+        self._drainer.start()
+    
+    def _publish_replay(self, topic: str, payload: bytes) -> bool:
+        result = self.client.publish(topic, payload, qos=self.qos)
+        return result.rc == ERR_SUCCESS
+    
+    def _store(self, message_class: str, topic: str, payload, timestamp: float = None):
+        if self.store_forward is None:
+            self.messages_lost += 1
+            return
+        if not self.store_forward.append(message_class, topic, payload, timestamp):
+            self.messages_lost += 1
     
     def _on_connect(self, client, userdata, flags, rc, properties=None):
         if rc == 0:
             self.connected = True
             print(f"[MQTT] Conectado ao broker {self.broker_host}:{self.broker_port}")
             
-            self.client.subscribe(f"mine/truck/{self.truck_id}/command", qos=self.qos)
-            self.client.subscribe(f"mine/truck/{self.truck_id}/setpoint", qos=self.qos)
-            self.client.subscribe(f"mine/truck/{self.truck_id}/route", qos=self.qos)
+            if self._reconnect_manager:
+                self._reconnect_manager.notify_connected()
+            self._subscribe_all(flags.get('session present', False))
             
-            self.client.subscribe("mine/truck/+/position", qos=self.qos)
+            if self.delta_tracker:
+                self.delta_tracker.force_keyframe()
             
             print(f"[MQTT] Inscrito nos tópicos do caminhão {self.truck_id}")
             print(f"[MQTT] Inscrito em posições de todos caminhões para desvio de colisão")
         else:
             print(f"[MQTT] Falha na conexão (código {rc})")
+            if self._reconnect_manager:
+                self._reconnect_manager.notify_failed()
     
-    def _on_disconnect(self, client, userdata, rc, properties=None):
+    def _on_disconnect(self, client, userdata, rc):
         self.connected = False
         print(f"[MQTT] Desconectado (código {rc})")
+        if self._reconnect_manager:
+            self._reconnect_manager.notify_disconnected()
+    
+    def _subscribe_all(self, session_present: bool):
+        if not session_present:
+            if self._subscribed:
+                self.resubscriptions += 1
+            self._subscribed.clear()
+        for pattern in self.router.patterns():
+            self._subscribe(pattern)
+    
+    def _subscribe(self, pattern: str):
+        if pattern in self._subscribed:
+            return
+        self.client.subscribe(pattern, qos=self.qos)
+        self._subscribed.add(pattern)
     
     def _on_message(self, client, userdata, msg):
-        topic = msg.topic
-        payload = msg.payload.decode('utf-8')
-        
-        if topic.endswith('/command'):
-            self._handle_command(payload)
-        elif topic.endswith('/setpoint'):
-            self._handle_setpoint(payload)
-        elif topic.endswith('/route'):
-            self._handle_route(payload)
-        elif topic.endswith('/position'):
-            self._handle_position(topic, payload)
-    
-    def _handle_command(self, payload: str):
-        if 'command' in self._callbacks:
-            try:
-                data = json.loads(payload)
-                self._callbacks['command'](data)
-            except Exception as e:
-                print(f"[MQTT] Erro ao processar comando: {e}")
+        resolved = self.router.resolve(msg.topic)
+        if resolved is None:
+            return
+        
+        message_class = resolved.route.message_class
+        key = msg.topic if self.inbound_queues[message_class].get('coalesce') else None
+        if not self.inbound.submit(message_class, (resolved, msg.payload), key=key):
+            print(f"[MQTT] Fila de entrada cheia - mensagem descartada ({msg.topic})")
     
-    def _handle_setpoint(self, payload: str):
-        if 'setpoint' in self._callbacks:
-            try:
-                data = json.loads(payload)
-                self._callbacks['setpoint'](data)
-            except Exception as e:
-                print(f"[MQTT] Erro ao processar setpoint: {e}")
+    def _dispatch(self, item: tuple):
+        resolved, payload = item
+        resolved.dispatch(payload)
     
-    def _handle_route(self, payload: str):
-        if 'route' in self._callbacks:
+    def _handle_json(self, message_type: str, payload: bytes, description: str):
+        if message_type in self._callbacks:
             try:
                 data = json.loads(payload)
-                self._callbacks['route'](data)
+                self._callbacks[message_type](data)
             except Exception as e:
-                print(f"[MQTT] Erro ao processar rota: {e}")
+                print(f"[MQTT] Erro ao processar {description}: {e}")
     
-    def _handle_position(self, topic: str, payload: str):
-        if 'position' in self._callbacks:
-            try:
-                parts = topic.split('/')
-                other_truck_id = int(parts[2])
-                
-                if other_truck_id != self.truck_id:
-                    data = json.loads(payload)
-                    data['truck_id'] = other_truck_id
-                    self._callbacks['position'](data)
-            except Exception as e:
-                print(f"[MQTT] Erro ao processar posição: {e}")
+    def _handle_command(self, truck_id: Optional[int], payload: bytes):
+        self._handle_json('command', payload, 'comando')
+    
+    def _handle_setpoint(self, truck_id: Optional[int], payload: bytes):
+        self._handle_json('setpoint', payload, 'setpoint')
+    
+    def _handle_route(self, truck_id: Optional[int], payload: bytes):
+        self._handle_json('route', payload, 'rota')
+    
+    def _handle_zone_grant(self, truck_id: Optional[int], payload: bytes):
+        self._handle_json('zone_grant', payload, 'reserva de zona')
+    
+    def _handle_keyframe_request(self, truck_id: Optional[int], payload: bytes):
+        if self.delta_tracker:
+            self.delta_tracker.force_keyframe()
+    
+    def _handle_position(self, other_truck_id: Optional[int], payload: bytes):
+        if 'position' not in self._callbacks or other_truck_id in (None, self.truck_id):
+            return
+        try:
+            data = decode_payload(payload)
+            data['truck_id'] = other_truck_id
+            self._callbacks['position'](data)
+        except Exception as e:
+            print(f"[MQTT] Erro ao processar posição: {e}")
+    
+    def add_route(self, pattern: str, message_type: str, callback: Callable = None,
+                  message_class: str = 'command'):
+        def handler(truck_id, payload):
+            if message_type in self._callbacks:
+                self._callbacks[message_type](truck_id, decode_payload(payload))
+        
+        if callback is not None:
+            self._callbacks[message_type] = callback
+        self.router.add_route(pattern, handler, message_class)
+        if self.connected:
+            self._subscribe(pattern)
     
     def publish_state(self, state_data: dict):
+        topic = f"mine/truck/{self.truck_id}/state"
         if not self.connected:
-            print(f"[MQTT] Não conectado - não publicando estado")
+            self._store('state', topic, encode_state(state_data, self.payload_format),
+                        state_data.get('timestamp'))
             return
         
-        topic = f"mine/truck/{self.truck_id}/state"
-        payload = json.dumps(state_data)
+        if self.delta_tracker:
+            message = self.delta_tracker.next_message(state_data)
+            if message is None:
+                return
+            seq, fields, keyframe = message
+            payload = encode_state_delta(fields, self.truck_id, seq, keyframe,
+                                         state_data.get('timestamp'), self.payload_format)
+        else:
+            payload = encode_state(state_data, self.payload_format)
         result = self.client.publish(topic, payload, qos=self.qos)
         
         if not hasattr(self, '_first_publish_done'):
             print(f"[MQTT] Primeira publicação: {topic}")
             self._first_publish_done = True
         
-        if result.rc != mqtt.MQTT_ERR_SUCCESS:
+        if result.rc != ERR_SUCCESS:
             print(f"[MQTT] Erro ao publicar estado: {result.rc}")
+            self._store('state', topic, encode_state(state_data, self.payload_format),
+                        state_data.get('timestamp'))
+            if self.delta_tracker:
+                self.delta_tracker.force_keyframe()
     
-    def publish_position(self, x: float, y: float, theta: float):
+    def publish_position(self, x: float, y: float, theta: float, velocity: float = 0.0):
+        topic = f"mine/truck/{self.truck_id}/position"
+        payload = encode_position(x, y, theta, velocity, fmt=self.payload_format)
         if not self.connected:
+            self._store('position', topic, payload)
             return
         
-        topic = f"mine/truck/{self.truck_id}/position"
-        payload = json.dumps({"x": x, "y": y, "theta": theta})
+        result = self.client.publish(topic, payload, qos=self.qos)
+        if result.rc != ERR_SUCCESS:
+            self._store('position', topic, payload)
+    
+    def publish_route_ack(self, seq: Optional[int], status: str, detail: str = ""):
+        if not self.connected:
+            return
+        
+        topic = f"mine/truck/{self.truck_id}/route/ack"
+        payload = json.dumps({"seq": seq, "status": status, "detail": detail})
         self.client.publish(topic, payload, qos=self.qos)
     
+    def publish_zone_request(self, zone_id: str, eta: float, duration: float):
+        if not self.connected:
+            return
+        
+        topic = f"mine/truck/{self.truck_id}/zone_request"
+        payload = json.dumps({"zone": zone_id, "eta": eta, "duration": duration})
+        self.client.publish(topic, payload, qos=self.qos)
+    
+    def publish_zone_release(self, zone_id: str):
+        if not self.connected:
+            return
+        
+        topic = f"mine/truck/{self.truck_id}/zone_release"
+        self.client.publish(topic, json.dumps({"zone": zone_id}), qos=self.qos)
+    
     def register_callback(self, message_type: str, callback: Callable):
         self._callbacks[message_type] = callback
     
     def is_connected(self) -> bool:
         return self.connected
+    
+    def get_inbound_metrics(self) -> dict:
+        return self.inbound.get_metrics()
+    
+    def get_connection_metrics(self) -> dict:
+        metrics = {
+            'connected': self.connected,
+            'messages_lost': self.messages_lost,
+            'resubscriptions': self.resubscriptions,
+        }
+        if self._reconnect_manager:
+            metrics.update(self._reconnect_manager.get_metrics())
+        return metrics
+    
+    def get_store_forward_stats(self) -> dict:
+        stats = {'messages_lost': self.messages_lost}
+        if self.store_forward is not None:
+            stats.update(self.store_forward.get_stats())
+        return stats
@@ -0,0 +1,72 @@
+import math
+import time
+from typing import Optional, Tuple
+
+class DeadReckoningPublishPolicy:
+    
+    def __init__(self,
+                 position_tolerance: float = 0.5,
+                 heading_tolerance: float = 0.1,
+                 min_interval: float = 0.05,
+                 max_interval: float = 2.0,
+                 receiver_expiry: float = None):
+        # a parked truck only publishes heartbeats; one lost or late heartbeat must not expire it on receivers
+        if receiver_expiry is not None and max_interval > receiver_expiry / 2:
+            raise ValueError(f"position_max_interval ({max_interval}s) deve ser no máximo metade da "
+                             f"expiração dos vizinhos ({receiver_expiry}s)")
+        self.position_tolerance = position_tolerance
+        self.heading_tolerance = heading_tolerance
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        
+        self._last: Optional[Tuple[float, float, float, float, float]] = None
+        
+        self.published = 0
+        self.suppressed = 0
+    
+    def predict(self, now: float) -> Optional[Tuple[float, float, float]]:
+        if self._last is None:
+            return None
+        x, y, theta, velocity, t = self._last
+        dt = now - t
+        return (x + velocity * math.cos(theta) * dt,
+                y + velocity * math.sin(theta) * dt,
+                theta)
+    
+    def should_publish(self, x: float, y: float, theta: float, velocity: float,
+                       now: float = None) -> bool:
+        now = time.time() if now is None else now
+        
+        if self._last is None:
+            return True
+        
+        elapsed = now - self._last[4]
+        if elapsed < self.min_interval:
+            return False
+        if elapsed >= self.max_interval:
+            return True
+        
+        pred_x, pred_y, pred_theta = self.predict(now)
+        position_error = math.hypot(x - pred_x, y - pred_y)
+        heading_error = abs(math.atan2(math.sin(theta - pred_theta), math.cos(theta - pred_theta)))
+        
+        return (position_error > self.position_tolerance or
+                heading_error > self.heading_tolerance)
+    
+    def mark_published(self, x: float, y: float, theta: float, velocity: float,
+                       now: float = None) -> None:
+        now = time.time() if now is None else now
+        self._last = (x, y, theta, velocity, now)
+        self.published += 1
+    
+    def update(self, x: float, y: float, theta: float, velocity: float,
+               now: float = None) -> bool:
+        now = time.time() if now is None else now
+        if self.should_publish(x, y, theta, velocity, now):
+            self.mark_published(x, y, theta, velocity, now)
+            return True
+        self.suppressed += 1
+        return False
+    
+    def reset(self) -> None:
+        self._last = None
@@ -0,0 +1,127 @@
+import random
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+class ReconnectManager(threading.Thread):
+    
+    def __init__(self,
+                 connect: Callable[[], bool],
+                 is_connected: Callable[[], bool],
+                 initial_delay: float = 0.5,
+                 max_delay: float = 30.0,
+                 multiplier: float = 2.0,
+                 jitter: float = 0.5,
+                 connect_timeout: float = 10.0,
+                 name: str = "ReconnectManager",
+                 seed: Optional[int] = None):
+        super().__init__(name=name, daemon=True)
+        
+        self.connect = connect
+        self.is_connected = is_connected
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.connect_timeout = connect_timeout
+        self._random = random.Random(seed)
+        
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop_event = threading.Event()
+        
+        self._attempt = 0
+        self._disconnected_since: Optional[float] = time.monotonic()
+        self._ever_connected = False
+        self._connecting_since: Optional[float] = None
+        
+        self.reconnect_count = 0
+        self.connect_attempts = 0
+        self.failed_attempts = 0
+        self.disconnected_time = 0.0
+        self.last_delay = 0.0
+    
+    def next_delay(self) -> float:
+        delay = min(self.max_delay, self.initial_delay * (self.multiplier ** self._attempt))
+        spread = delay * self.jitter
+        return max(0.0, delay - spread + self._random.random() * 2.0 * spread)
+    
+    def mark_connecting(self):
+        with self._lock:
+            self._connecting_since = time.monotonic()
+    
+    def notify_failed(self):
+        with self._lock:
+            self._connecting_since = None
+        self._wake.set()
+    
+    def notify_connected(self):
+        with self._lock:
+            self._connecting_since = None
+            if self._disconnected_since is not None:
+                self.disconnected_time += time.monotonic() - self._disconnected_since
+                self._disconnected_since = None
+            if self._ever_connected:
+                self.reconnect_count += 1
+            self._ever_connected = True
+            self._attempt = 0
+    
+    def notify_disconnected(self):
+        with self._lock:
+            self._connecting_since = None
+            if self._disconnected_since is None:
+                self._disconnected_since = time.monotonic()
+        self._wake.set()
+    
+    def run(self):
+        while not self._stop_event.is_set():
+            # while a connection is in flight the transport owns the socket; wait for its CONNACK or failure
+            if self.is_connected() or self._awaiting_result():
+                self._wake.wait(1.0)
+                self._wake.clear()
+                continue
+            
+            self.connect_attempts += 1
+            self.mark_connecting()
+            try:
+                ok = self.connect()
+            except Exception as e:
+                print(f"[MQTT] Falha ao reconectar: {e}")
+                ok = False
+            
+            if not ok:
+                self.failed_attempts += 1
+                with self._lock:
+                    self._connecting_since = None
+            
+            self.last_delay = self.next_delay()
+            self._attempt += 1
+            self._stop_event.wait(self.last_delay)
+    
+    def _awaiting_result(self) -> bool:
+        with self._lock:
+            if self._connecting_since is None:
+                return False
+            if time.monotonic() - self._connecting_since < self.connect_timeout:
+                return True
+            self._connecting_since = None
+            self.failed_attempts += 1
+            return False
+    
+    def stop(self):
+        self._stop_event.set()
+        self._wake.set()
+    
+    def get_metrics(self) -> Dict[str, float]:
+        with self._lock:
+            disconnected = self.disconnected_time
+            if self._disconnected_since is not None:
+                disconnected += time.monotonic() - self._disconnected_since
+            return {
+                'connected': self.is_connected(),
+                'reconnect_count': self.reconnect_count,
+                'connect_attempts': self.connect_attempts,
+                'failed_attempts': self.failed_attempts,
+                'disconnected_time': disconnected,
+                'last_delay': self.last_delay,
+            }
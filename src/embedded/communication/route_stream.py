@@ -0,0 +1,115 @@
+import time
+import uuid
+from typing import Dict, List, Optional, Tuple
+from src.models.route_update import RouteOperation, RouteUpdate
+
+def parse_waypoints(raw_waypoints: list) -> List[Tuple[float, float]]:
+    route = []
+    for wp in raw_waypoints:
+        if isinstance(wp, dict):
+            route.append((float(wp['x']), float(wp['y'])))
+        elif isinstance(wp, (list, tuple)) and len(wp) >= 2:
+            route.append((float(wp[0]), float(wp[1])))
+        else:
+            print(f"[Route] Waypoint inválido ignorado: {wp}")
+    return route
+
+def build_route_messages(waypoints: List,
+                         seq: int,
+                         operation: RouteOperation = RouteOperation.REPLACE,
+                         start_index: int = 0,
+                         chunk_size: int = 200,
+                         atomic: bool = False) -> List[dict]:
+    waypoints = [list(wp) for wp in waypoints]
+    chunks = [waypoints[i:i + chunk_size] for i in range(0, len(waypoints), chunk_size)] or [[]]
+    
+    if len(chunks) == 1:
+        return [{
+            "op": operation.value,
+            "seq": seq,
+            "start_index": start_index,
+            "waypoints": chunks[0]
+        }]
+    
+    if atomic:
+        upload_id = uuid.uuid4().hex[:12]
+        return [{
+            "op": operation.value,
+            "seq": seq,
+            "start_index": start_index,
+            "upload_id": upload_id,
+            "chunk": idx,
+            "chunks": len(chunks),
+            "waypoints": chunk
+        } for idx, chunk in enumerate(chunks)]
+    
+    messages = [{
+        "op": operation.value,
+        "seq": seq,
+        "start_index": start_index,
+        "waypoints": chunks[0]
+    }]
+    for offset, chunk in enumerate(chunks[1:], start=1):
+        messages.append({
+            "op": RouteOperation.APPEND.value,
+            "seq": seq + offset,
+            "waypoints": chunk
+        })
+    return messages
+
+class RouteChunkAssembler:
+    
+    def __init__(self, chunk_timeout: float = 30.0, max_waypoints: int = 20000):
+        self.chunk_timeout = chunk_timeout
+        self.max_waypoints = max_waypoints
+        self._uploads: Dict[str, dict] = {}
+    
+    def accept(self, data: dict) -> Optional[RouteUpdate]:
+        self._expire_uploads()
+        
+        operation = RouteOperation(data.get('op', RouteOperation.REPLACE.value))
+        waypoints = parse_waypoints(data.get('waypoints', []))
+        seq = data.get('seq')
+        start_index = int(data.get('start_index', 0))
+        
+        upload_id = data.get('upload_id')
+        if upload_id is None:
+            if len(waypoints) > self.max_waypoints:
+                raise ValueError(f"rota excede {self.max_waypoints} waypoints")
+            return RouteUpdate(operation, waypoints, start_index, seq)
+        
+        upload = self._uploads.setdefault(upload_id, {
+            'chunks': {},
+            'total': int(data['chunks']),
+            'count': 0,
+            'started': time.time()
+        })
+        
+        chunk_idx = int(data['chunk'])
+        if chunk_idx not in upload['chunks']:
+            upload['chunks'][chunk_idx] = waypoints
+            upload['count'] += len(waypoints)
+        
+        if upload['count'] > self.max_waypoints:
+            del self._uploads[upload_id]
+            raise ValueError(f"upload {upload_id} excede {self.max_waypoints} waypoints")
+        
+        if len(upload['chunks']) < upload['total']:
+            return None
+        
+        del self._uploads[upload_id]
+        route = []
+        for idx in range(upload['total']):
+            route.extend(upload['chunks'][idx])
+        return RouteUpdate(operation, route, start_index, seq)
+    
+    def pending_uploads(self) -> int:
+        return len(self._uploads)
+    
+    def _expire_uploads(self):
+        now = time.time()
+        expired = [uid for uid, upload in self._uploads.items()
+                   if now - upload['started'] > self.chunk_timeout]
+        for uid in expired:
+            upload = self._uploads.pop(uid)
+            print(f"[Route] Upload {uid} expirado ({len(upload['chunks'])}/{upload['total']} partes)")
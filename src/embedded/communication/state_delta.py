@@ -0,0 +1,61 @@
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+class StateDeltaTracker:
+    
+    IGNORED_FIELDS = ('timestamp', 'truck_id')
+    
+    def __init__(self,
+                 keyframe_interval: float = 10.0,
+                 tolerances: Dict[str, float] = None,
+                 field_groups: List[Sequence[str]] = None):
+        self.keyframe_interval = keyframe_interval
+        self.tolerances = tolerances or {}
+        self.field_groups = field_groups or []
+        
+        self._last_sent: Dict[str, object] = {}
+        self._last_keyframe_time = 0.0
+        self._force_keyframe = True
+        self._seq = 0
+    
+    def force_keyframe(self) -> None:
+        self._force_keyframe = True
+    
+    def next_message(self, state: dict, now: float = None) -> Optional[Tuple[int, dict, bool]]:
+        now = time.time() if now is None else now
+        
+        keyframe = (self._force_keyframe or
+                    now - self._last_keyframe_time >= self.keyframe_interval)
+        
+        if keyframe:
+            fields = {k: v for k, v in state.items() if k not in self.IGNORED_FIELDS}
+            self._last_keyframe_time = now
+            self._force_keyframe = False
+        else:
+            fields = self._changed_fields(state)
+            if not fields:
+                return None
+        
+        self._last_sent.update(fields)
+        self._seq = (self._seq + 1) & 0xFFFFFFFF
+        return self._seq, fields, keyframe
+    
+    def _changed_fields(self, state: dict) -> dict:
+        changed = {}
+        for key, value in state.items():
+            if key in self.IGNORED_FIELDS:
+                continue
+            
+            previous = self._last_sent.get(key)
+            if previous is None:
+                changed[key] = value
+            elif isinstance(value, float):
+                if abs(value - previous) > self.tolerances.get(key, 0.0):
+                    changed[key] = value
+            elif value != previous:
+                changed[key] = value
+        
+        for group in self.field_groups:
+            if any(key in changed for key in group):
+                changed.update({key: state[key] for key in group if key in state})
+        return changed
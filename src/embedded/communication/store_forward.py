@@ -0,0 +1,293 @@
+import os
+import struct
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+RECORD_HEADER = struct.Struct('<dHI')
+
+ORDER_FIFO = "fifo"
+ORDER_LIFO = "lifo"
+
+class SegmentStore:
+    
+    def __init__(self, directory: str, order: str = ORDER_FIFO, segment_bytes: int = 256 * 1024):
+        self.directory = directory
+        self.order = order
+        self.segment_bytes = segment_bytes
+        
+        os.makedirs(directory, exist_ok=True)
+        
+        self._segments = deque()
+        self._writer = None
+        self._writer_seq = None
+        self._next_seq = 0
+        
+        self._reading: List[Tuple[float, str, bytes]] = []
+        self._reading_seq = None
+        
+        self.total_bytes = 0
+        self.count = 0
+        
+        self._recover()
+    
+    def append(self, topic: str, payload: bytes, timestamp: float) -> int:
+        topic_bytes = topic.encode('utf-8')
+        record = RECORD_HEADER.pack(timestamp, len(topic_bytes), len(payload)) + topic_bytes + payload
+        
+        if self._writer is None or self._segments[-1][1] >= self.segment_bytes:
+            self._rotate()
+        
+        self._writer.write(record)
+        self._writer.flush()
+        
+        seq, size, count = self._segments[-1]
+        self._segments[-1] = (seq, size + len(record), count + 1)
+        self.total_bytes += len(record)
+        self.count += 1
+        return len(record)
+    
+    def pop(self) -> Optional[Tuple[float, str, bytes]]:
+        while not self._reading and self._segments:
+            self._load_next_segment()
+        if not self._reading:
+            return None
+        
+        record = self._reading.pop()
+        self.count -= 1
+        
+        if not self._reading:
+            self._discard_reading()
+        return record
+    
+    def drop_oldest_segment(self) -> int:
+        if not self._segments:
+            return 0
+        
+        seq, size, count = self._segments[0]
+        if seq == self._writer_seq:
+            self._close_writer()
+        if seq == self._reading_seq:
+            count = len(self._reading)
+            self._reading = []
+            self._reading_seq = None
+        
+        self._segments.popleft()
+        self._remove_file(seq)
+        self.total_bytes -= size
+        self.count -= count
+        return count
+    
+    def close(self) -> None:
+        self._close_writer()
+    
+    def _rotate(self) -> None:
+        self._close_writer()
+        seq = self._next_seq
+        self._next_seq += 1
+        self._writer = open(self._path(seq), 'ab')
+        self._writer_seq = seq
+        self._segments.append((seq, 0, 0))
+    
+    def _close_writer(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+            self._writer_seq = None
+    
+    def _load_next_segment(self) -> None:
+        if not self._segments:
+            return
+        
+        seq = self._segments[0][0] if self.order == ORDER_FIFO else self._segments[-1][0]
+        if seq == self._writer_seq:
+            self._close_writer()
+        
+        records = self._read_segment(seq)
+        if self.order == ORDER_FIFO:
+            records.reverse()
+        
+        self._reading = records
+        self._reading_seq = seq
+        if not records:
+            self._discard_reading()
+    
+    def _discard_reading(self) -> None:
+        seq = self._reading_seq
+        self._reading_seq = None
+        for idx, (segment_seq, size, count) in enumerate(self._segments):
+            if segment_seq == seq:
+                del self._segments[idx]
+                self.total_bytes -= size
+                break
+        self._remove_file(seq)
+    
+    def _read_segment(self, seq: int) -> List[Tuple[float, str, bytes]]:
+        records = []
+        try:
+            with open(self._path(seq), 'rb') as f:
+                data = f.read()
+        except OSError:
+            return records
+        
+        offset = 0
+        while offset + RECORD_HEADER.size <= len(data):
+            timestamp, topic_len, payload_len = RECORD_HEADER.unpack_from(data, offset)
+            offset += RECORD_HEADER.size
+            end = offset + topic_len + payload_len
+            if end > len(data):
+                break
+            topic = data[offset:offset + topic_len].decode('utf-8')
+            records.append((timestamp, topic, data[offset + topic_len:end]))
+            offset = end
+        return records
+    
+    def _recover(self) -> None:
+        seqs = sorted(int(name[:-4]) for name in os.listdir(self.directory)
+                      if name.endswith('.seg') and name[:-4].isdigit())
+        for seq in seqs:
+            size = os.path.getsize(self._path(seq))
+            count = len(self._read_segment(seq))
+            self._segments.append((seq, size, count))
+            self.total_bytes += size
+            self.count += count
+        self._next_seq = seqs[-1] + 1 if seqs else 0
+    
+    def _remove_file(self, seq: Optional[int]) -> None:
+        if seq is None:
+            return
+        try:
+            os.remove(self._path(seq))
+        except OSError:
+            pass
+    
+    def _path(self, seq: int) -> str:
+        return os.path.join(self.directory, f"{seq:08d}.seg")
+
+class StoreAndForwardBuffer:
+    
+    def __init__(self,
+                 directory: str,
+                 classes: Dict[str, dict],
+                 max_bytes: int = 50 * 1024 * 1024,
+                 segment_bytes: int = 256 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        
+        self._lock = threading.Lock()
+        self._priorities = sorted(classes, key=lambda name: classes[name].get('priority', 0))
+        self._stores = {
+            name: SegmentStore(os.path.join(directory, name),
+                               cfg.get('order', ORDER_FIFO),
+                               cfg.get('segment_bytes', segment_bytes))
+            for name, cfg in classes.items()
+        }
+        
+        self.stored = 0
+        self.forwarded = 0
+        self.evicted = 0
+    
+    def append(self, message_class: str, topic: str, payload, timestamp: float = None) -> bool:
+        if isinstance(payload, str):
+            payload = payload.encode('utf-8')
+        
+        with self._lock:
+            store = self._stores.get(message_class)
+            if store is None:
+                return False
+            store.append(topic, payload, time.time() if timestamp is None else timestamp)
+            self.stored += 1
+            self._enforce_limit()
+            return True
+    
+    def pop(self) -> Optional[Tuple[str, float, str, bytes]]:
+        with self._lock:
+            for name in self._priorities:
+                record = self._stores[name].pop()
+                if record is not None:
+                    self.forwarded += 1
+                    return (name,) + record
+            return None
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(store.count for store in self._stores.values())
+    
+    def total_bytes(self) -> int:
+        with self._lock:
+            return sum(store.total_bytes for store in self._stores.values())
+    
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = {
+                'stored': self.stored,
+                'forwarded': self.forwarded,
+                'evicted': self.evicted,
+                'bytes': sum(store.total_bytes for store in self._stores.values())
+            }
+            for name, store in self._stores.items():
+                stats[f'{name}_pending'] = store.count
+            return stats
+    
+    def close(self) -> None:
+        with self._lock:
+            for store in self._stores.values():
+                store.close()
+    
+    def _enforce_limit(self) -> None:
+        total = sum(store.total_bytes for store in self._stores.values())
+        for name in reversed(self._priorities):
+            store = self._stores[name]
+            while total > self.max_bytes and store.total_bytes > 0:
+                before = store.total_bytes
+                self.evicted += store.drop_oldest_segment()
+                total -= before - store.total_bytes
+            if total <= self.max_bytes:
+                return
+
+class TelemetryDrainer(threading.Thread):
+    
+    def __init__(self,
+                 buffer: StoreAndForwardBuffer,
+                 publish,
+                 is_connected,
+                 drain_rate: float = 50.0,
+                 topic_suffix: str = "/replay"):
+        super().__init__(name="TelemetryDrainer", daemon=True)
+        
+        self.buffer = buffer
+        self.publish = publish
+        self.is_connected = is_connected
+        self.drain_rate = drain_rate
+        self.topic_suffix = topic_suffix
+        self._stop_event = threading.Event()
+    
+    def run(self):
+        tokens = 0.0
+        last_time = time.monotonic()
+        
+        while not self._stop_event.is_set():
+            now = time.monotonic()
+            tokens = min(self.drain_rate, tokens + (now - last_time) * self.drain_rate)
+            last_time = now
+            
+            if not self.is_connected() or len(self.buffer) == 0:
+                tokens = 0.0
+                self._stop_event.wait(0.5)
+                continue
+            
+            while tokens >= 1.0:
+                record = self.buffer.pop()
+                if record is None:
+                    break
+                message_class, timestamp, topic, payload = record
+                if not self.publish(topic + self.topic_suffix, payload):
+                    self.buffer.append(message_class, topic, payload, timestamp)
+                    break
+                tokens -= 1.0
+            
+            self._stop_event.wait(0.1)
+    
+    def stop(self):
+        self._stop_event.set()
@@ -0,0 +1,181 @@
+import json
+import struct
+import time
+from typing import Optional, Union
+from src.models.vehicle_state import OperationMode, VehicleStatus
+
+FORMAT_JSON = "json"
+FORMAT_BINARY = "binary"
+
+MAGIC = 0xA7
+CODEC_VERSION = 1
+
+MSG_POSITION = 0x01
+MSG_STATE = 0x02
+MSG_STATE_DELTA = 0x03
+
+HEADER = struct.Struct('<BBB')
+POSITION_BODY = struct.Struct('<dffff')
+STATE_BODY = struct.Struct('<dI9fBBB')
+DELTA_HEADER = struct.Struct('<dIIH')
+KEYFRAME_BIT = 0x8000
+
+STATUS_NAMES = [status.name for status in VehicleStatus]
+MODE_NAMES = [mode.name for mode in OperationMode]
+UNKNOWN_CODE = 0xFF
+
+STATE_FLOAT_FIELDS = (
+    'x', 'y', 'theta', 'velocity',
+    'velocity_setpoint', 'angular_setpoint',
+    'acceleration_cmd', 'steering_cmd',
+    'temperature'
+)
+STATE_FLAG_FIELDS = ('electrical_fault', 'hydraulic_fault', 'emergency_stop')
+
+DELTA_SLOTS = STATE_FLOAT_FIELDS + ('status', 'mode', 'flags')
+DELTA_SLOT_STRUCTS = [struct.Struct('<f')] * len(STATE_FLOAT_FIELDS) + [struct.Struct('<B')] * 3
+
+class CodecError(ValueError):
+    pass
+
+def _encode_name(name: str, names: list) -> int:
+    try:
+        return names.index(name)
+    except ValueError:
+        return UNKNOWN_CODE
+
+def _decode_name(code: int, names: list) -> str:
+    return names[code] if code < len(names) else 'UNKNOWN'
+
+def encode_position(x: float, y: float, theta: float,
+                    velocity: float = 0.0,
+                    timestamp: Optional[float] = None,
+                    fmt: str = FORMAT_JSON) -> Union[bytes, str]:
+    timestamp = time.time() if timestamp is None else timestamp
+    
+    if fmt == FORMAT_BINARY:
+        return (HEADER.pack(MAGIC, CODEC_VERSION, MSG_POSITION) +
+                POSITION_BODY.pack(timestamp, x, y, theta, velocity))
+    
+    return json.dumps({"x": x, "y": y, "theta": theta,
+                       "velocity": velocity, "timestamp": timestamp})
+
+def encode_state(state: dict, fmt: str = FORMAT_JSON) -> Union[bytes, str]:
+    if fmt != FORMAT_BINARY:
+        return json.dumps(state)
+    
+    flags = _pack_flags(state)
+    
+    return (HEADER.pack(MAGIC, CODEC_VERSION, MSG_STATE) +
+            STATE_BODY.pack(
+                state.get('timestamp') or time.time(),
+                state.get('truck_id', 0),
+                *(float(state.get(field, 0.0)) for field in STATE_FLOAT_FIELDS),
+                _encode_name(state.get('status', ''), STATUS_NAMES),
+                _encode_name(state.get('mode', ''), MODE_NAMES),
+                flags
+            ))
+
+def _pack_flags(state: dict) -> int:
+    flags = 0
+    for bit, field in enumerate(STATE_FLAG_FIELDS):
+        if state.get(field):
+            flags |= 1 << bit
+    return flags
+
+def encode_state_delta(fields: dict,
+                       truck_id: int,
+                       seq: int,
+                       keyframe: bool = False,
+                       timestamp: Optional[float] = None,
+                       fmt: str = FORMAT_JSON) -> Union[bytes, str]:
+    timestamp = time.time() if timestamp is None else timestamp
+    
+    if fmt != FORMAT_BINARY:
+        message = dict(fields)
+        message.update({'truck_id': truck_id, 'timestamp': timestamp,
+                        '_seq': seq, '_keyframe': keyframe})
+        return json.dumps(message)
+    
+    mask = KEYFRAME_BIT if keyframe else 0
+    body = b''
+    for slot, (name, packer) in enumerate(zip(DELTA_SLOTS, DELTA_SLOT_STRUCTS)):
+        if name == 'flags':
+            if not any(field in fields for field in STATE_FLAG_FIELDS):
+                continue
+            value = _pack_flags(fields)
+        elif name not in fields:
+            continue
+        elif name == 'status':
+            value = _encode_name(fields['status'], STATUS_NAMES)
+        elif name == 'mode':
+            value = _encode_name(fields['mode'], MODE_NAMES)
+        else:
+            value = float(fields[name])
+        mask |= 1 << slot
+        body += packer.pack(value)
+    
+    return (HEADER.pack(MAGIC, CODEC_VERSION, MSG_STATE_DELTA) +
+            DELTA_HEADER.pack(timestamp, truck_id, seq, mask) + body)
+
+def _decode_state_delta(payload: bytes) -> dict:
+    timestamp, truck_id, seq, mask = DELTA_HEADER.unpack_from(payload, HEADER.size)
+    offset = HEADER.size + DELTA_HEADER.size
+    
+    state = {'timestamp': timestamp, 'truck_id': truck_id,
+             '_seq': seq, '_keyframe': bool(mask & KEYFRAME_BIT)}
+    for slot, (name, packer) in enumerate(zip(DELTA_SLOTS, DELTA_SLOT_STRUCTS)):
+        if not mask & (1 << slot):
+            continue
+        value = packer.unpack_from(payload, offset)[0]
+        offset += packer.size
+        if name == 'flags':
+            for bit, field in enumerate(STATE_FLAG_FIELDS):
+                state[field] = bool(value & (1 << bit))
+        elif name == 'status':
+            state['status'] = _decode_name(value, STATUS_NAMES)
+        elif name == 'mode':
+            state['mode'] = _decode_name(value, MODE_NAMES)
+        else:
+            state[name] = value
+    return state
+
+def is_binary(payload: bytes) -> bool:
+    return len(payload) > 0 and payload[0] == MAGIC
+
+def decode_payload(payload: Union[bytes, str]) -> dict:
+    if isinstance(payload, str):
+        return json.loads(payload)
+    
+    if not is_binary(payload):
+        return json.loads(payload.decode('utf-8'))
+    
+    if len(payload) < HEADER.size:
+        raise CodecError("payload binário truncado")
+    
+    _, version, msg_type = HEADER.unpack_from(payload)
+    if version != CODEC_VERSION:
+        raise CodecError(f"versão de codec não suportada: {version}")
+    
+    if msg_type == MSG_POSITION:
+        timestamp, x, y, theta, velocity = POSITION_BODY.unpack_from(payload, HEADER.size)
+        return {"x": x, "y": y, "theta": theta,
+                "velocity": velocity, "timestamp": timestamp}
+    
+    if msg_type == MSG_STATE:
+        values = STATE_BODY.unpack_from(payload, HEADER.size)
+        floats = values[2:2 + len(STATE_FLOAT_FIELDS)]
+        status_code, mode_code, flags = values[2 + len(STATE_FLOAT_FIELDS):]
+        
+        state = {'timestamp': values[0], 'truck_id': values[1]}
+        state.update(zip(STATE_FLOAT_FIELDS, floats))
+        state['status'] = _decode_name(status_code, STATUS_NAMES)
+        state['mode'] = _decode_name(mode_code, MODE_NAMES)
+        for bit, field in enumerate(STATE_FLAG_FIELDS):
+            state[field] = bool(flags & (1 << bit))
+        return state
+    
+    if msg_type == MSG_STATE_DELTA:
+        return _decode_state_delta(payload)
+    
+    raise CodecError(f"tipo de mensagem desconhecido: {msg_type}")
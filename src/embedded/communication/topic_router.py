@@ -0,0 +1,94 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+@dataclass(frozen=True)
+class TopicRoute:
+    pattern: str
+    levels: Tuple[str, ...]
+    handler: Callable[[Optional[int], Any], None]
+    message_class: Optional[str] = None
+
+@dataclass(frozen=True)
+class ResolvedTopic:
+    route: TopicRoute
+    truck_id: Optional[int]
+    wildcards: Tuple[str, ...]
+    
+    def dispatch(self, payload: Any) -> None:
+        self.route.handler(self.truck_id, payload)
+
+class TopicRouter:
+    
+    def __init__(self, cache_size: int = 4096):
+        self.cache_size = cache_size
+        self._routes: List[TopicRoute] = []
+        self._cache: Dict[str, Optional[ResolvedTopic]] = {}
+        
+        self.cache_hits = 0
+        self.cache_misses = 0
+    
+    def add_route(self, pattern: str, handler: Callable[[Optional[int], Any], None],
+                  message_class: str = None) -> TopicRoute:
+        route = TopicRoute(pattern, tuple(pattern.split('/')), handler, message_class)
+        self._routes.append(route)
+        self._cache.clear()
+        return route
+    
+    def remove_route(self, pattern: str) -> None:
+        self._routes = [route for route in self._routes if route.pattern != pattern]
+        self._cache.clear()
+    
+    def patterns(self) -> List[str]:
+        return [route.pattern for route in self._routes]
+    
+    def resolve(self, topic: str) -> Optional[ResolvedTopic]:
+        try:
+            resolved = self._cache[topic]
+            self.cache_hits += 1
+            return resolved
+        except KeyError:
+            pass
+        
+        self.cache_misses += 1
+        resolved = self._match(topic)
+        if len(self._cache) >= self.cache_size:
+            self._cache.clear()
+        self._cache[topic] = resolved
+        return resolved
+    
+    def dispatch(self, topic: str, payload: Any) -> bool:
+        resolved = self.resolve(topic)
+        if resolved is None:
+            return False
+        resolved.dispatch(payload)
+        return True
+    
+    def _match(self, topic: str) -> Optional[ResolvedTopic]:
+        levels = topic.split('/')
+        
+        for route in self._routes:
+            wildcards = []
+            matched = True
+            for idx, level in enumerate(route.levels):
+                if level == '#':
+                    wildcards.append('/'.join(levels[idx:]))
+                    break
+                if idx >= len(levels):
+                    matched = False
+                    break
+                if level == '+':
+                    wildcards.append(levels[idx])
+                elif level != levels[idx]:
+                    matched = False
+                    break
+            else:
+                matched = len(route.levels) == len(levels)
+            
+            if matched:
+                return ResolvedTopic(route, _truck_id(wildcards), tuple(wildcards))
+        return None
+
+def _truck_id(wildcards: List[str]) -> Optional[int]:
+    if wildcards and wildcards[0].isdigit():
+        return int(wildcards[0])
+    return None
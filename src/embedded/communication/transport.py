@@ -0,0 +1,150 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, Union
+try:
+    import paho.mqtt.client as mqtt
+    MQTT_AVAILABLE = True
+except ImportError:
+    MQTT_AVAILABLE = False
+
+TRANSPORT_PAHO = "paho"
+TRANSPORT_LOOPBACK = "loopback"
+
+ERR_SUCCESS = 0
+ERR_NO_CONN = 4
+
+@dataclass
+class TransportMessage:
+    topic: str
+    payload: bytes
+    qos: int = 0
+    retain: bool = False
+
+@dataclass
+class PublishResult:
+    rc: int = ERR_SUCCESS
+    mid: int = 0
+
+class Transport:
+    
+    def __init__(self, client_id: str, userdata: Any = None, clean_session: bool = True):
+        self.client_id = client_id
+        self.userdata = userdata
+        self.clean_session = clean_session
+        
+        self.on_connect: Optional[Callable] = None
+        self.on_disconnect: Optional[Callable] = None
+        self.on_message: Optional[Callable] = None
+    
+    def connect(self, host: str = "localhost", port: int = 1883, keepalive: int = 60) -> None:
+        raise NotImplementedError
+    
+    def disconnect(self) -> None:
+        raise NotImplementedError
+    
+    def reconnect(self) -> None:
+        raise NotImplementedError
+    
+    def loop_start(self) -> None:
+        pass
+    
+    def loop_stop(self) -> None:
+        pass
+    
+    def subscribe(self, topic: str, qos: int = 0) -> None:
+        raise NotImplementedError
+    
+    def unsubscribe(self, topic: str) -> None:
+        raise NotImplementedError
+    
+    def publish(self, topic: str, payload: Union[bytes, str] = b"", qos: int = 0,
+                retain: bool = False) -> PublishResult:
+        raise NotImplementedError
+    
+    def _notify_connect(self, rc: int, flags: dict = None) -> None:
+        if self.on_connect:
+            self.on_connect(self, self.userdata, flags or {}, rc)
+    
+    def _notify_disconnect(self, rc: int) -> None:
+        if self.on_disconnect:
+            self.on_disconnect(self, self.userdata, rc)
+    
+    def _notify_message(self, message: TransportMessage) -> None:
+        if self.on_message:
+            self.on_message(self, self.userdata, message)
+
+class PahoTransport(Transport):
+    
+    def __init__(self, client_id: str, userdata: Any = None, clean_session: bool = True):
+        super().__init__(client_id, userdata, clean_session)
+        
+        if not MQTT_AVAILABLE:
+            raise RuntimeError("paho-mqtt não instalado (pip install paho-mqtt)")
+        
+        try:
+            self._client = mqtt.Client(
+                client_id=client_id,
+                userdata=userdata,
+                clean_session=clean_session,
+                reconnect_on_failure=False,
+                callback_api_version=mqtt.CallbackAPIVersion.VERSION2
+            )
+        except (AttributeError, TypeError):
+            self._client = mqtt.Client(client_id=client_id, userdata=userdata,
+                                       clean_session=clean_session)
+        
+        self._client.on_connect = self._paho_on_connect
+        self._client.on_disconnect = self._paho_on_disconnect
+        self._client.on_message = self._paho_on_message
+    
+    def connect(self, host: str = "localhost", port: int = 1883, keepalive: int = 60) -> None:
+        self._client.connect(host, port, keepalive)
+    
+    def disconnect(self) -> None:
+        self._client.disconnect()
+    
+    def reconnect(self) -> None:
+        self._client.loop_stop()
+        self._client.reconnect()
+        self._client.loop_start()
+    
+    def loop_start(self) -> None:
+        self._client.loop_start()
+    
+    def loop_stop(self) -> None:
+        self._client.loop_stop()
+    
+    def subscribe(self, topic: str, qos: int = 0) -> None:
+        self._client.subscribe(topic, qos=qos)
+    
+    def unsubscribe(self, topic: str) -> None:
+        self._client.unsubscribe(topic)
+    
+    def publish(self, topic: str, payload: Union[bytes, str] = b"", qos: int = 0,
+                retain: bool = False) -> PublishResult:
+        info = self._client.publish(topic, payload, qos=qos, retain=retain)
+        return PublishResult(rc=info.rc, mid=info.mid)
+    
+    def _paho_on_connect(self, client, userdata, flags, rc, properties=None):
+        self._notify_connect(_reason_value(rc), {'session present': _session_present(flags)})
+    
+    def _paho_on_disconnect(self, client, userdata, *args):
+        rc = args[1] if len(args) >= 2 else args[0]
+        self._notify_disconnect(_reason_value(rc))
+    
+    def _paho_on_message(self, client, userdata, msg):
+        self._notify_message(msg)
+
+def _reason_value(rc) -> int:
+    return getattr(rc, 'value', rc)
+
+def _session_present(flags) -> bool:
+    if isinstance(flags, dict):
+        return bool(flags.get('session present', 0))
+    return bool(getattr(flags, 'session_present', False))
+
+def create_transport(kind: str, client_id: str, userdata: Any = None, broker=None,
+                     clean_session: bool = True) -> Transport:
+    if kind == TRANSPORT_LOOPBACK:
+        from src.embedded.communication.loopback import LoopbackTransport, get_default_broker
+        return LoopbackTransport(broker or get_default_broker(), client_id, userdata, clean_session)
+    return PahoTransport(client_id, userdata, clean_session)
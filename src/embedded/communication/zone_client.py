@@ -0,0 +1,79 @@
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List
+from src.models.zone import Zone
+
+class ZoneReservationClient:
+    
+    def __init__(self,
+                 zones: List[Zone],
+                 publish_request: Callable[[str, float, float], None],
+                 publish_release: Callable[[str], None],
+                 retry_interval: float = 2.0,
+                 response_timeout: float = 5.0,
+                 clock: Callable[[], float] = time.time):
+        self.zones = zones
+        self.publish_request = publish_request
+        self.publish_release = publish_release
+        self.retry_interval = retry_interval
+        self.response_timeout = response_timeout
+        self.clock = clock
+        self.service_answered = False
+        
+        self._lock = threading.Lock()
+        self._grants: Dict[str, float] = {}
+        self._first_request: Dict[str, float] = {}
+        self._last_request: Dict[str, float] = {}
+        self._unanswered = set()
+        self.waits = deque(maxlen=200)
+    
+    def request(self, zone_id: str, eta: float, duration: float) -> bool:
+        now = self.clock()
+        with self._lock:
+            if self._grants.get(zone_id, 0.0) > now:
+                return True
+            self._grants.pop(zone_id, None)
+            first_request = self._first_request.get(zone_id)
+            if (not self.service_answered and first_request is not None
+                    and now - first_request >= self.response_timeout):
+                # nobody has ever answered: there is no reservation service to wait for
+                if zone_id not in self._unanswered:
+                    self._unanswered.add(zone_id)
+                    print(f"[ZONA] Sem resposta do serviço de reservas - seguindo pela zona {zone_id}")
+                return True
+            last_request = self._last_request.get(zone_id)
+            if last_request is not None and now - last_request < self.retry_interval:
+                return False
+            self._first_request.setdefault(zone_id, now)
+            self._last_request[zone_id] = now
+        self.publish_request(zone_id, eta, duration)
+        return False
+    
+    def release(self, zone_id: str):
+        with self._lock:
+            held = self._grants.pop(zone_id, None) is not None
+            self._first_request.pop(zone_id, None)
+            self._last_request.pop(zone_id, None)
+            self._unanswered.discard(zone_id)
+        if held:
+            self.publish_release(zone_id)
+    
+    def is_granted(self, zone_id: str) -> bool:
+        with self._lock:
+            return self._grants.get(zone_id, 0.0) > self.clock()
+    
+    def on_response(self, data: dict):
+        zone_id = data.get('zone')
+        with self._lock:
+            self.service_answered = True
+        if not data.get('granted'):
+            return
+        
+        now = self.clock()
+        with self._lock:
+            self._grants[zone_id] = now + float(data.get('expires_in', 30.0))
+            first = self._first_request.pop(zone_id, None)
+            self._last_request.pop(zone_id, None)
+        if first is not None:
+            self.waits.append(now - first)
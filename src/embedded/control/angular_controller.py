@@ -1,4 +1,6 @@
 import math
+import time
+from typing import Callable
 from src.embedded.control.pid_controller import PIDController
 
 class AngularController:
@@ -7,14 +9,16 @@ class AngularController:
                  kp: float = 1.0, 
                  ki: float = 0.05, 
                  kd: float = 0.2,
-                 max_steering: float = 1.0):
+                 max_steering: float = 1.0,
+                 clock: Callable[[], float] = time.time):
         self.pid = PIDController(
             kp=kp,
             ki=ki,
             kd=kd,
             output_min=-max_steering,
             output_max=max_steering,
-            sample_time=0.05
+            sample_time=0.05,
+            clock=clock
         )
         self._enabled = False
     
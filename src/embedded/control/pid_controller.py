@@ -1,5 +1,5 @@
 import time
-from typing import Optional
+from typing import Callable, Optional
 
 class PIDController:
     
@@ -9,13 +9,15 @@ class PIDController:
                  kd: float = 0.0,
                  output_min: float = -1.0,
                  output_max: float = 1.0,
-                 sample_time: float = 0.1):
+                 sample_time: float = 0.1,
+                 clock: Callable[[], float] = time.time):
         self.kp = kp
         self.ki = ki
         self.kd = kd
         self.output_min = output_min
         self.output_max = output_max
         self.sample_time = sample_time
+        self.clock = clock
         
         self._integral = 0.0
         self._last_error = 0.0
@@ -25,7 +27,7 @@ class PIDController:
         self._setpoint = 0.0
     
     def compute(self, measured_value: float, setpoint: float) -> float:
-        current_time = time.time()
+        current_time = self.clock()
         
         if self._last_time is None:
             self._last_time = current_time
@@ -33,7 +35,7 @@ class PIDController:
             return 0.0
         
         dt = current_time - self._last_time
-        if dt < self.sample_time:
+        if dt + 1e-9 < self.sample_time:
             return self._last_output
         
         error = setpoint - measured_value
@@ -1,3 +1,5 @@
+import time
+from typing import Callable
 from src.embedded.control.pid_controller import PIDController
 
 class VelocityController:
@@ -6,14 +8,16 @@ class VelocityController:
                  kp: float = 0.5, 
                  ki: float = 0.1, 
                  kd: float = 0.05,
-                 max_accel: float = 1.0):
+                 max_accel: float = 1.0,
+                 clock: Callable[[], float] = time.time):
         self.pid = PIDController(
             kp=kp,
             ki=ki,
             kd=kd,
             output_min=-max_accel,
             output_max=max_accel,
-            sample_time=0.05
+            sample_time=0.05,
+            clock=clock
         )
         self._enabled = False
     
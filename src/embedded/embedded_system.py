@@ -0,0 +1,399 @@
+import math
+import os
+import time
+import queue
+from config.settings import *
+from src.embedded.sync.circular_buffer import CircularBuffer
+from src.embedded.sync.shared_state import SharedState
+from src.embedded.sync.neighbour_table import NeighbourTable
+from src.embedded.sync.event_manager import EventManager
+from src.simulation.mine_simulator import MineSimulatorTask
+from src.embedded.tasks.sensor_processing import SensorProcessingTask
+from src.embedded.tasks.fault_monitoring import FaultMonitoringTask
+from src.embedded.tasks.command_logic import CommandLogicTask
+from src.embedded.tasks.navigation_control import NavigationControlTask
+from src.embedded.tasks.data_collector import DataCollectorTask
+from src.embedded.tasks.route_planner import RoutePlanningTask
+from src.embedded.tasks.local_interface import LocalInterfaceTask
+from src.embedded.tasks.collision_avoidance import CollisionAvoidanceTask
+from src.embedded.communication.mqtt_client import MQTTClient
+from src.embedded.communication.route_stream import RouteChunkAssembler
+from src.embedded.communication.position_policy import DeadReckoningPublishPolicy
+from src.embedded.communication.store_forward import StoreAndForwardBuffer
+from src.embedded.communication.zone_client import ZoneReservationClient
+from src.models.zone import zones_from_config
+from src.simulation.random_fault_generator import RandomFaultGenerator
+from src.simulation.random_streams import STREAM_FAULTS, STREAM_HEATING, STREAM_NOISE, component_rng
+
+class EmbeddedSystem:
+    
+    def __init__(self, truck_id: int = 1, enable_mqtt: bool = False, transport=None, start_pose=None,
+                 seed: int = None):
+        self.truck_id = truck_id
+        self.enable_mqtt = enable_mqtt
+        
+        print("="*70)
+        print(f"SISTEMA EMBARCADO - CAMINHÃO {truck_id}".center(70))
+        print("="*70)
+        print("\nInicializando componentes...")
+        
+        self.circular_buffer = CircularBuffer(BUFFER_CONFIG['size'])
+        self.shared_state = SharedState(truck_id, NeighbourTable(
+            expiry=NEIGHBOUR_CONFIG['expiry'],
+            base_uncertainty=NEIGHBOUR_CONFIG['base_uncertainty'],
+            velocity_uncertainty=NEIGHBOUR_CONFIG['velocity_uncertainty'],
+            max_acceleration=NEIGHBOUR_CONFIG['max_acceleration'],
+            speed_scale=NEIGHBOUR_CONFIG['speed_scale'],
+            max_uncertainty=TELEMETRY_CONFIG['position_tolerance'] + NEIGHBOUR_CONFIG['latency_margin']
+        ))
+        self.event_manager = EventManager()
+        if seed is None:
+            seed = SIMULATION_CONFIG['seed']
+        
+        self.command_queue = queue.Queue(maxsize=50)
+        # room for the largest route streamed in chunks, plus the usual backlog of small updates
+        self.waypoint_queue = queue.Queue(maxsize=ROUTE_CONFIG['queue_size'] + math.ceil(
+            ROUTE_CONFIG['max_waypoints'] / ROUTE_CONFIG['chunk_size']))
+        self.route_assembler = RouteChunkAssembler(
+            chunk_timeout=ROUTE_CONFIG['chunk_timeout'],
+            max_waypoints=ROUTE_CONFIG['max_waypoints']
+        )
+        
+        self.simulator = MineSimulatorTask(
+            self.shared_state,
+            simulation_period=TIMING_CONFIG['simulation_period'],
+            start_pose=tuple(start_pose or SIMULATION_CONFIG['start_pose']),
+            noise_std_devs=NOISE_CONFIG,
+            heating_probability=SIMULATION_CONFIG['heating_probability'],
+            heating_interval=SIMULATION_CONFIG['heating_interval'],
+            heating_range=tuple(SIMULATION_CONFIG['heating_range']),
+            noise_rng=component_rng(seed, truck_id, STREAM_NOISE),
+            heating_rng=component_rng(seed, truck_id, STREAM_HEATING)
+        )
+        
+        self.fault_generator = RandomFaultGenerator(
+            inject_electrical_fault=self.simulator.inject_electrical_fault,
+            inject_hydraulic_fault=self.simulator.inject_hydraulic_fault,
+            check_period=SIMULATION_CONFIG['fault_check_period'],
+            electrical_fault_probability=SIMULATION_CONFIG['electrical_fault_probability'],
+            hydraulic_fault_probability=SIMULATION_CONFIG['hydraulic_fault_probability'],
+            rng=component_rng(seed, truck_id, STREAM_FAULTS)
+        )
+        
+        self.tasks = []
+        
+        sensor_task = SensorProcessingTask(
+            sensor_reader=self.simulator.get_sensor_data,
+            circular_buffer=self.circular_buffer,
+            filter_order=FILTER_CONFIG['order'],
+            sample_period=TIMING_CONFIG['sensor_processing_period']
+        )
+        self.tasks.append(sensor_task)
+        
+        fault_task = FaultMonitoringTask(
+            sensor_reader=self.simulator.get_sensor_data,
+            event_manager=self.event_manager,
+            check_period=TIMING_CONFIG['fault_monitoring_period'],
+            temp_alert_threshold=FAULT_CONFIG['temperature_alert_threshold'],
+            temp_fault_threshold=FAULT_CONFIG['temperature_fault_threshold']
+        )
+        self.tasks.append(fault_task)
+        
+        command_task = CommandLogicTask(
+            circular_buffer=self.circular_buffer,
+            shared_state=self.shared_state,
+            event_manager=self.event_manager,
+            command_queue=self.command_queue,
+            update_period=TIMING_CONFIG['command_logic_period'],
+            fault_generator=self.fault_generator,
+            simulator=self.simulator
+        )
+        self.tasks.append(command_task)
+        
+        nav_task = NavigationControlTask(
+            shared_state=self.shared_state,
+            event_manager=self.event_manager,
+            control_period=TIMING_CONFIG['control_period']
+        )
+        self.tasks.append(nav_task)
+        
+        data_task = DataCollectorTask(
+            shared_state=self.shared_state,
+            event_manager=self.event_manager,
+            log_dir=LOG_CONFIG['log_dir'],
+            collection_period=TIMING_CONFIG['data_collection_period']
+        )
+        self.tasks.append(data_task)
+        
+        route_task = RoutePlanningTask(
+            shared_state=self.shared_state,
+            event_manager=self.event_manager,
+            waypoint_queue=self.waypoint_queue,
+            planning_period=TIMING_CONFIG['route_planning_period'],
+            waypoint_threshold=ROUTE_CONFIG['waypoint_threshold'],
+            zone_request_distance=ZONE_CONFIG['request_distance'],
+            zone_stop_margin=ZONE_CONFIG['stop_margin'],
+            zone_crossing_speed=ZONE_CONFIG['crossing_speed']
+        )
+        self.tasks.append(route_task)
+        
+        collision_task = CollisionAvoidanceTask(
+            shared_state=self.shared_state,
+            event_manager=self.event_manager,
+            check_period=COLLISION_CONFIG['check_period'],
+            safety_distance=COLLISION_CONFIG['safety_distance'],
+            warning_distance=COLLISION_CONFIG['warning_distance']
+        )
+        self.tasks.append(collision_task)
+        
+        interface_task = LocalInterfaceTask(
+            shared_state=self.shared_state,
+            data_collector=data_task,
+            command_queue=self.command_queue,
+            update_period=TIMING_CONFIG['interface_update_period']
+        )
+        self.tasks.append(interface_task)
+        
+        self.position_policy = DeadReckoningPublishPolicy(
+            position_tolerance=TELEMETRY_CONFIG['position_tolerance'],
+            heading_tolerance=TELEMETRY_CONFIG['heading_tolerance'],
+            min_interval=TELEMETRY_CONFIG['position_min_interval'],
+            max_interval=TELEMETRY_CONFIG['position_max_interval'],
+            receiver_expiry=NEIGHBOUR_CONFIG['expiry']
+        )
+        
+        self._last_state_publish = 0.0
+        self.mqtt_client = None
+        if enable_mqtt:
+            store_forward = None
+            if STORE_FORWARD_CONFIG['enabled']:
+                store_forward = StoreAndForwardBuffer(
+                    directory=os.path.join(STORE_FORWARD_CONFIG['directory'], f"truck_{truck_id}"),
+                    classes=STORE_FORWARD_CONFIG['classes'],
+                    max_bytes=STORE_FORWARD_CONFIG['max_bytes'],
+                    segment_bytes=STORE_FORWARD_CONFIG['segment_bytes']
+                )
+            
+            self.mqtt_client = MQTTClient(
+                truck_id=truck_id,
+                broker_host=MQTT_CONFIG['broker_host'],
+                broker_port=MQTT_CONFIG['broker_port'],
+                qos=MQTT_CONFIG['qos'],
+                payload_format=MQTT_CONFIG['payload_format'],
+                delta_mode=TELEMETRY_CONFIG['delta_mode'],
+                keyframe_interval=TELEMETRY_CONFIG['keyframe_interval'],
+                delta_tolerances=TELEMETRY_CONFIG['delta_tolerances'],
+                inbound_queues=INBOUND_CONFIG,
+                transport=transport,
+                transport_kind=MQTT_CONFIG['transport'],
+                store_forward=store_forward,
+                drain_rate=STORE_FORWARD_CONFIG['drain_rate'],
+                reconnect=RECONNECT_CONFIG
+            )
+        
+        self.zone_client = None
+        if self.mqtt_client and ZONE_CONFIG['enabled']:
+            self.zone_client = ZoneReservationClient(
+                zones=zones_from_config(ZONE_CONFIG['zones']),
+                publish_request=self.mqtt_client.publish_zone_request,
+                publish_release=self.mqtt_client.publish_zone_release,
+                retry_interval=ZONE_CONFIG['retry_interval'],
+                response_timeout=ZONE_CONFIG['response_timeout']
+            )
+            route_task.zone_client = self.zone_client
+        if self.mqtt_client:
+            route_task.route_ack = self.mqtt_client.publish_route_ack
+        
+        print(f"\n✓ {len(self.tasks)} tarefas criadas")
+        print(f"✓ Buffer circular: {BUFFER_CONFIG['size']} amostras")
+        print(f"✓ Filtro média móvel: ordem {FILTER_CONFIG['order']}")
+    
+    def start(self):
+        print("\nIniciando tarefas concorrentes...")
+        
+        self.simulator.start()
+        time.sleep(0.5)
+        
+        self.fault_generator.start()
+        print("✓ Gerador de falhas aleatórias iniciado")
+        
+        for task in self.tasks:
+            task.start()
+            time.sleep(0.1)
+        
+        if self.mqtt_client:
+            self.mqtt_client.register_callback('command', self._handle_mqtt_command)
+            self.mqtt_client.register_callback('setpoint', self._handle_mqtt_setpoint)
+            self.mqtt_client.register_callback('route', self._handle_mqtt_route)
+            self.mqtt_client.register_callback('position', self._handle_mqtt_position)
+            if self.zone_client:
+                self.mqtt_client.register_callback('zone_grant', self.zone_client.on_response)
+            
+            if self.mqtt_client.connect():
+                print("✓ MQTT conectado")
+            else:
+                print("⚠ MQTT não disponível - tentando reconectar em segundo plano")
+        
+        print("\n" + "="*70)
+        print("SISTEMA OPERACIONAL".center(70))
+        print("="*70)
+        print("\nPressione Ctrl+C para encerrar\n")
+    
+    def run(self):
+        try:
+            while True:
+                if self.event_manager.is_shutdown():
+                    print("\nShutdown solicitado...")
+                    break
+                
+                self.publish_telemetry(time.time())
+                time.sleep(TELEMETRY_CONFIG['position_check_period'])
+        
+        except KeyboardInterrupt:
+            print("\n\nInterrompido pelo usuário")
+    
+    def publish_telemetry(self, now: float):
+        # also runs while the link is down: the client stores to disk and replays after reconnecting
+        if self.mqtt_client is None:
+            return
+        
+        x, y, theta, velocity = self.shared_state.get_position()
+        if self.position_policy.update(x, y, theta, velocity, now):
+            self.mqtt_client.publish_position(x, y, theta, velocity)
+        
+        if now - self._last_state_publish >= TELEMETRY_CONFIG['state_period']:
+            self._last_state_publish = now
+            self._publish_state()
+    
+    def _publish_state(self):
+        state = self.shared_state.get_state()
+        
+        self.mqtt_client.publish_state({
+            'truck_id': state.truck_id,
+            'timestamp': time.time(),
+            'status': state.status.name,
+            'mode': state.mode.name,
+            'x': state.position_x,
+            'y': state.position_y,
+            'theta': state.theta,
+            'velocity': state.velocity,
+            'velocity_setpoint': state.velocity_setpoint,
+            'angular_setpoint': state.angular_setpoint,
+            'acceleration_cmd': state.acceleration_cmd,
+            'steering_cmd': state.steering_cmd,
+            'temperature': state.temperature,
+            'electrical_fault': state.electrical_fault,
+            'hydraulic_fault': state.hydraulic_fault,
+            'emergency_stop': state.emergency_stop
+        })
+    
+    def _handle_mqtt_command(self, data: dict):
+        from src.models.command import Command, CommandType
+        
+        try:
+            cmd_type_str = data.get('type', '')
+            print(f"[MQTT] Comando recebido: {cmd_type_str}")
+            
+            cmd_map = {
+                'AUTO': CommandType.ENABLE_AUTOMATIC,
+                'ENABLE_AUTOMATIC': CommandType.ENABLE_AUTOMATIC,
+                'MANUAL': CommandType.DISABLE_AUTOMATIC,
+                'DISABLE_AUTOMATIC': CommandType.DISABLE_AUTOMATIC,
+                'EMERGENCY': CommandType.EMERGENCY_STOP,
+                'EMERGENCY_STOP': CommandType.EMERGENCY_STOP,
+                'RESET': CommandType.RESET_EMERGENCY,
+                'RESET_EMERGENCY': CommandType.RESET_EMERGENCY,
+                'RESET_FAULT': CommandType.RESET_FAULT,
+                'STOP': CommandType.STOP,
+                'MOVE_FORWARD': CommandType.MOVE_FORWARD,
+                'MOVE_BACKWARD': CommandType.MOVE_BACKWARD,
+                'TURN_LEFT': CommandType.TURN_LEFT,
+                'TURN_RIGHT': CommandType.TURN_RIGHT,
+                'ACCELERATE': CommandType.ACCELERATE,
+                'BRAKE': CommandType.BRAKE
+            }
+            
+            if cmd_type_str in cmd_map:
+                command = Command(
+                    command_type=cmd_map[cmd_type_str],
+                    value=data.get('value'),
+                    timestamp=time.time(),
+                    source="mqtt"
+                )
+                self.command_queue.put(command)
+                print(f"[MQTT] Comando '{cmd_type_str}' adicionado à fila")
+            else:
+                print(f"[MQTT] Comando desconhecido: {cmd_type_str}")
+                
+        except Exception as e:
+            print(f"[MQTT] Erro ao processar comando: {e}")
+    
+    def _handle_mqtt_setpoint(self, data: dict):
+        try:
+            velocity = data.get('velocity', 0.0)
+            print(f"[MQTT] Setpoint de velocidade recebido: {velocity} m/s")
+            self.shared_state.set_setpoints(velocity, None)
+        except Exception as e:
+            print(f"[MQTT] Erro ao processar setpoint: {e}")
+    
+    def _handle_mqtt_route(self, data: dict):
+        seq = data.get('seq')
+        try:
+            update = self.route_assembler.accept(data)
+            if update is None:
+                print(f"[MQTT] Parte {data.get('chunk', 0) + 1}/{data.get('chunks')} da rota recebida")
+                return
+            
+            print(f"[MQTT] Atualização de rota recebida: {update}")
+            
+            if not update.waypoints:
+                print(f"[MQTT] Nenhum waypoint válido na rota")
+                self.mqtt_client.publish_route_ack(seq, 'rejected', 'rota vazia')
+                return
+            
+            try:
+                self.waypoint_queue.put_nowait(update)
+            except queue.Full:
+                print(f"[MQTT] Fila de rotas cheia - atualização {update} rejeitada")
+                self.mqtt_client.publish_route_ack(seq, 'rejected', 'fila de rotas cheia')
+                return
+            
+            # acknowledged by the planner once it has applied (or parked) the update
+            print(f"[MQTT] Rota adicionada à fila de planejamento ({update})")
+                
+        except Exception as e:
+            print(f"[MQTT] Erro ao processar rota: {e}")
+            self.mqtt_client.publish_route_ack(seq, 'rejected', str(e))
+    
+    def _handle_mqtt_position(self, data: dict):
+        try:
+            other_truck_id = data.get('truck_id')
+            x = data.get('x')
+            y = data.get('y')
+            theta = data.get('theta', 0.0)
+            velocity = data.get('velocity', 0.0)
+            
+            if other_truck_id and x is not None and y is not None:
+                self.shared_state.update_other_truck_position(other_truck_id, x, y, theta, velocity)
+        except Exception as e:
+            print(f"[MQTT] Erro ao processar posição: {e}")
+    
+    def stop(self):
+        print("\nEncerrando sistema...")
+        
+        self.event_manager.shutdown()
+        time.sleep(0.5)
+        
+        self.fault_generator.stop()
+        
+        self.simulator.stop()
+        
+        for task in self.tasks:
+            task.stop()
+        
+        time.sleep(1.0)
+        
+        if self.mqtt_client:
+            self.mqtt_client.disconnect()
+        
+        print("Sistema encerrado")
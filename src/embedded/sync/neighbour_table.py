@@ -0,0 +1,97 @@
+import numpy as np
+from typing import Dict, Tuple
+
+class NeighbourTable:
+    
+    def __init__(self,
+                 capacity: int = 16,
+                 expiry: float = 5.0,
+                 base_uncertainty: float = 0.5,
+                 velocity_uncertainty: float = 1.0,
+                 max_acceleration: float = 1.0,
+                 speed_scale: float = 5.0,
+                 max_uncertainty: float = float('inf')):
+        self.expiry = expiry
+        self.base_uncertainty = base_uncertainty
+        self.velocity_uncertainty = velocity_uncertainty
+        self.max_acceleration = max_acceleration
+        self.speed_scale = speed_scale
+        self.max_uncertainty = max_uncertainty
+        
+        self._ids = np.zeros(capacity, dtype=np.int64)
+        self._data = np.zeros((capacity, 5), dtype=np.float64)
+        self._rows: Dict[int, int] = {}
+        self._count = 0
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def update(self, truck_id: int, x: float, y: float, theta: float,
+               velocity: float, timestamp: float) -> None:
+        row = self._rows.get(truck_id)
+        if row is None:
+            if self._count == len(self._ids):
+                self._grow()
+            row = self._count
+            self._count += 1
+            self._rows[truck_id] = row
+            self._ids[row] = truck_id
+        self._data[row] = (x, y, theta, velocity, timestamp)
+    
+    def remove(self, truck_id: int) -> None:
+        row = self._rows.pop(truck_id, None)
+        if row is None:
+            return
+        last = self._count - 1
+        if row != last:
+            moved_id = int(self._ids[last])
+            self._ids[row] = self._ids[last]
+            self._data[row] = self._data[last]
+            self._rows[moved_id] = row
+        self._count = last
+    
+    def expire(self, now: float) -> None:
+        ages = now - self._data[:self._count, 4]
+        for truck_id in self._ids[:self._count][ages >= self.expiry].tolist():
+            self.remove(truck_id)
+    
+    def predict(self, now: float) -> Tuple[np.ndarray, ...]:
+        n = self._count
+        x, y, theta, velocity, timestamp = self._data[:n].T
+        
+        age = np.clip(now - timestamp, 0.0, self.expiry)
+        px = x + velocity * np.cos(theta) * age
+        py = y + velocity * np.sin(theta) * age
+        # a parked neighbour does not drift; once it moves, its own dead-reckoning policy publishes
+        # before the error exceeds its tolerance, so the radius never needs to grow past that bound
+        motion = np.minimum(np.abs(velocity) / self.speed_scale, 1.0)
+        radius = np.minimum(self.base_uncertainty +
+                            motion * (self.velocity_uncertainty * age + 0.5 * self.max_acceleration * age * age),
+                            self.max_uncertainty)
+        
+        return self._ids[:n].copy(), px, py, theta.copy(), velocity.copy(), age, radius
+    
+    def as_dict(self, now: float) -> Dict[int, Dict]:
+        ids, px, py, theta, velocity, age, radius = self.predict(now)
+        timestamps = self._data[:self._count, 4]
+        return {
+            int(ids[i]): {
+                'x': float(px[i]),
+                'y': float(py[i]),
+                'theta': float(theta[i]),
+                'velocity': float(velocity[i]),
+                'age': float(age[i]),
+                'uncertainty': float(radius[i]),
+                'last_update': float(timestamps[i])
+            }
+            for i in range(len(ids))
+        }
+    
+    def _grow(self) -> None:
+        capacity = len(self._ids) * 2
+        ids = np.zeros(capacity, dtype=np.int64)
+        data = np.zeros((capacity, 5), dtype=np.float64)
+        ids[:self._count] = self._ids[:self._count]
+        data[:self._count] = self._data[:self._count]
+        self._ids = ids
+        self._data = data
@@ -1,14 +1,18 @@
 import threading
 import copy
-from typing import Dict
+import time
+from typing import Callable, Dict, Tuple
 from src.models.vehicle_state import VehicleState, OperationMode, VehicleStatus
+from src.embedded.sync.neighbour_table import NeighbourTable
 
 class SharedState:
     
-    def __init__(self, truck_id: int):
+    def __init__(self, truck_id: int, neighbour_table: NeighbourTable = None,
+                 clock: Callable[[], float] = time.time):
         self._state = VehicleState(truck_id=truck_id)
         self._lock = threading.Lock()
-        self._other_trucks: Dict[int, Dict] = {}
+        self._other_trucks = neighbour_table or NeighbourTable()
+        self.clock = clock
     
     def get_state(self) -> VehicleState:
         with self._lock:
@@ -97,25 +101,23 @@ class SharedState:
             return (self._state.velocity_setpoint, 
                     self._state.angular_setpoint)
     
-    def update_other_truck_position(self, truck_id: int, x: float, y: float, theta: float = 0.0) -> None:
+    def update_other_truck_position(self, truck_id: int, x: float, y: float, theta: float = 0.0,
+                                    velocity: float = 0.0) -> None:
         with self._lock:
-            self._other_trucks[truck_id] = {
-                'x': x,
-                'y': y,
-                'theta': theta,
-                'last_update': __import__('time').time()
-            }
+            self._other_trucks.update(truck_id, x, y, theta, velocity, self.clock())
     
     def get_other_trucks_positions(self) -> Dict[int, Dict]:
         with self._lock:
-            current_time = __import__('time').time()
-            self._other_trucks = {
-                tid: data for tid, data in self._other_trucks.items()
-                if current_time - data.get('last_update', 0) < 5.0
-            }
-            return copy.deepcopy(self._other_trucks)
+            now = self.clock()
+            self._other_trucks.expire(now)
+            return self._other_trucks.as_dict(now)
+    
+    def predict_other_trucks(self) -> Tuple:
+        with self._lock:
+            now = self.clock()
+            self._other_trucks.expire(now)
+            return self._other_trucks.predict(now)
     
     def remove_other_truck(self, truck_id: int) -> None:
         with self._lock:
-            if truck_id in self._other_trucks:
-                del self._other_trucks[truck_id]
+            self._other_trucks.remove(truck_id)
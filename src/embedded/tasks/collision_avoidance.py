@@ -1,6 +1,7 @@
 import threading
 import time
 import math
+import numpy as np
 from typing import Dict, Tuple, Optional
 from src.embedded.sync.shared_state import SharedState
 from src.embedded.sync.event_manager import EventManager, EventType
@@ -32,15 +33,7 @@ class CollisionAvoidanceTask(threading.Thread):
             start_time = time.time()
             
             try:
-                state = self.shared_state.get_state()
-                
-                if state.is_automatic():
-                    self._check_collisions()
-                else:
-                    if self.avoidance_active:
-                        self.avoidance_active = False
-                        print(f"[{self.name}] Desvio desativado (modo manual)")
-                
+                self.step()
             except Exception as e:
                 print(f"[{self.name}] Erro: {e}")
             
@@ -50,36 +43,52 @@ class CollisionAvoidanceTask(threading.Thread):
         
         print(f"[{self.name}] Tarefa finalizada")
     
+    def step(self):
+        state = self.shared_state.get_state()
+        
+        if state.is_automatic():
+            self._check_collisions()
+        else:
+            if self.avoidance_active:
+                self.avoidance_active = False
+                print(f"[{self.name}] Desvio desativado (modo manual)")
+    
     def _check_collisions(self):
         state = self.shared_state.get_state()
         my_pos = (state.position_x, state.position_y)
         my_velocity = state.velocity
         my_theta = state.theta
         
-        other_trucks = self.shared_state.get_other_trucks_positions()
+        ids, px, py, _, _, _, radius = self.shared_state.predict_other_trucks()
         
-        if not other_trucks:
+        if len(ids) == 0:
             if self.avoidance_active:
                 self.avoidance_active = False
                 self.closest_truck_id = None
                 self.closest_distance = float('inf')
             return
         
+        dx = px - my_pos[0]
+        dy = py - my_pos[1]
+        distances = np.maximum(np.hypot(dx, dy) - radius, 0.0)
+        
+        angle_diff = np.arctan2(dy, dx) - my_theta
+        angle_diff = np.abs(np.arctan2(np.sin(angle_diff), np.cos(angle_diff)))
+        in_trajectory = (angle_diff < math.pi / 4) & (distances < self.warning_distance * 2)
+        
         closest_truck = None
         min_distance = float('inf')
         
-        for truck_id, truck_data in other_trucks.items():
-            other_pos = (truck_data['x'], truck_data['y'])
-            distance = self._calculate_distance(my_pos, other_pos)
-            
-            if self._is_in_trajectory(my_pos, my_theta, other_pos, distance):
-                if distance < min_distance:
-                    min_distance = distance
-                    closest_truck = {
-                        'id': truck_id,
-                        'distance': distance,
-                        'position': other_pos
-                    }
+        if in_trajectory.any():
+            candidates = np.flatnonzero(in_trajectory)
+            idx = candidates[np.argmin(distances[candidates])]
+            min_distance = float(distances[idx])
+            closest_truck = {
+                'id': int(ids[idx]),
+                'distance': min_distance,
+                'position': (float(px[idx]), float(py[idx])),
+                'uncertainty': float(radius[idx])
+            }
         
         self.closest_distance = min_distance
         
@@ -119,26 +128,6 @@ class CollisionAvoidanceTask(threading.Thread):
                 self.closest_truck_id = None
                 print(f"[{self.name}] Distância segura recuperada ({min_distance:.1f}m)")
     
-    def _calculate_distance(self, pos1: Tuple[float, float], pos2: Tuple[float, float]) -> float:
-        return math.sqrt((pos2[0] - pos1[0])**2 + (pos2[1] - pos1[1])**2)
-    
-    def _is_in_trajectory(self, my_pos: Tuple[float, float], my_theta: float, 
-                          other_pos: Tuple[float, float], distance: float) -> bool:
-        dx = other_pos[0] - my_pos[0]
-        dy = other_pos[1] - my_pos[1]
-        
-        angle_to_other = math.atan2(dy, dx)
-        
-        angle_diff = angle_to_other - my_theta
-        angle_diff = math.atan2(math.sin(angle_diff), math.cos(angle_diff))
-        
-        max_angle = math.pi / 4
-        
-        in_cone = abs(angle_diff) < max_angle
-        in_range = distance < self.warning_distance * 2
-        
-        return in_cone and in_range
-    
     def _calculate_avoidance_angle(self, my_pos: Tuple[float, float], my_theta: float,
                                    other_pos: Tuple[float, float]) -> float:
         dx = other_pos[0] - my_pos[0]
@@ -42,30 +42,7 @@ class CommandLogicTask(threading.Thread):
             start_time = time.time()
             
             try:
-
-                self._process_commands()
-                
-                latest_data = self.circular_buffer.read_latest()
-                
-                if latest_data:
-
-                    self.shared_state.set_position(
-                        latest_data.position_x,
-                        latest_data.position_y,
-                        latest_data.theta,
-                        latest_data.velocity
-                    )
-                    
-                    self.shared_state.set_faults(
-                        temperature=latest_data.temperature,
-                        electrical=latest_data.electrical_fault,
-                        hydraulic=latest_data.hydraulic_fault
-                    )
-                
-                self._update_vehicle_status()
-                
-                self._check_fault_events()
-                
+                self.step()
             except Exception as e:
                 print(f"[{self.name}] Erro: {e}")
             
@@ -75,6 +52,30 @@ class CommandLogicTask(threading.Thread):
         
         print(f"[{self.name}] Tarefa finalizada")
     
+    def step(self):
+        self._process_commands()
+        
+        latest_data = self.circular_buffer.read_latest()
+        
+        if latest_data:
+
+            self.shared_state.set_position(
+                latest_data.position_x,
+                latest_data.position_y,
+                latest_data.theta,
+                latest_data.velocity
+            )
+            
+            self.shared_state.set_faults(
+                temperature=latest_data.temperature,
+                electrical=latest_data.electrical_fault,
+                hydraulic=latest_data.hydraulic_fault
+            )
+        
+        self._update_vehicle_status()
+        
+        self._check_fault_events()
+    
     def _process_commands(self):
         while not self.command_queue.empty():
             try:
@@ -205,7 +206,10 @@ class CommandLogicTask(threading.Thread):
 
         event = self.event_manager.check_event(EventType.TEMPERATURE_FAULT)
         if event:
-            print(f"[{self.name}] Falha de temperatura recebida")
+            print(f"[{self.name}] Falha de temperatura recebida - PARANDO VEÍCULO")
+            self._save_state_before_fault()
+            self.shared_state.set_actuators(0.0, 0.0)
+            self.shared_state.set_setpoints(0.0, 0.0)
         
         event = self.event_manager.check_event(EventType.ELECTRICAL_FAULT)
         if event:
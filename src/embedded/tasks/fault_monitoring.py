@@ -33,53 +33,7 @@ class FaultMonitoringTask(threading.Thread):
             start_time = time.time()
             
             try:
-
-                sensor_data = self.sensor_reader()
-                
-                temp_fault = sensor_data.temperature > self.temp_fault_threshold
-                if temp_fault and not self._prev_temp_fault:
-                    print(f"[{self.name}] FALHA: Temperatura crítica ({sensor_data.temperature:.1f}°C > {self.temp_fault_threshold}°C)")
-                    self.event_manager.emit(
-                        EventType.TEMPERATURE_FAULT,
-                        {"temperature": sensor_data.temperature}
-                    )
-                    self._prev_temp_fault = True
-                elif not temp_fault and self._prev_temp_fault:
-                    print(f"[{self.name}] Falha de temperatura normalizada")
-                    self.event_manager.emit(EventType.FAULT_CLEARED, {"type": "temperature_fault"})
-                    self._prev_temp_fault = False
-                
-                temp_alert = sensor_data.temperature > self.temp_alert_threshold and not temp_fault
-                if temp_alert and not self._prev_temp_alert:
-                    print(f"[{self.name}] ALERTA: Temperatura elevada ({sensor_data.temperature:.1f}°C > {self.temp_alert_threshold}°C)")
-                    self.event_manager.emit(
-                        EventType.TEMPERATURE_ALERT,
-                        {"temperature": sensor_data.temperature}
-                    )
-                    self._prev_temp_alert = True
-                elif not temp_alert and self._prev_temp_alert:
-                    print(f"[{self.name}] Alerta de temperatura normalizado")
-                    self.event_manager.emit(EventType.FAULT_CLEARED, {"type": "temperature_alert"})
-                    self._prev_temp_alert = False
-                
-                if sensor_data.electrical_fault and not self._prev_elec_fault:
-                    print(f"[{self.name}] FALHA: Sistema elétrico")
-                    self.event_manager.emit(EventType.ELECTRICAL_FAULT, {})
-                    self._prev_elec_fault = True
-                elif not sensor_data.electrical_fault and self._prev_elec_fault:
-                    print(f"[{self.name}] Sistema elétrico normalizado")
-                    self.event_manager.emit(EventType.FAULT_CLEARED, {"type": "electrical"})
-                    self._prev_elec_fault = False
-                
-                if sensor_data.hydraulic_fault and not self._prev_hydr_fault:
-                    print(f"[{self.name}] FALHA: Sistema hidráulico")
-                    self.event_manager.emit(EventType.HYDRAULIC_FAULT, {})
-                    self._prev_hydr_fault = True
-                elif not sensor_data.hydraulic_fault and self._prev_hydr_fault:
-                    print(f"[{self.name}] Sistema hidráulico normalizado")
-                    self.event_manager.emit(EventType.FAULT_CLEARED, {"type": "hydraulic"})
-                    self._prev_hydr_fault = False
-                
+                self.step()
             except Exception as e:
                 print(f"[{self.name}] Erro: {e}")
             
@@ -89,5 +43,52 @@ class FaultMonitoringTask(threading.Thread):
         
         print(f"[{self.name}] Tarefa finalizada")
     
+    def step(self):
+        sensor_data = self.sensor_reader()
+        
+        temp_fault = sensor_data.temperature > self.temp_fault_threshold
+        if temp_fault and not self._prev_temp_fault:
+            print(f"[{self.name}] FALHA: Temperatura crítica ({sensor_data.temperature:.1f}°C > {self.temp_fault_threshold}°C)")
+            self.event_manager.emit(
+                EventType.TEMPERATURE_FAULT,
+                {"temperature": sensor_data.temperature}
+            )
+            self._prev_temp_fault = True
+        elif not temp_fault and self._prev_temp_fault:
+            print(f"[{self.name}] Falha de temperatura normalizada")
+            self.event_manager.emit(EventType.FAULT_CLEARED, {"type": "temperature_fault"})
+            self._prev_temp_fault = False
+        
+        temp_alert = sensor_data.temperature > self.temp_alert_threshold and not temp_fault
+        if temp_alert and not self._prev_temp_alert:
+            print(f"[{self.name}] ALERTA: Temperatura elevada ({sensor_data.temperature:.1f}°C > {self.temp_alert_threshold}°C)")
+            self.event_manager.emit(
+                EventType.TEMPERATURE_ALERT,
+                {"temperature": sensor_data.temperature}
+            )
+            self._prev_temp_alert = True
+        elif not temp_alert and self._prev_temp_alert:
+            print(f"[{self.name}] Alerta de temperatura normalizado")
+            self.event_manager.emit(EventType.FAULT_CLEARED, {"type": "temperature_alert"})
+            self._prev_temp_alert = False
+        
+        if sensor_data.electrical_fault and not self._prev_elec_fault:
+            print(f"[{self.name}] FALHA: Sistema elétrico")
+            self.event_manager.emit(EventType.ELECTRICAL_FAULT, {})
+            self._prev_elec_fault = True
+        elif not sensor_data.electrical_fault and self._prev_elec_fault:
+            print(f"[{self.name}] Sistema elétrico normalizado")
+            self.event_manager.emit(EventType.FAULT_CLEARED, {"type": "electrical"})
+            self._prev_elec_fault = False
+        
+        if sensor_data.hydraulic_fault and not self._prev_hydr_fault:
+            print(f"[{self.name}] FALHA: Sistema hidráulico")
+            self.event_manager.emit(EventType.HYDRAULIC_FAULT, {})
+            self._prev_hydr_fault = True
+        elif not sensor_data.hydraulic_fault and self._prev_hydr_fault:
+            print(f"[{self.name}] Sistema hidráulico normalizado")
+            self.event_manager.emit(EventType.FAULT_CLEARED, {"type": "hydraulic"})
+            self._prev_hydr_fault = False
+    
     def stop(self):
         self._stop_event.set()
@@ -1,5 +1,6 @@
 import threading
 import time
+from typing import Callable
 from src.embedded.sync.shared_state import SharedState
 from src.embedded.sync.event_manager import EventManager, EventType
 from src.embedded.control.velocity_controller import VelocityController
@@ -11,7 +12,8 @@ class NavigationControlTask(threading.Thread):
     def __init__(self,
                  shared_state: SharedState,
                  event_manager: EventManager,
-                 control_period: float = 0.05):
+                 control_period: float = 0.05,
+                 clock: Callable[[], float] = time.time):
         super().__init__(name="NavigationControl", daemon=True)
         
         self.shared_state = shared_state
@@ -19,8 +21,8 @@ class NavigationControlTask(threading.Thread):
         self.control_period = control_period
         self._stop_event = threading.Event()
         
-        self.velocity_controller = VelocityController(kp=0.5, ki=0.1, kd=0.05)
-        self.angular_controller = AngularController(kp=1.0, ki=0.05, kd=0.2)
+        self.velocity_controller = VelocityController(kp=0.5, ki=0.1, kd=0.05, clock=clock)
+        self.angular_controller = AngularController(kp=1.0, ki=0.05, kd=0.2, clock=clock)
         
         self._prev_mode_automatic = False
     
@@ -31,28 +33,7 @@ class NavigationControlTask(threading.Thread):
             start_time = time.time()
             
             try:
-
-                state = self.shared_state.get_state()
-                
-                if state.is_automatic() and not self._prev_mode_automatic:
-
-                    self._enable_controllers(state.velocity, state.theta)
-                    print(f"[{self.name}] Controladores ativados (bumpless transfer)")
-                elif not state.is_automatic() and self._prev_mode_automatic:
-
-                    self._disable_controllers()
-                    print(f"[{self.name}] Controladores desativados")
-                
-                self._prev_mode_automatic = state.is_automatic()
-                
-                if state.is_automatic() and state.status not in [VehicleStatus.EMERGENCY, VehicleStatus.FAULT]:
-                    self._execute_control(state)
-                elif state.is_manual() and state.status != VehicleStatus.FAULT:
-
-                    self.shared_state.set_setpoints(state.velocity, state.theta)
-                
-                self._check_fault_events()
-                
+                self.step()
             except Exception as e:
                 print(f"[{self.name}] Erro: {e}")
             
@@ -62,6 +43,38 @@ class NavigationControlTask(threading.Thread):
         
         print(f"[{self.name}] Tarefa finalizada")
     
+    def step(self):
+        state = self.shared_state.get_state()
+        
+        if state.is_automatic() and not self._prev_mode_automatic:
+
+            self._enable_controllers(state.velocity, state.theta)
+            print(f"[{self.name}] Controladores ativados (bumpless transfer)")
+        elif not state.is_automatic() and self._prev_mode_automatic:
+
+            self._disable_controllers()
+            print(f"[{self.name}] Controladores desativados")
+        
+        self._prev_mode_automatic = state.is_automatic()
+        
+        if (state.is_automatic() and state.status not in [VehicleStatus.EMERGENCY, VehicleStatus.FAULT]
+                and not state.has_fault()):
+            if not self.velocity_controller.is_enabled():
+                # controllers were stopped by a fault or emergency while still in automatic mode
+                self._enable_controllers(state.velocity, state.theta)
+                print(f"[{self.name}] Controladores reativados após rearme")
+            self._execute_control(state)
+        elif state.is_automatic() and self.velocity_controller.is_enabled():
+            # the fault event may have been taken by another task; never leave the last command applied
+            print(f"[{self.name}] Falha ativa - parando controle")
+            self._disable_controllers()
+            self.shared_state.set_actuators(0.0, 0.0)
+        elif state.is_manual() and state.status != VehicleStatus.FAULT:
+
+            self.shared_state.set_setpoints(state.velocity, state.theta)
+        
+        self._check_fault_events()
+    
     def _enable_controllers(self, current_velocity: float, current_angle: float):
         self.velocity_controller.enable(current_velocity)
         self.angular_controller.enable(current_angle)
@@ -102,6 +115,12 @@ class NavigationControlTask(threading.Thread):
             print(f"[{self.name}] Falha hidráulica detectada - parando controle")
             self._disable_controllers()
             self.shared_state.set_actuators(0.0, 0.0)
+        
+        event = self.event_manager.check_event(EventType.TEMPERATURE_FAULT)
+        if event:
+            print(f"[{self.name}] Falha de temperatura detectada - parando controle")
+            self._disable_controllers()
+            self.shared_state.set_actuators(0.0, 0.0)
     
     def stop(self):
         self._stop_event.set()
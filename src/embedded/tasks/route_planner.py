@@ -2,7 +2,8 @@ import threading
 import time
 import math
 import queue
-from typing import Tuple, Optional, List
+from typing import Dict, Tuple, Optional, List
+from src.models.route_update import RouteOperation, RouteUpdate
 from src.embedded.sync.shared_state import SharedState
 from src.embedded.sync.event_manager import EventManager, EventType
 
@@ -13,7 +14,13 @@ class RoutePlanningTask(threading.Thread):
                  event_manager: EventManager,
                  waypoint_queue: queue.Queue,
                  planning_period: float = 0.5,
-                 waypoint_threshold: float = 1.0):
+                 waypoint_threshold: float = 1.0,
+                 max_pending_updates: int = 64,
+                 zone_client=None,
+                 zone_request_distance: float = 12.0,
+                 zone_stop_margin: float = 2.0,
+                 zone_crossing_speed: float = 3.0,
+                 route_ack=None):
         super().__init__(name="RoutePlanning", daemon=True)
         
         self.shared_state = shared_state
@@ -23,8 +30,21 @@ class RoutePlanningTask(threading.Thread):
         self.waypoint_threshold = waypoint_threshold
         self._stop_event = threading.Event()
         
+        self.max_pending_updates = max_pending_updates
+        
         self.route: List[Tuple[float, float]] = []
         self.current_waypoint_idx = 0
+        
+        self.route_seq: Optional[int] = None
+        self._pending_updates: Dict[int, RouteUpdate] = {}
+        self.route_ack = route_ack
+        
+        self.zone_client = zone_client
+        self.zone_request_distance = zone_request_distance
+        self.zone_stop_margin = zone_stop_margin
+        self.zone_crossing_speed = zone_crossing_speed
+        self._inside_zones = set()
+        self._holding_zone: Optional[str] = None
     
     def run(self):
         print(f"[{self.name}] Tarefa iniciada")
@@ -33,13 +53,7 @@ class RoutePlanningTask(threading.Thread):
             start_time = time.time()
             
             try:
-
-                self._check_new_route()
-                
-                state = self.shared_state.get_state()
-                if self.route and state.is_automatic() and not state.has_fault():
-                    self._update_setpoints()
-                
+                self.step()
             except Exception as e:
                 print(f"[{self.name}] Erro: {e}")
             
@@ -49,15 +63,86 @@ class RoutePlanningTask(threading.Thread):
         
         print(f"[{self.name}] Tarefa finalizada")
     
+    def step(self):
+        self._check_new_route()
+        
+        state = self.shared_state.get_state()
+        if self.route and state.is_automatic() and not state.has_fault():
+            self._update_setpoints()
+    
     def _check_new_route(self):
-        try:
-            new_route = self.waypoint_queue.get_nowait()
-            self.route = new_route
+        while True:
+            try:
+                update = self.waypoint_queue.get_nowait()
+            except queue.Empty:
+                break
+            
+            if not isinstance(update, RouteUpdate):
+                update = RouteUpdate(RouteOperation.REPLACE, list(update))
+            self._receive_update(update)
+    
+    def _receive_update(self, update: RouteUpdate):
+        if update.seq is None:
+            self._apply_update(update)
+            return
+        
+        if self.route_seq is not None and update.seq <= self.route_seq:
+            print(f"[{self.name}] Atualização de rota {update} descartada (seq atual {self.route_seq})")
+            self._ack(update.seq, 'discarded', f"seq atual {self.route_seq}")
+            return
+        
+        if update.operation == RouteOperation.REPLACE or self.route_seq is None:
+            self._pending_updates = {
+                seq: pending for seq, pending in self._pending_updates.items()
+                if seq > update.seq
+            }
+            self._apply_update(update)
+            self._ack(update.seq, 'applied')
+        else:
+            if len(self._pending_updates) >= self.max_pending_updates:
+                print(f"[{self.name}] Muitas atualizações fora de ordem - descartando {update}")
+                self._ack(update.seq, 'rejected', 'muitas atualizações fora de ordem')
+                return
+            self._pending_updates[update.seq] = update
+        
+        while self.route_seq is not None and self.route_seq + 1 in self._pending_updates:
+            pending = self._pending_updates.pop(self.route_seq + 1)
+            self._apply_update(pending)
+            self._ack(pending.seq, 'applied')
+        
+        if update.seq in self._pending_updates:
+            # parked behind a missing seq: the sender resends it or falls back to a full route
+            self._ack(update.seq, 'gap', f"aguardando seq {self.route_seq + 1}")
+    
+    def _ack(self, seq: int, status: str, detail: str = ""):
+        if self.route_ack is not None:
+            self.route_ack(seq, status, detail)
+    
+    def _apply_update(self, update: RouteUpdate):
+        if update.operation == RouteOperation.REPLACE_SUFFIX and update.start_index > len(self.route):
+            print(f"[{self.name}] Índice {update.start_index} além do fim da rota ({len(self.route)}) - ignorando {update}")
+            if update.seq is not None:
+                self.route_seq = update.seq
+            return
+        
+        self.route = update.apply(self.route)
+        if update.seq is not None:
+            self.route_seq = update.seq
+        
+        if update.operation == RouteOperation.REPLACE:
             self.current_waypoint_idx = 0
             print(f"[{self.name}] Nova rota recebida com {len(self.route)} waypoints")
-            self.event_manager.emit(EventType.NEW_ROUTE, {"waypoints": len(self.route)})
-        except queue.Empty:
-            pass
+        elif update.operation == RouteOperation.REPLACE_SUFFIX:
+            self.current_waypoint_idx = min(self.current_waypoint_idx, update.start_index)
+            print(f"[{self.name}] Rota alterada a partir do waypoint {update.start_index + 1} ({len(self.route)} waypoints)")
+        else:
+            print(f"[{self.name}] Rota estendida com {len(update.waypoints)} waypoints ({len(self.route)} total)")
+        
+        self.event_manager.emit(EventType.NEW_ROUTE, {
+            "waypoints": len(self.route),
+            "operation": update.operation.value,
+            "seq": update.seq
+        })
     
     def _update_setpoints(self):
         if self.current_waypoint_idx >= len(self.route):
@@ -66,6 +151,8 @@ class RoutePlanningTask(threading.Thread):
             self.shared_state.set_setpoints(0.0, None)
             self.event_manager.emit(EventType.TARGET_REACHED, {})
             self.route = []
+            self.current_waypoint_idx = 0
+            self._release_zones()
             return
         
         x, y, theta, velocity = self.shared_state.get_position()
@@ -89,9 +176,73 @@ class RoutePlanningTask(threading.Thread):
         desired_velocity = min(max_velocity, distance * 0.5)
         desired_velocity = max(0.5, desired_velocity)
         
+        zone_limit = self._zone_speed_limit(x, y, velocity)
+        if zone_limit is not None:
+            desired_velocity = min(desired_velocity, zone_limit)
+        
         self.shared_state.set_setpoints(desired_velocity, desired_theta)
         self.shared_state.set_target(target_x, target_y)
     
+    def _zone_speed_limit(self, x: float, y: float, velocity: float) -> Optional[float]:
+        if self.zone_client is None:
+            return None
+        
+        for zone in self.zone_client.zones:
+            if zone.contains(x, y):
+                self._inside_zones.add(zone.zone_id)
+            elif zone.zone_id in self._inside_zones:
+                self._inside_zones.discard(zone.zone_id)
+                self.zone_client.release(zone.zone_id)
+                print(f"[{self.name}] Zona {zone.zone_id} liberada")
+        
+        limit = None
+        holding = None
+        checked = set(self._inside_zones)
+        travelled = 0.0
+        px, py = x, y
+        for wx, wy in self.route[self.current_waypoint_idx:]:
+            if travelled > self.zone_request_distance:
+                break
+            for zone in self.zone_client.zones:
+                if zone.zone_id in checked:
+                    continue
+                crossing = zone.segment_crossing(px, py, wx, wy)
+                if crossing is None:
+                    continue
+                checked.add(zone.zone_id)
+                
+                entry, exit_distance = crossing
+                entry += travelled
+                if entry > self.zone_request_distance:
+                    continue
+                eta = entry / max(velocity, self.zone_crossing_speed)
+                duration = (exit_distance + travelled - entry) / self.zone_crossing_speed
+                if self.zone_client.request(zone.zone_id, eta, duration):
+                    continue
+                
+                allowed = max(0.0, (entry - self.zone_stop_margin) * 0.5)
+                if limit is None or allowed < limit:
+                    limit = allowed
+                    holding = zone.zone_id
+            travelled += math.hypot(wx - px, wy - py)
+            px, py = wx, wy
+        
+        if holding != self._holding_zone:
+            if holding is not None:
+                print(f"[{self.name}] Aguardando reserva da zona {holding}")
+            elif self._holding_zone is not None:
+                print(f"[{self.name}] Reserva da zona {self._holding_zone} concedida")
+            self._holding_zone = holding
+        return limit
+    
+    def _release_zones(self):
+        if self.zone_client is None:
+            return
+        for zone in self.zone_client.zones:
+            self.zone_client.release(zone.zone_id)
+        self._inside_zones.clear()
+        self._holding_zone = None
+    
     def add_waypoint(self, x: float, y: float):
         try:
             self.waypoint_queue.put_nowait([(x, y)])
@@ -104,5 +255,11 @@ class RoutePlanningTask(threading.Thread):
         except queue.Full:
             print(f"[{self.name}] Fila de waypoints cheia")
     
+    def append_waypoints(self, waypoints: List[Tuple[float, float]]):
+        try:
+            self.waypoint_queue.put_nowait(RouteUpdate(RouteOperation.APPEND, list(waypoints)))
+        except queue.Full:
+            print(f"[{self.name}] Fila de waypoints cheia")
+    
     def stop(self):
         self._stop_event.set()
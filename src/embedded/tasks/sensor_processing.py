@@ -11,12 +11,14 @@ class SensorProcessingTask(threading.Thread):
                  sensor_reader: Callable[[], SensorData],
                  circular_buffer: CircularBuffer,
                  filter_order: int = 5,
-                 sample_period: float = 0.1):
+                 sample_period: float = 0.1,
+                 clock: Callable[[], float] = time.time):
         super().__init__(name="SensorProcessing", daemon=True)
         
         self.sensor_reader = sensor_reader
         self.circular_buffer = circular_buffer
         self.sample_period = sample_period
+        self.clock = clock
         self._stop_event = threading.Event()
         
         self.filter_x = MovingAverageFilter(filter_order)
@@ -32,28 +34,7 @@ class SensorProcessingTask(threading.Thread):
             start_time = time.time()
             
             try:
-
-                sensor_data = self.sensor_reader()
-                
-                filtered_x = self.filter_x.filter(sensor_data.position_x)
-                filtered_y = self.filter_y.filter(sensor_data.position_y)
-                filtered_theta = self.filter_theta.filter(sensor_data.theta)
-                filtered_velocity = self.filter_velocity.filter(sensor_data.velocity)
-                filtered_temp = self.filter_temperature.filter(sensor_data.temperature)
-                
-                filtered_data = FilteredSensorData(
-                    position_x=filtered_x,
-                    position_y=filtered_y,
-                    theta=filtered_theta,
-                    velocity=filtered_velocity,
-                    temperature=filtered_temp,
-                    electrical_fault=sensor_data.electrical_fault,
-                    hydraulic_fault=sensor_data.hydraulic_fault,
-                    timestamp=time.time()
-                )
-                
-                self.circular_buffer.write(filtered_data)
-                
+                self.step()
             except Exception as e:
                 print(f"[{self.name}] Erro: {e}")
             
@@ -63,5 +44,27 @@ class SensorProcessingTask(threading.Thread):
         
         print(f"[{self.name}] Tarefa finalizada")
     
+    def step(self):
+        sensor_data = self.sensor_reader()
+        
+        filtered_x = self.filter_x.filter(sensor_data.position_x)
+        filtered_y = self.filter_y.filter(sensor_data.position_y)
+        filtered_theta = self.filter_theta.filter(sensor_data.theta)
+        filtered_velocity = self.filter_velocity.filter(sensor_data.velocity)
+        filtered_temp = self.filter_temperature.filter(sensor_data.temperature)
+        
+        filtered_data = FilteredSensorData(
+            position_x=filtered_x,
+            position_y=filtered_y,
+            theta=filtered_theta,
+            velocity=filtered_velocity,
+            temperature=filtered_temp,
+            electrical_fault=sensor_data.electrical_fault,
+            hydraulic_fault=sensor_data.hydraulic_fault,
+            timestamp=self.clock()
+        )
+        
+        self.circular_buffer.write(filtered_data)
+    
     def stop(self):
         self._stop_event.set()
@@ -0,0 +1,26 @@
+from enum import Enum
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+class RouteOperation(Enum):
+    REPLACE = "replace"
+    APPEND = "append"
+    REPLACE_SUFFIX = "replace_suffix"
+
+@dataclass
+class RouteUpdate:
+    operation: RouteOperation
+    waypoints: List[Tuple[float, float]] = field(default_factory=list)
+    start_index: int = 0
+    seq: Optional[int] = None
+    
+    def apply(self, route: List[Tuple[float, float]]) -> List[Tuple[float, float]]:
+        if self.operation == RouteOperation.APPEND:
+            return route + self.waypoints
+        if self.operation == RouteOperation.REPLACE_SUFFIX:
+            return route[:self.start_index] + self.waypoints
+        return list(self.waypoints)
+    
+    def __str__(self):
+        seq_text = f" seq={self.seq}" if self.seq is not None else ""
+        return f"{self.operation.value}({len(self.waypoints)} waypoints{seq_text})"
@@ -0,0 +1,18 @@
+from dataclasses import dataclass
+from typing import List
+
+SITE_LOAD = 'load'
+SITE_DUMP = 'dump'
+
+@dataclass(frozen=True)
+class Site:
+    site_id: str
+    kind: str
+    x: float
+    y: float
+    service_time: float = 0.0
+
+def sites_from_config(sites: List[dict]) -> List[Site]:
+    return [Site(site['id'], site['kind'], float(site['x']), float(site['y']),
+                 float(site.get('service_time', 0.0)))
+            for site in sites]
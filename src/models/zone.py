@@ -0,0 +1,64 @@
+import math
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+@dataclass(frozen=True)
+class Zone:
+    zone_id: str
+    polygon: Tuple[Tuple[float, float], ...]
+    
+    def contains(self, x: float, y: float) -> bool:
+        inside = False
+        points = self.polygon
+        j = len(points) - 1
+        for i in range(len(points)):
+            xi, yi = points[i]
+            xj, yj = points[j]
+            if (yi > y) != (yj > y) and x < (xj - xi) * (y - yi) / (yj - yi) + xi:
+                inside = not inside
+            j = i
+        return inside
+    
+    def segment_crossing(self, x0: float, y0: float, x1: float, y1: float) -> Optional[Tuple[float, float]]:
+        length = math.hypot(x1 - x0, y1 - y0)
+        if length == 0.0:
+            return (0.0, 0.0) if self.contains(x0, y0) else None
+        
+        hits = []
+        points = self.polygon
+        for i in range(len(points)):
+            ax, ay = points[i]
+            bx, by = points[(i + 1) % len(points)]
+            t = _segment_intersection(x0, y0, x1, y1, ax, ay, bx, by)
+            if t is not None:
+                hits.append(t)
+        
+        start_inside = self.contains(x0, y0)
+        if not hits:
+            return (0.0, length) if start_inside else None
+        
+        hits.sort()
+        entry = 0.0 if start_inside else hits[0] * length
+        exit_index = 0 if start_inside else 1
+        exit_distance = hits[exit_index] * length if exit_index < len(hits) else length
+        return entry, exit_distance
+    
+    def centroid(self) -> Tuple[float, float]:
+        xs = [x for x, _ in self.polygon]
+        ys = [y for _, y in self.polygon]
+        return sum(xs) / len(xs), sum(ys) / len(ys)
+
+def _segment_intersection(x0, y0, x1, y1, ax, ay, bx, by) -> Optional[float]:
+    dx, dy = x1 - x0, y1 - y0
+    ex, ey = bx - ax, by - ay
+    denom = dx * ey - dy * ex
+    if denom == 0.0:
+        return None
+    t = ((ax - x0) * ey - (ay - y0) * ex) / denom
+    u = ((ax - x0) * dy - (ay - y0) * dx) / denom
+    if 0.0 <= t <= 1.0 and 0.0 <= u <= 1.0:
+        return t
+    return None
+
+def zones_from_config(zones: List[dict]) -> List[Zone]:
+    return [Zone(zone['id'], tuple(tuple(point) for point in zone['polygon'])) for zone in zones]
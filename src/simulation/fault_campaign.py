@@ -0,0 +1,174 @@
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Optional
+import numpy as np
+from config.settings import BENCHMARK_CONFIG
+from src.simulation.haul_benchmark import summarize
+from src.simulation.scenario import (
+    EVENT_COMMAND, EVENT_ELECTRICAL_FAULT, EVENT_HEATING, EVENT_HYDRAULIC_FAULT, Scenario, scenario_from_dict
+)
+from src.simulation.scenario_runner import ScenarioRunner
+
+FAULT_EVENTS = {
+    'electrical': EVENT_ELECTRICAL_FAULT,
+    'hydraulic': EVENT_HYDRAULIC_FAULT,
+    'heating': EVENT_HEATING,
+}
+
+@dataclass(frozen=True)
+class CampaignCase:
+    case_id: int
+    trucks: int
+    seed: int
+    duration: float
+    fault: Optional[str] = None
+    truck_id: Optional[int] = None
+    fault_time: float = 0.0
+    temperature: Optional[float] = None
+    reset_after: Optional[float] = None
+    
+    @property
+    def baseline(self) -> bool:
+        return self.fault is None
+    
+    def to_scenario_dict(self) -> dict:
+        events = []
+        if self.fault is not None:
+            event = {'time': self.fault_time, 'truck': self.truck_id, 'type': FAULT_EVENTS[self.fault]}
+            if self.fault == 'heating':
+                event['target'] = self.temperature
+            events.append(event)
+            if self.reset_after is not None:
+                events.append({'time': self.fault_time + self.reset_after, 'truck': self.truck_id,
+                               'type': EVENT_COMMAND, 'command': 'RESET_FAULT'})
+        return {
+            'name': f"campanha_{self.case_id}",
+            'description': (f"{self.fault or 'referência'} no caminhão {self.truck_id} em {self.fault_time:.1f}s"
+                            if self.fault else "referência sem falha"),
+            'duration': self.duration,
+            'seed': self.seed,
+            'dispatch': True,
+            'fleet': dict(BENCHMARK_CONFIG['start'], count=self.trucks),
+            'events': events,
+        }
+    
+    def scenario(self) -> Scenario:
+        return scenario_from_dict(self.to_scenario_dict())
+
+def build_cases(config: dict, runs: int, seed: int = 0) -> List[CampaignCase]:
+    rng = np.random.default_rng(seed)
+    fleets = [int(trucks) for trucks in config['fleets']]
+    fleet_seeds = {trucks: [int(s) for s in rng.integers(0, 2**31, size=config['seeds_per_fleet'])]
+                   for trucks in fleets}
+    
+    # faults are injected early enough for the response and the reset to fit in the run
+    window_start, window_end = config['fault_window']
+    window_end = max(0.0, min(window_end, config['duration'] - (config['reset_after'] or 0.0)))
+    
+    # one fault-free run per (fleet, seed) is the reference for lost production and excess close calls
+    cases = [CampaignCase(len(fleets) * index + column, trucks, fleet_seed, config['duration'])
+             for column, trucks in enumerate(fleets)
+             for index, fleet_seed in enumerate(fleet_seeds[trucks])]
+    for _ in range(runs):
+        trucks = fleets[int(rng.integers(len(fleets)))]
+        fault = config['faults'][int(rng.integers(len(config['faults'])))]
+        cases.append(CampaignCase(
+            case_id=len(cases),
+            trucks=trucks,
+            seed=fleet_seeds[trucks][int(rng.integers(len(fleet_seeds[trucks])))],
+            duration=config['duration'],
+            fault=fault,
+            truck_id=int(rng.integers(1, trucks + 1)),
+            fault_time=round(float(rng.uniform(min(window_start, window_end), window_end)), 2),
+            temperature=round(float(rng.uniform(*config['heating_range'])), 1) if fault == 'heating' else None,
+            reset_after=config['reset_after'],
+        ))
+    return cases
+
+def run_case(case: CampaignCase) -> dict:
+    result = ScenarioRunner(case.scenario(), trace=False).run()
+    outcome = {
+        'case': asdict(case),
+        'cycles': result['cycles'],
+        'cycle_time': result['cycle_time']['avg'] if result['cycle_time'] else None,
+        'close_calls': result['close_calls'],
+        'min_separation': result['min_separation'],
+        'wall_time': result['wall_time'],
+        'detected_at': None,
+        'stopped_at': None,
+        'stop_distance': None,
+        'downtime': 0.0,
+        'left_map': False,
+    }
+    if case.baseline:
+        return outcome
+    
+    truck = next(truck for truck in result['fleet'] if truck['truck_id'] == case.truck_id)
+    response = next((response for response in truck['fault_responses'] if response['at'] >= case.fault_time), None)
+    outcome['downtime'] = truck['stopped_time']
+    outcome['left_map'] = truck['left_map']
+    if response is not None:
+        outcome['detected_at'] = response['at']
+        outcome['stopped_at'] = response['stopped_at']
+        outcome['stop_distance'] = response['distance']
+    return outcome
+
+def run_campaign(cases: List[CampaignCase], workers: Optional[int] = None,
+                 progress: Optional[Callable[[int, int], None]] = None) -> List[dict]:
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(run_case, case) for case in cases]
+        for future in as_completed(futures):
+            results.append(future.result())
+            if progress is not None:
+                progress(len(results), len(cases))
+    return sorted(results, key=lambda outcome: outcome['case']['case_id'])
+
+def aggregate(results: List[dict]) -> dict:
+    baselines = {(r['case']['trucks'], r['case']['seed']): r for r in results if r['case']['fault'] is None}
+    groups: Dict[str, List[dict]] = defaultdict(list)
+    unsafe = []
+    for outcome in results:
+        case = outcome['case']
+        if case['fault'] is None:
+            continue
+        baseline = baselines[(case['trucks'], case['seed'])]
+        lost_cycles = baseline['cycles'] - outcome['cycles']
+        outcome['lost_cycles'] = lost_cycles
+        outcome['lost_cycle_time'] = lost_cycles * (baseline['cycle_time'] or 0.0)
+        outcome['excess_close_calls'] = max(0, outcome['close_calls'] - baseline['close_calls'])
+        groups[f"falha {case['fault']}"].append(outcome)
+        groups[f"{case['trucks']} caminhões"].append(outcome)
+        if outcome['detected_at'] is not None and outcome['stopped_at'] is None:
+            unsafe.append(outcome)
+    
+    return {
+        'runs': len(results),
+        'baselines': len(baselines),
+        'wall_time': sum(outcome['wall_time'] for outcome in results),
+        'groups': {name: _group_summary(outcomes) for name, outcomes in sorted(groups.items())},
+        'unsafe': [outcome['case'] for outcome in unsafe],
+    }
+
+def _group_summary(outcomes: List[dict]) -> dict:
+    detected = [o for o in outcomes if o['detected_at'] is not None]
+    stopped = [o for o in detected if o['stopped_at'] is not None]
+    return {
+        'runs': len(outcomes),
+        'detected': len(detected),
+        'safe_stops': len(stopped),
+        'no_safe_stop': len(detected) - len(stopped),
+        'left_map': sum(1 for o in outcomes if o['left_map']),
+        # detection counts from the injection; for heating the fault only exists once the threshold is crossed
+        'detection_time': summarize([o['detected_at'] - o['case']['fault_time'] for o in detected
+                                     if o['case']['fault'] != 'heating']),
+        'time_to_safe_stop': summarize([o['stopped_at'] - o['detected_at'] for o in stopped]),
+        'stop_distance': summarize([o['stop_distance'] for o in stopped]),
+        'runs_with_excess_close_calls': sum(1 for o in outcomes if o['excess_close_calls']),
+        'min_separation': min((o['min_separation'] for o in outcomes if o['min_separation'] is not None),
+                              default=None),
+        'lost_cycles': summarize([o['lost_cycles'] for o in outcomes]),
+        'lost_cycle_time': summarize([o['lost_cycle_time'] for o in outcomes]),
+        'downtime': summarize([o['downtime'] for o in outcomes]),
+    }
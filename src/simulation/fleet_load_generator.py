@@ -0,0 +1,233 @@
+import json
+import math
+import random
+import threading
+import time
+from typing import Dict, List, Optional
+from src.simulation.vehicle_dynamics import VehicleDynamics, VehicleParameters
+from src.embedded.communication.state_delta import StateDeltaTracker
+from src.embedded.communication.telemetry_codec import (
+    FORMAT_BINARY, STATE_FLAG_FIELDS, encode_position, encode_state_delta
+)
+from src.embedded.communication.transport import ERR_SUCCESS, Transport
+
+MAP_WIDTH = 100.0
+MAP_HEIGHT = 75.0
+
+class EmulatedTruck:
+    
+    def __init__(self,
+                 truck_id: int,
+                 rng: random.Random,
+                 step_period: float = 0.05,
+                 keyframe_interval: float = 10.0,
+                 delta_tolerances: dict = None):
+        self.truck_id = truck_id
+        self.rng = rng
+        
+        self.dynamics = VehicleDynamics(VehicleParameters(dt=step_period))
+        self.dynamics.set_position(rng.uniform(5.0, MAP_WIDTH - 5.0),
+                                   rng.uniform(5.0, MAP_HEIGHT - 5.0),
+                                   rng.uniform(-math.pi, math.pi))
+        self.delta_tracker = StateDeltaTracker(keyframe_interval, delta_tolerances,
+                                               field_groups=[STATE_FLAG_FIELDS])
+        
+        self.target = self._pick_target()
+        self.accel_cmd = 0.0
+        self.steer_cmd = 0.0
+        self.temperature = rng.uniform(40.0, 60.0)
+        
+        self.next_state = 0.0
+        self.next_position = 0.0
+    
+    def step(self):
+        x, y, theta, _ = self.dynamics.get_state()
+        dx = self.target[0] - x
+        dy = self.target[1] - y
+        if math.hypot(dx, dy) < 3.0:
+            self.target = self._pick_target()
+            dx = self.target[0] - x
+            dy = self.target[1] - y
+        
+        heading_error = math.atan2(math.sin(math.atan2(dy, dx) - theta),
+                                   math.cos(math.atan2(dy, dx) - theta))
+        self.steer_cmd = max(-1.0, min(1.0, 2.0 * heading_error))
+        self.accel_cmd = 0.5 * max(0.2, math.cos(heading_error))
+        self.temperature += self.rng.gauss(0.0, 0.05)
+        
+        self.dynamics.update(self.accel_cmd, self.steer_cmd)
+    
+    def state(self, now: float) -> dict:
+        x, y, theta, velocity = self.dynamics.get_state()
+        return {
+            'truck_id': self.truck_id,
+            'timestamp': now,
+            'status': 'RUNNING',
+            'mode': 'AUTOMATIC_REMOTE',
+            'x': x,
+            'y': y,
+            'theta': theta,
+            'velocity': velocity,
+            'velocity_setpoint': self.accel_cmd * self.dynamics.params.max_velocity,
+            'angular_setpoint': self.steer_cmd * self.dynamics.params.max_angular_velocity,
+            'acceleration_cmd': self.accel_cmd,
+            'steering_cmd': self.steer_cmd,
+            'temperature': self.temperature,
+            'electrical_fault': False,
+            'hydraulic_fault': False,
+            'emergency_stop': False
+        }
+    
+    def _pick_target(self):
+        return (self.rng.uniform(5.0, MAP_WIDTH - 5.0), self.rng.uniform(5.0, MAP_HEIGHT - 5.0))
+
+class FleetLoadGenerator(threading.Thread):
+    
+    def __init__(self,
+                 transport: Transport,
+                 state_rate: float = 1.0,
+                 position_rate: float = 5.0,
+                 step_period: float = 0.05,
+                 payload_format: str = FORMAT_BINARY,
+                 keyframe_interval: float = 10.0,
+                 delta_tolerances: dict = None,
+                 metrics_topic: str = "mine/central/metrics",
+                 first_id: int = 1,
+                 seed: Optional[int] = None):
+        super().__init__(name="FleetLoadGenerator", daemon=True)
+        
+        self.transport = transport
+        self.state_period = 1.0 / state_rate if state_rate > 0 else None
+        self.position_period = 1.0 / position_rate if position_rate > 0 else None
+        self.step_period = step_period
+        self.payload_format = payload_format
+        self.keyframe_interval = keyframe_interval
+        self.delta_tolerances = delta_tolerances
+        self.metrics_topic = metrics_topic
+        self.first_id = first_id
+        self.rng = random.Random(seed)
+        
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self.trucks: List[EmulatedTruck] = []
+        
+        self.reports: List[dict] = []
+        self.published = 0
+        self.failed = 0
+        self.overruns = 0
+        
+        self.transport.on_message = self._on_message
+        self.transport.on_connect = self._on_connect
+    
+    def start_transport(self, host: str = "localhost", port: int = 1883):
+        self.transport.connect(host, port, 60)
+        self.transport.loop_start()
+    
+    def set_fleet_size(self, size: int):
+        with self._lock:
+            while len(self.trucks) < size:
+                truck = EmulatedTruck(self.first_id + len(self.trucks), self.rng, self.step_period,
+                                      self.keyframe_interval, self.delta_tolerances)
+                now = time.time()
+                truck.next_state = now + self.rng.uniform(0.0, self.state_period or 0.0)
+                truck.next_position = now + self.rng.uniform(0.0, self.position_period or 0.0)
+                self.trucks.append(truck)
+            del self.trucks[size:]
+    
+    def fleet_size(self) -> int:
+        with self._lock:
+            return len(self.trucks)
+    
+    def run(self):
+        next_step = time.time()
+        
+        while not self._stop_event.is_set():
+            now = time.time()
+            with self._lock:
+                trucks = list(self.trucks)
+            
+            for truck in trucks:
+                truck.step()
+                if self.state_period and now >= truck.next_state:
+                    truck.next_state = max(truck.next_state + self.state_period, now)
+                    self._publish_state(truck, now)
+                if self.position_period and now >= truck.next_position:
+                    truck.next_position = max(truck.next_position + self.position_period, now)
+                    self._publish_position(truck, now)
+            
+            next_step += self.step_period
+            delay = next_step - time.time()
+            if delay < 0:
+                self.overruns += 1
+                next_step = time.time()
+                continue
+            self._stop_event.wait(delay)
+    
+    def stop(self):
+        self._stop_event.set()
+        self.transport.loop_stop()
+        self.transport.disconnect()
+    
+    def _publish_state(self, truck: EmulatedTruck, now: float):
+        state = truck.state(now)
+        message = truck.delta_tracker.next_message(state, now)
+        if message is None:
+            return
+        seq, fields, keyframe = message
+        payload = encode_state_delta(fields, truck.truck_id, seq, keyframe, now, self.payload_format)
+        self._publish(f"mine/truck/{truck.truck_id}/state", payload)
+    
+    def _publish_position(self, truck: EmulatedTruck, now: float):
+        x, y, theta, velocity = truck.dynamics.get_state()
+        payload = encode_position(x, y, theta, velocity, now, self.payload_format)
+        self._publish(f"mine/truck/{truck.truck_id}/position", payload)
+    
+    def _publish(self, topic: str, payload):
+        result = self.transport.publish(topic, payload, qos=0)
+        if result.rc == ERR_SUCCESS:
+            self.published += 1
+        else:
+            self.failed += 1
+    
+    def _on_connect(self, client, userdata, flags, rc):
+        if rc == 0:
+            client.subscribe(self.metrics_topic, qos=0)
+            client.subscribe("mine/truck/+/keyframe_request", qos=0)
+    
+    def _on_message(self, client, userdata, msg):
+        if msg.topic == self.metrics_topic:
+            try:
+                report = json.loads(msg.payload)
+            except ValueError:
+                return
+            report['fleet_size'] = self.fleet_size()
+            report['overruns'] = self.overruns
+            self.reports.append(report)
+            return
+        
+        truck_id = int(msg.topic.split('/')[2])
+        with self._lock:
+            index = truck_id - self.first_id
+            if 0 <= index < len(self.trucks):
+                self.trucks[index].delta_tracker.force_keyframe()
+
+def summarize(reports: List[dict], fleet_size: int, expected_rate: float) -> Dict[str, float]:
+    step_reports = [r for r in reports if r.get('fleet_size') == fleet_size][1:]
+    if not step_reports:
+        return {'fleet_size': fleet_size, 'samples': 0}
+    
+    def mean(key):
+        return sum(r[key] for r in step_reports) / len(step_reports)
+    
+    return {
+        'fleet_size': fleet_size,
+        'samples': len(step_reports),
+        'expected_rate': expected_rate,
+        'ingest_rate': mean('ingest_rate'),
+        'age_avg': mean('age_avg'),
+        'age_p95': max(r['age_p95'] for r in step_reports),
+        'age_max': max(r['age_max'] for r in step_reports),
+        'render_avg': mean('render_avg'),
+        'render_max': max(r['render_max'] for r in step_reports),
+        'render_gap_max': max(r['render_gap_max'] for r in step_reports),
+    }
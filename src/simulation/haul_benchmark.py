@@ -0,0 +1,344 @@
+import contextlib
+import io
+import math
+import queue
+import time
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Tuple
+import numpy as np
+from config.settings import (
+    COLLISION_CONFIG, DISPATCH_CONFIG, NEIGHBOUR_CONFIG, ROUTE_CONFIG, TELEMETRY_CONFIG, TIMING_CONFIG, ZONE_CONFIG
+)
+from src.central.haul_dispatcher import HaulDispatcher
+from src.central.zone_reservation import ZoneReservationManager
+from src.embedded.communication.zone_client import ZoneReservationClient
+from src.embedded.sync.event_manager import EventManager
+from src.embedded.sync.neighbour_table import NeighbourTable
+from src.embedded.sync.shared_state import SharedState
+from src.embedded.tasks.collision_avoidance import CollisionAvoidanceTask
+from src.embedded.tasks.navigation_control import NavigationControlTask
+from src.embedded.tasks.route_planner import RoutePlanningTask
+from src.models.site import SITE_DUMP, Site, sites_from_config
+from src.models.vehicle_state import OperationMode, VehicleStatus
+from src.models.zone import Zone, zones_from_config
+from src.simulation.vehicle_dynamics import VehicleDynamics, VehicleParameters
+
+class SimulatedClock:
+    
+    def __init__(self, start: float = 0.0):
+        self.now = start
+    
+    def __call__(self) -> float:
+        return self.now
+
+class TaskTimer:
+    
+    def __init__(self, period: float):
+        self.period = period
+        self.calls = 0
+        self.cpu = 0.0
+        self.worst = 0.0
+        self.misses = 0
+    
+    def record(self, elapsed: float):
+        self.calls += 1
+        self.cpu += elapsed
+        if elapsed > self.worst:
+            self.worst = elapsed
+        if elapsed > self.period:
+            self.misses += 1
+
+class BenchmarkTruck:
+    
+    def __init__(self, truck_id: int, x: float, y: float, theta: float, clock: SimulatedClock,
+                 zone_client_factory=None):
+        self.truck_id = truck_id
+        self.shared_state = SharedState(truck_id, NeighbourTable(
+            expiry=NEIGHBOUR_CONFIG['expiry'],
+            base_uncertainty=NEIGHBOUR_CONFIG['base_uncertainty'],
+            velocity_uncertainty=NEIGHBOUR_CONFIG['velocity_uncertainty'],
+            max_acceleration=NEIGHBOUR_CONFIG['max_acceleration'],
+            speed_scale=NEIGHBOUR_CONFIG['speed_scale'],
+            max_uncertainty=TELEMETRY_CONFIG['position_tolerance'] + NEIGHBOUR_CONFIG['latency_margin']
+        ), clock=clock)
+        self.event_manager = EventManager()
+        
+        self.dynamics = VehicleDynamics(VehicleParameters(dt=TIMING_CONFIG['control_period']))
+        self.dynamics.set_position(x, y, theta)
+        self.shared_state.set_position(x, y, theta, 0.0)
+        self.shared_state.set_mode(OperationMode.AUTOMATIC_REMOTE)
+        self.shared_state.set_status(VehicleStatus.RUNNING)
+        
+        self.planner = RoutePlanningTask(
+            shared_state=self.shared_state,
+            event_manager=self.event_manager,
+            waypoint_queue=queue.Queue(maxsize=ROUTE_CONFIG['queue_size']),
+            planning_period=TIMING_CONFIG['route_planning_period'],
+            waypoint_threshold=ROUTE_CONFIG['waypoint_threshold'],
+            zone_request_distance=ZONE_CONFIG['request_distance'],
+            zone_stop_margin=ZONE_CONFIG['stop_margin'],
+            zone_crossing_speed=ZONE_CONFIG['crossing_speed']
+        )
+        if zone_client_factory is not None:
+            self.planner.zone_client = zone_client_factory(truck_id)
+        self.collision = CollisionAvoidanceTask(
+            shared_state=self.shared_state,
+            event_manager=self.event_manager,
+            check_period=COLLISION_CONFIG['check_period'],
+            safety_distance=COLLISION_CONFIG['safety_distance'],
+            warning_distance=COLLISION_CONFIG['warning_distance']
+        )
+        self.navigation = NavigationControlTask(
+            shared_state=self.shared_state,
+            event_manager=self.event_manager,
+            control_period=TIMING_CONFIG['control_period'],
+            clock=clock
+        )
+    
+    def schedule(self) -> List[Tuple[str, float, Callable[[], None]]]:
+        return [
+            ('planning', TIMING_CONFIG['route_planning_period'], self.planner.step),
+            ('collision', COLLISION_CONFIG['check_period'], self.collision.step),
+            ('navigation', TIMING_CONFIG['control_period'], self.navigation.step),
+        ]
+    
+    def available(self) -> bool:
+        state = self.shared_state.get_state()
+        return state.is_automatic() and not state.has_fault() and state.status != VehicleStatus.EMERGENCY
+    
+    def move(self):
+        accel_cmd, steer_cmd = self.shared_state.get_actuators()
+        x, y, theta, velocity = self.dynamics.update(accel_cmd, steer_cmd)
+        self.shared_state.set_position(x, y, theta, velocity)
+
+class HaulBenchmark:
+    
+    def __init__(self, trucks: int, duration: float, config: dict, zones: bool = True,
+                 sites: Optional[List[Site]] = None, zone_list: Optional[List[Zone]] = None,
+                 poses: Optional[List[Tuple[float, float, float]]] = None, dispatch: bool = True):
+        self.duration = duration
+        self.config = config
+        self.clock = SimulatedClock()
+        self.dt = TIMING_CONFIG['control_period']
+        self.dispatch_enabled = dispatch
+        if zone_list is None:
+            zone_list = zones_from_config(ZONE_CONFIG['zones'])
+        self.zone_list = zone_list if zones else []
+        
+        self.dispatcher = HaulDispatcher(
+            sites if sites is not None else sites_from_config(DISPATCH_CONFIG['sites']),
+            speed=DISPATCH_CONFIG['speed'],
+            arrival_radius=DISPATCH_CONFIG['arrival_radius'],
+            service_radius=DISPATCH_CONFIG['service_radius'],
+            staging_distance=DISPATCH_CONFIG['staging_distance'],
+            staging_spacing=DISPATCH_CONFIG['staging_spacing'],
+            stop_speed=DISPATCH_CONFIG['stop_speed'],
+            cache_tolerance=DISPATCH_CONFIG['cache_tolerance'],
+            progress_timeout=DISPATCH_CONFIG['progress_timeout'],
+            progress_distance=DISPATCH_CONFIG['progress_distance'],
+            detour_distance=DISPATCH_CONFIG['detour_distance']
+        )
+        self.zones = ZoneReservationManager(
+            self.zone_list,
+            clearance=ZONE_CONFIG['clearance'],
+            grace=ZONE_CONFIG['grace'],
+            max_duration=ZONE_CONFIG['max_duration'],
+            max_wait=ZONE_CONFIG['max_wait']
+        )
+        
+        if poses is None:
+            poses = self._grid_poses(trucks, config['start'])
+        self.trucks: List[BenchmarkTruck] = [
+            self._make_truck(index, x, y, theta) for index, (x, y, theta) in enumerate(poses)
+        ]
+        self._by_id = {truck.truck_id: truck for truck in self.trucks}
+        
+        self._schedules = [truck.schedule() for truck in self.trucks]
+        self.truck_tasks = [name for name, _, _ in self._schedules[0]] if self.trucks else []
+        self.timers = {name: TaskTimer(period) for name, period, _ in
+                       (self._schedules[0] if self.trucks else [])}
+        self.timers['dispatch'] = TaskTimer(DISPATCH_CONFIG['period'])
+        self.timers['zones'] = TaskTimer(config['zone_period'])
+        self.tick_misses = 0
+        self.ticks = 0
+        self.min_separation = math.inf
+        self.close_calls = 0
+        self.stalled_time = 0.0
+        self._stopped_since: Dict[int, float] = {}
+    
+    def _grid_poses(self, trucks: int, start: dict) -> List[Tuple[float, float, float]]:
+        return [(start['x'] + (index % start['per_row']) * start['spacing'],
+                 start['y'] + (index // start['per_row']) * start['spacing'],
+                 math.pi / 2)
+                for index in range(trucks)]
+    
+    def _make_truck(self, index: int, x: float, y: float, theta: float) -> BenchmarkTruck:
+        return BenchmarkTruck(index + 1, x, y, theta, self.clock,
+                              self._zone_client if self.zone_list else None)
+    
+    def _zone_client(self, truck_id: int) -> ZoneReservationClient:
+        client = None
+        
+        def publish_request(zone_id: str, eta: float, duration: float):
+            reservation = self.zones.request(truck_id, zone_id, self.clock(), eta, duration)
+            if reservation is not None:
+                client.on_response(self.zones.response(reservation, self.clock()))
+        
+        def publish_release(zone_id: str):
+            self.zones.release(truck_id, zone_id, self.clock())
+        
+        client = ZoneReservationClient(self.zone_list, publish_request,
+                                       publish_release, ZONE_CONFIG['retry_interval'],
+                                       ZONE_CONFIG['response_timeout'], clock=self.clock)
+        return client
+    
+    def run(self, quiet: bool = True) -> dict:
+        every = {name: max(1, round(timer.period / self.dt)) for name, timer in self.timers.items()}
+        every['position'] = max(1, round(self.config['position_period'] / self.dt))
+        steps = int(round(self.duration / self.dt))
+        
+        output = io.StringIO() if quiet else None
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        with contextlib.redirect_stdout(output) if quiet else contextlib.nullcontext():
+            for step in range(steps):
+                self.clock.now = step * self.dt
+                tick_start = time.perf_counter()
+                self._tick(step, every)
+                if time.perf_counter() - tick_start > self.dt:
+                    self.tick_misses += 1
+                self.ticks += 1
+        wall = time.perf_counter() - wall_start
+        cpu = time.process_time() - cpu_start
+        return self.report(wall, cpu)
+    
+    def _tick(self, step: int, every: Dict[str, int]):
+        now = self.clock.now
+        for index, truck in enumerate(self.trucks):
+            truck.move()
+            # tasks of different trucks are staggered the way independent threads would be
+            for name, _, function in self._schedules[index]:
+                if (step + index) % every[name] == 0:
+                    self._timed(name, function)
+        
+        if step % every['position'] == 0:
+            self._broadcast_positions()
+        if step % every['zones'] == 0:
+            self._timed('zones', lambda: self._update_zones(now))
+        if self.dispatch_enabled and step % every['dispatch'] == 0:
+            self._timed('dispatch', lambda: self._dispatch(now))
+    
+    def _timed(self, name: str, function):
+        start = time.perf_counter()
+        function()
+        self.timers[name].record(time.perf_counter() - start)
+    
+    def _positions(self):
+        states = [truck.dynamics.get_state() for truck in self.trucks]
+        ids = np.array([truck.truck_id for truck in self.trucks], dtype=np.int64)
+        x, y, theta, velocity = (np.array(column, dtype=np.float64) for column in zip(*states))
+        return ids, x, y, theta, velocity
+    
+    def _broadcast_positions(self):
+        ids, x, y, theta, velocity = self._positions()
+        distance = np.hypot(x[:, None] - x[None, :], y[:, None] - y[None, :])
+        np.fill_diagonal(distance, np.inf)
+        if len(ids) > 1:
+            self.min_separation = min(self.min_separation, float(distance.min()))
+            self.close_calls += int(np.count_nonzero(np.triu(distance < self.config['collision_distance'])))
+        if self.dispatch_enabled:
+            self._track_stalls(ids, velocity)
+        
+        for row, receiver in enumerate(self.trucks):
+            for column in np.flatnonzero(distance[row] <= self.config['neighbour_radius']):
+                receiver.shared_state.update_other_truck_position(
+                    int(ids[column]), float(x[column]), float(y[column]),
+                    float(theta[column]), float(velocity[column]))
+    
+    def _track_stalls(self, ids: np.ndarray, velocity: np.ndarray):
+        # truck-time lost standing still on the way to a site, e.g. locked with another truck;
+        # short stops (turning in place after a dispatch, yielding) are not counted
+        now = self.clock.now
+        for truck_id, speed in zip(ids.tolist(), np.abs(velocity).tolist()):
+            assignment = self.dispatcher.assignments.get(truck_id)
+            if assignment is None or not assignment.en_route() or speed > self.dispatcher.stop_speed:
+                self._stopped_since.pop(truck_id, None)
+                continue
+            since = self._stopped_since.setdefault(truck_id, now)
+            if now - since >= self.config['stall_grace']:
+                self.stalled_time += self.config['position_period']
+    
+    def _update_zones(self, now: float):
+        for reservation in self.zones.update(now):
+            truck = self._by_id.get(reservation.truck_id)
+            if truck is not None and truck.planner.zone_client is not None:
+                truck.planner.zone_client.on_response(self.zones.response(reservation, now))
+    
+    def _dispatch(self, now: float):
+        ids, x, y, _, velocity = self._positions()
+        available = np.array([truck.available() for truck in self.trucks], dtype=bool)
+        for assignment in self.dispatcher.update(now, ids, x, y, velocity, available):
+            self._by_id[assignment.truck_id].planner.set_route(assignment.route())
+    
+    def report(self, wall: float, cpu: float) -> dict:
+        completed = list(self.dispatcher.completed)
+        dumps = defaultdict(list)
+        queue_waits = defaultdict(list)
+        for assignment in completed:
+            queue_waits[assignment.site_id].append(assignment.started_at - assignment.arrived_at)
+            if assignment.kind == SITE_DUMP:
+                dumps[assignment.truck_id].append(assignment.finished_at)
+        
+        cycle_times = [later - earlier for finished in dumps.values()
+                       for earlier, later in zip(finished, finished[1:])]
+        cycles = sum(len(finished) for finished in dumps.values())
+        hours = self.duration / 3600.0
+        truck_cpu = sum(self.timers[name].cpu for name in self.truck_tasks)
+        stalled_fraction = self.stalled_time / (len(self.trucks) * self.duration) if self.trucks else 0.0
+        
+        invalid = []
+        if self.min_separation < self.config['collision_distance']:
+            invalid.append(f"menor distância {self.min_separation:.1f}m abaixo de "
+                           f"{self.config['collision_distance']:g}m")
+        if stalled_fraction > self.config['max_stalled_fraction']:
+            invalid.append(f"{stalled_fraction:.0%} do tempo da frota parado em trânsito")
+        
+        return {
+            'trucks': len(self.trucks),
+            'duration': self.duration,
+            'cycles': cycles,
+            'tonnes': cycles * self.config['payload_tonnes'],
+            'tonnes_per_hour': cycles * self.config['payload_tonnes'] / hours,
+            'cycle_time': summarize(cycle_times),
+            'site_queue': {site_id: summarize(waits) for site_id, waits in sorted(queue_waits.items())},
+            'zones': self.zones.metrics(),
+            'min_separation': self.min_separation if self.min_separation != math.inf else None,
+            'close_calls': self.close_calls,
+            'stalled_truck_time': self.stalled_time,
+            'stalled_fraction': stalled_fraction,
+            'dispatch_timeouts': self.dispatcher.timeouts,
+            'valid': not invalid,
+            'invalid_reasons': invalid,
+            'wall_time': wall,
+            'realtime_factor': self.duration / wall if wall > 0 else 0.0,
+            'cpu_time': cpu,
+            'cpu_per_truck_ms': truck_cpu / len(self.trucks) / self.duration * 1000.0 if self.trucks else 0.0,
+            'central_cpu_ms': (self.timers['dispatch'].cpu + self.timers['zones'].cpu) / self.duration * 1000.0,
+            'tasks': {name: {'calls': timer.calls, 'avg_ms': timer.cpu / timer.calls * 1000.0 if timer.calls else 0.0,
+                             'worst_ms': timer.worst * 1000.0, 'deadline_misses': timer.misses}
+                      for name, timer in self.timers.items()},
+            'tick_deadline_misses': self.tick_misses,
+            'ticks': self.ticks,
+        }
+
+def summarize(values: List[float]) -> Optional[dict]:
+    if not values:
+        return None
+    values = sorted(values)
+    return {
+        'count': len(values),
+        'avg': sum(values) / len(values),
+        'p50': values[math.ceil(0.5 * len(values)) - 1],
+        'p95': values[math.ceil(0.95 * len(values)) - 1],
+        'max': values[-1],
+    }
@@ -1,7 +1,7 @@
 import threading
 import time
-import random
-from typing import Callable
+from typing import Callable, Dict, Optional, Tuple
+import numpy as np
 from src.simulation.vehicle_dynamics import VehicleDynamics, VehicleParameters
 from src.simulation.noise_generator import MultiChannelNoise
 from src.models.sensor_data import SensorData, ActuatorData
@@ -12,12 +12,21 @@ class MineSimulatorTask(threading.Thread):
     def __init__(self,
                  shared_state: SharedState,
                  simulation_period: float = 0.05,
-                 enable_noise: bool = True):
+                 enable_noise: bool = True,
+                 start_pose: Tuple[float, float, float] = (50.0, 37.5, 0.0),
+                 noise_std_devs: Optional[Dict[str, float]] = None,
+                 heating_probability: float = 0.15,
+                 heating_interval: float = 10.0,
+                 heating_range: Tuple[float, float] = (95.0, 150.0),
+                 clock: Callable[[], float] = time.time,
+                 noise_rng: Optional[np.random.Generator] = None,
+                 heating_rng: Optional[np.random.Generator] = None):
         super().__init__(name="MineSimulator", daemon=True)
         
         self.shared_state = shared_state
         self.simulation_period = simulation_period
         self.enable_noise = enable_noise
+        self.clock = clock
         self._stop_event = threading.Event()
         
         params = VehicleParameters(
@@ -29,15 +38,16 @@ class MineSimulatorTask(threading.Thread):
         )
         self.dynamics = VehicleDynamics(params)
         
-        self.dynamics.set_position(50.0, 37.5, 0.0)
+        x, y, theta = start_pose
+        self.dynamics.set_position(x, y, theta)
         
-        self.noise = MultiChannelNoise({
+        self.noise = MultiChannelNoise(noise_std_devs or {
             'position_x': 0.05,
             'position_y': 0.05,
             'theta': 0.02,
             'velocity': 0.1,
             'temperature': 2.0
-        })
+        }, rng=noise_rng)
         
         self.temperature = 25.0
         self.electrical_fault = False
@@ -45,18 +55,21 @@ class MineSimulatorTask(threading.Thread):
         
         self.random_heating = False
         self.target_temp = 25.0
-        self.last_heating_check = time.time()
-        self.heating_check_interval = 10.0
+        self.last_heating_check = clock()
+        self.heating_check_interval = heating_interval
+        self.heating_probability = heating_probability
+        self.heating_range = heating_range
+        self.heating_rng = heating_rng if heating_rng is not None else np.random.default_rng()
         
         self.current_sensor_data = SensorData(
-            position_x=50.0,
-            position_y=37.5,
-            theta=0.0,
+            position_x=x,
+            position_y=y,
+            theta=theta,
             velocity=0.0,
             temperature=25.0,
             electrical_fault=False,
             hydraulic_fault=False,
-            timestamp=time.time()
+            timestamp=clock()
         )
     
     def run(self):
@@ -66,48 +79,7 @@ class MineSimulatorTask(threading.Thread):
             start_time = time.time()
             
             try:
-
-                accel_cmd, steer_cmd = self.shared_state.get_actuators()
-                
-                x, y, theta, velocity = self.dynamics.update(accel_cmd, steer_cmd)
-                
-                current_time = time.time()
-                if current_time - self.last_heating_check >= self.heating_check_interval:
-                    self.last_heating_check = current_time
-                    if random.random() < 0.15 and not self.random_heating:
-                        self.random_heating = True
-                        self.target_temp = random.uniform(95.0, 150.0)
-                        print(f"[{self.name}] 🔥 Aquecimento aleatório iniciado (alvo: {self.target_temp:.1f}°C)")
-                
-                base_temp = 25.0 + abs(velocity) * 2.0 + abs(accel_cmd) * 5.0
-                
-                if self.random_heating:
-                    self.temperature += (self.target_temp - self.temperature) * 0.05
-                else:
-                    self.temperature = base_temp
-                
-                sensor_values = {
-                    'position_x': x,
-                    'position_y': y,
-                    'theta': theta,
-                    'velocity': velocity,
-                    'temperature': self.temperature
-                }
-                
-                if self.enable_noise:
-                    sensor_values = self.noise.add_noise_dict(sensor_values)
-                
-                self.current_sensor_data = SensorData(
-                    position_x=sensor_values['position_x'],
-                    position_y=sensor_values['position_y'],
-                    theta=sensor_values['theta'],
-                    velocity=sensor_values['velocity'],
-                    temperature=sensor_values['temperature'],
-                    electrical_fault=self.electrical_fault,
-                    hydraulic_fault=self.hydraulic_fault,
-                    timestamp=time.time()
-                )
-                
+                self.step()
             except Exception as e:
                 print(f"[{self.name}] Erro: {e}")
             
@@ -117,6 +89,48 @@ class MineSimulatorTask(threading.Thread):
         
         print(f"[{self.name}] Simulação finalizada")
     
+    def step(self):
+        accel_cmd, steer_cmd = self.shared_state.get_actuators()
+        
+        x, y, theta, velocity = self.dynamics.update(accel_cmd, steer_cmd)
+        
+        current_time = self.clock()
+        if current_time - self.last_heating_check >= self.heating_check_interval:
+            self.last_heating_check = current_time
+            chance, target = self.heating_rng.random(2)
+            if chance < self.heating_probability and not self.random_heating:
+                low, high = self.heating_range
+                self.start_heating(low + (high - low) * target)
+        
+        base_temp = 25.0 + abs(velocity) * 2.0 + abs(accel_cmd) * 5.0
+        
+        if self.random_heating:
+            self.temperature += (self.target_temp - self.temperature) * 0.05
+        else:
+            self.temperature = base_temp
+        
+        sensor_values = {
+            'position_x': x,
+            'position_y': y,
+            'theta': theta,
+            'velocity': velocity,
+            'temperature': self.temperature
+        }
+        
+        if self.enable_noise:
+            sensor_values = self.noise.add_noise_dict(sensor_values)
+        
+        self.current_sensor_data = SensorData(
+            position_x=sensor_values['position_x'],
+            position_y=sensor_values['position_y'],
+            theta=sensor_values['theta'],
+            velocity=sensor_values['velocity'],
+            temperature=sensor_values['temperature'],
+            electrical_fault=self.electrical_fault,
+            hydraulic_fault=self.hydraulic_fault,
+            timestamp=self.clock()
+        )
+    
     def get_sensor_data(self) -> SensorData:
         return self.current_sensor_data
     
@@ -128,6 +142,11 @@ class MineSimulatorTask(threading.Thread):
         self.hydraulic_fault = fault
         print(f"[{self.name}] Falha hidráulica {'INJETADA' if fault else 'REMOVIDA'}")
     
+    def start_heating(self, target_temp: float):
+        self.random_heating = True
+        self.target_temp = target_temp
+        print(f"[{self.name}] 🔥 Aquecimento aleatório iniciado (alvo: {self.target_temp:.1f}°C)")
+    
     def reset_temperature(self):
         self.random_heating = False
         self.temperature = 25.0
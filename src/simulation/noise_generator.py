@@ -1,15 +1,22 @@
-import random
-import math
+from typing import Dict, Optional
+import numpy as np
 
 class NoiseGenerator:
     
-    def __init__(self, std_dev: float = 0.1, seed: int = None):
+    def __init__(self, std_dev: float = 0.1, seed: int = None,
+                 rng: Optional[np.random.Generator] = None, block_size: int = 1024):
         self._std_dev = std_dev
-        if seed is not None:
-            random.seed(seed)
+        self._rng = rng if rng is not None else np.random.default_rng(seed)
+        self._block_size = block_size
+        self._block = []
+        self._index = 0
     
     def add_noise(self, value: float) -> float:
-        noise = random.gauss(0.0, self._std_dev)
+        if self._index >= len(self._block):
+            self._block = self._rng.standard_normal(self._block_size).tolist()
+            self._index = 0
+        noise = self._block[self._index] * self._std_dev
+        self._index += 1
         return value + noise
     
     def add_noise_array(self, values: list) -> list:
@@ -23,19 +30,35 @@ class NoiseGenerator:
 
 class MultiChannelNoise:
     
-    def __init__(self, std_devs: dict):
-        self._generators = {
-            channel: NoiseGenerator(std_dev) 
-            for channel, std_dev in std_devs.items()
-        }
+    def __init__(self, std_devs: Dict[str, float], seed: int = None,
+                 rng: Optional[np.random.Generator] = None, block_size: int = 1024):
+        self._channels = {channel: column for column, channel in enumerate(std_devs)}
+        self._std_devs = np.array(list(std_devs.values()), dtype=np.float64)
+        self._rng = rng if rng is not None else np.random.default_rng(seed)
+        self._block_size = block_size
+        self._rows = []
+        self._index = 0
+    
+    def _next_row(self) -> list:
+        # one draw per block of ticks; each row holds one sample for every channel
+        if self._index >= len(self._rows):
+            block = self._rng.standard_normal((self._block_size, len(self._std_devs))) * self._std_devs
+            self._rows = block.tolist()
+            self._index = 0
+        row = self._rows[self._index]
+        self._index += 1
+        return row
     
     def add_noise(self, channel: str, value: float) -> float:
-        if channel not in self._generators:
+        column = self._channels.get(channel)
+        if column is None:
             return value
-        return self._generators[channel].add_noise(value)
+        return value + self._next_row()[column]
     
     def add_noise_dict(self, values: dict) -> dict:
+        row = self._next_row()
+        channels = self._channels
         return {
-            channel: self.add_noise(channel, value)
+            channel: value + row[channels[channel]] if channel in channels else value
             for channel, value in values.items()
         }
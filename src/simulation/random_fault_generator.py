@@ -1,7 +1,7 @@
 import threading
 import time
-import random
-from typing import Callable
+from typing import Callable, Optional
+import numpy as np
 
 class RandomFaultGenerator(threading.Thread):
     
@@ -10,7 +10,8 @@ class RandomFaultGenerator(threading.Thread):
                  inject_hydraulic_fault: Callable[[bool], None],
                  check_period: float = 10.0,
                  electrical_fault_probability: float = 0.05,
-                 hydraulic_fault_probability: float = 0.05):
+                 hydraulic_fault_probability: float = 0.05,
+                 rng: Optional[np.random.Generator] = None):
         super().__init__(name="RandomFaultGenerator", daemon=True)
         
         self.inject_electrical_fault = inject_electrical_fault
@@ -18,6 +19,7 @@ class RandomFaultGenerator(threading.Thread):
         self.check_period = check_period
         self.electrical_fault_probability = electrical_fault_probability
         self.hydraulic_fault_probability = hydraulic_fault_probability
+        self.rng = rng if rng is not None else np.random.default_rng()
         
         self._stop_event = threading.Event()
         self._electrical_fault_active = False
@@ -30,16 +32,7 @@ class RandomFaultGenerator(threading.Thread):
             start_time = time.time()
             
             try:
-                if not self._electrical_fault_active and random.random() < self.electrical_fault_probability:
-                    self.inject_electrical_fault(True)
-                    self._electrical_fault_active = True
-                    print(f"[{self.name}] ⚡ FALHA ELÉTRICA gerada! Requer rearme manual.")
-                
-                if not self._hydraulic_fault_active and random.random() < self.hydraulic_fault_probability:
-                    self.inject_hydraulic_fault(True)
-                    self._hydraulic_fault_active = True
-                    print(f"[{self.name}] 🔧 FALHA HIDRÁULICA gerada! Requer rearme manual.")
-                
+                self.step()
             except Exception as e:
                 print(f"[{self.name}] Erro: {e}")
             
@@ -49,6 +42,25 @@ class RandomFaultGenerator(threading.Thread):
         
         print(f"[{self.name}] Tarefa finalizada")
     
+    def step(self):
+        # both draws happen every check so the stream does not depend on which faults are active
+        electrical, hydraulic = self.rng.random(2)
+        if not self._electrical_fault_active and electrical < self.electrical_fault_probability:
+            self.trigger_electrical_fault()
+        
+        if not self._hydraulic_fault_active and hydraulic < self.hydraulic_fault_probability:
+            self.trigger_hydraulic_fault()
+    
+    def trigger_electrical_fault(self):
+        self.inject_electrical_fault(True)
+        self._electrical_fault_active = True
+        print(f"[{self.name}] ⚡ FALHA ELÉTRICA gerada! Requer rearme manual.")
+    
+    def trigger_hydraulic_fault(self):
+        self.inject_hydraulic_fault(True)
+        self._hydraulic_fault_active = True
+        print(f"[{self.name}] 🔧 FALHA HIDRÁULICA gerada! Requer rearme manual.")
+    
     def clear_all_faults(self):
         if self._electrical_fault_active:
             self.inject_electrical_fault(False)
@@ -0,0 +1,11 @@
+from typing import Optional
+import numpy as np
+
+STREAM_NOISE = 0
+STREAM_HEATING = 1
+STREAM_FAULTS = 2
+
+def component_rng(seed: Optional[int], truck_id: int, stream: int) -> np.random.Generator:
+    # the spawn key pins each (truck, component) pair to its own stream, independent of creation order;
+    # without a seed SeedSequence draws fresh entropy and the streams are still independent
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(truck_id, stream)))
@@ -0,0 +1,159 @@
+import json
+import math
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+from config.settings import DISPATCH_CONFIG, MAP_CONFIG, NOISE_CONFIG, SIMULATION_CONFIG, ZONE_CONFIG
+from src.models.command import CommandType
+from src.models.site import Site, sites_from_config
+from src.models.zone import Zone, zones_from_config
+try:
+    import yaml
+    YAML_AVAILABLE = True
+except ImportError:
+    YAML_AVAILABLE = False
+
+EVENT_ELECTRICAL_FAULT = 'electrical_fault'
+EVENT_HYDRAULIC_FAULT = 'hydraulic_fault'
+EVENT_HEATING = 'heating'
+EVENT_COMMAND = 'command'
+EVENT_ROUTE = 'route'
+
+EVENT_TYPES = (EVENT_ELECTRICAL_FAULT, EVENT_HYDRAULIC_FAULT, EVENT_HEATING, EVENT_COMMAND, EVENT_ROUTE)
+
+@dataclass
+class TruckSpec:
+    truck_id: int
+    pose: Tuple[float, float, float]
+    route: List[Tuple[float, float]] = field(default_factory=list)
+    automatic: bool = True
+
+@dataclass
+class ScenarioEvent:
+    time: float
+    kind: str
+    truck_id: Optional[int] = None
+    value: Any = None
+
+@dataclass
+class Scenario:
+    name: str
+    duration: float
+    trucks: List[TruckSpec]
+    events: List[ScenarioEvent] = field(default_factory=list)
+    seed: Optional[int] = None
+    width: float = MAP_CONFIG['width']
+    height: float = MAP_CONFIG['height']
+    zones: List[Zone] = field(default_factory=list)
+    sites: List[Site] = field(default_factory=list)
+    dispatch: bool = False
+    noise: Optional[Dict[str, float]] = None
+    random_faults: Optional[Dict[str, float]] = None
+    description: str = ''
+    
+    def to_dict(self) -> dict:
+        return {
+            'name': self.name,
+            'description': self.description,
+            'duration': self.duration,
+            'seed': self.seed,
+            'trucks': len(self.trucks),
+            'zones': [zone.zone_id for zone in self.zones],
+            'sites': [site.site_id for site in self.sites],
+            'dispatch': self.dispatch,
+            'noise': self.noise is not None,
+            'random_faults': self.random_faults is not None,
+            'events': len(self.events),
+        }
+
+def load_scenario(path: str) -> Scenario:
+    with open(path, 'r', encoding='utf-8') as f:
+        if os.path.splitext(path)[1].lower() in ('.yaml', '.yml'):
+            if not YAML_AVAILABLE:
+                raise RuntimeError("PyYAML não instalado (pip install pyyaml) - use um cenário .json")
+            data = yaml.safe_load(f)
+        else:
+            data = json.load(f)
+    return scenario_from_dict(data, default_name=os.path.splitext(os.path.basename(path))[0])
+
+def scenario_from_dict(data: dict, default_name: str = 'cenario') -> Scenario:
+    if 'duration' not in data:
+        raise ValueError("cenário sem 'duration'")
+    
+    map_data = data.get('map', {})
+    trucks = [_truck_from_dict(truck) for truck in data.get('trucks', [])]
+    if 'fleet' in data:
+        trucks.extend(_fleet_from_dict(data['fleet'], first_id=len(trucks) + 1))
+    if not trucks:
+        raise ValueError("cenário sem caminhões ('trucks' ou 'fleet')")
+    ids = [truck.truck_id for truck in trucks]
+    if len(set(ids)) != len(ids):
+        raise ValueError(f"ids de caminhão repetidos: {ids}")
+    
+    events = sorted((_event_from_dict(event, ids) for event in data.get('events', [])),
+                    key=lambda event: event.time)
+    
+    return Scenario(
+        name=data.get('name', default_name),
+        description=data.get('description', ''),
+        duration=float(data['duration']),
+        trucks=trucks,
+        events=events,
+        seed=data.get('seed'),
+        width=float(map_data.get('width', MAP_CONFIG['width'])),
+        height=float(map_data.get('height', MAP_CONFIG['height'])),
+        zones=zones_from_config(map_data.get('zones', ZONE_CONFIG['zones'])),
+        sites=sites_from_config(map_data.get('sites', DISPATCH_CONFIG['sites'])),
+        dispatch=bool(data.get('dispatch', False)),
+        noise=_optional_config(data.get('noise', True), NOISE_CONFIG),
+        random_faults=_optional_config(data.get('random_faults', False), SIMULATION_CONFIG),
+    )
+
+def _optional_config(value, defaults: dict) -> Optional[dict]:
+    # true takes the defaults from settings, an object overrides them, false disables the component
+    if not value:
+        return None
+    config = dict(defaults)
+    if isinstance(value, dict):
+        config.update(value)
+    return config
+
+def _truck_from_dict(data: dict) -> TruckSpec:
+    pose = list(data.get('pose', SIMULATION_CONFIG['start_pose']))
+    if len(pose) == 2:
+        pose.append(0.0)
+    return TruckSpec(
+        truck_id=int(data['id']),
+        pose=(float(pose[0]), float(pose[1]), float(pose[2])),
+        route=[(float(x), float(y)) for x, y in data.get('route', [])],
+        automatic=data.get('mode', 'automatic') == 'automatic'
+    )
+
+def _fleet_from_dict(data: dict, first_id: int) -> List[TruckSpec]:
+    per_row = int(data.get('per_row', 8))
+    spacing = float(data.get('spacing', 6.0))
+    theta = float(data.get('theta', math.pi / 2))
+    return [TruckSpec(first_id + index,
+                      (float(data['x']) + (index % per_row) * spacing,
+                       float(data['y']) + (index // per_row) * spacing,
+                       theta))
+            for index in range(int(data['count']))]
+
+def _event_from_dict(data: dict, truck_ids: List[int]) -> ScenarioEvent:
+    kind = data.get('type')
+    if kind not in EVENT_TYPES:
+        raise ValueError(f"tipo de evento desconhecido: {kind}")
+    truck_id = data.get('truck')
+    if truck_id is not None and truck_id not in truck_ids:
+        raise ValueError(f"evento para caminhão inexistente: {truck_id}")
+    
+    value = data.get('value')
+    if kind == EVENT_COMMAND:
+        value = data.get('command', value)
+        if value not in CommandType.__members__:
+            raise ValueError(f"comando desconhecido: {value}")
+    elif kind == EVENT_ROUTE:
+        value = [(float(x), float(y)) for x, y in data.get('route', value or [])]
+    elif kind == EVENT_HEATING:
+        value = float(data.get('target', value if value is not None else 130.0))
+    return ScenarioEvent(float(data['time']), kind, truck_id, value)
@@ -0,0 +1,228 @@
+import math
+import queue
+from typing import Callable, List, Tuple
+from config.settings import (
+    BENCHMARK_CONFIG, BUFFER_CONFIG, COLLISION_CONFIG, FAULT_CONFIG, FILTER_CONFIG, SCENARIO_CONFIG,
+    SIMULATION_CONFIG, TIMING_CONFIG
+)
+from src.embedded.sync.circular_buffer import CircularBuffer
+from src.embedded.tasks.command_logic import CommandLogicTask
+from src.embedded.tasks.fault_monitoring import FaultMonitoringTask
+from src.embedded.tasks.sensor_processing import SensorProcessingTask
+from src.models.command import Command, CommandType
+from src.models.vehicle_state import OperationMode, VehicleStatus
+from src.simulation.haul_benchmark import BenchmarkTruck, HaulBenchmark, SimulatedClock
+from src.simulation.mine_simulator import MineSimulatorTask
+from src.simulation.random_fault_generator import RandomFaultGenerator
+from src.simulation.random_streams import STREAM_FAULTS, STREAM_HEATING, STREAM_NOISE, component_rng
+from src.simulation.scenario import (
+    EVENT_COMMAND, EVENT_ELECTRICAL_FAULT, EVENT_HEATING, EVENT_HYDRAULIC_FAULT, EVENT_ROUTE,
+    Scenario, ScenarioEvent, TruckSpec
+)
+
+class ScenarioTruck(BenchmarkTruck):
+    
+    def __init__(self, spec: TruckSpec, scenario: Scenario, clock: SimulatedClock, zone_client_factory=None):
+        x, y, theta = spec.pose
+        super().__init__(spec.truck_id, x, y, theta, clock, zone_client_factory)
+        self.clock = clock
+        faults = scenario.random_faults
+        
+        self.simulator = MineSimulatorTask(
+            self.shared_state,
+            simulation_period=TIMING_CONFIG['control_period'],
+            enable_noise=scenario.noise is not None,
+            start_pose=spec.pose,
+            noise_std_devs=scenario.noise,
+            heating_probability=faults['heating_probability'] if faults else 0.0,
+            heating_interval=faults['heating_interval'] if faults else math.inf,
+            heating_range=tuple(faults['heating_range']) if faults else (95.0, 150.0),
+            clock=clock,
+            noise_rng=component_rng(scenario.seed, spec.truck_id, STREAM_NOISE),
+            heating_rng=component_rng(scenario.seed, spec.truck_id, STREAM_HEATING)
+        )
+        self.dynamics = self.simulator.dynamics
+        
+        self.circular_buffer = CircularBuffer(BUFFER_CONFIG['size'])
+        self.command_queue = queue.Queue(maxsize=50)
+        self.sensor = SensorProcessingTask(
+            sensor_reader=self.simulator.get_sensor_data,
+            circular_buffer=self.circular_buffer,
+            filter_order=FILTER_CONFIG['order'],
+            sample_period=TIMING_CONFIG['sensor_processing_period'],
+            clock=clock
+        )
+        self.fault_monitor = FaultMonitoringTask(
+            sensor_reader=self.simulator.get_sensor_data,
+            event_manager=self.event_manager,
+            check_period=TIMING_CONFIG['fault_monitoring_period'],
+            temp_alert_threshold=FAULT_CONFIG['temperature_alert_threshold'],
+            temp_fault_threshold=FAULT_CONFIG['temperature_fault_threshold']
+        )
+        self.fault_generator = RandomFaultGenerator(
+            inject_electrical_fault=self.simulator.inject_electrical_fault,
+            inject_hydraulic_fault=self.simulator.inject_hydraulic_fault,
+            check_period=(faults or SIMULATION_CONFIG)['fault_check_period'],
+            electrical_fault_probability=faults['electrical_fault_probability'] if faults else 0.0,
+            hydraulic_fault_probability=faults['hydraulic_fault_probability'] if faults else 0.0,
+            rng=component_rng(scenario.seed, spec.truck_id, STREAM_FAULTS)
+        )
+        self.command_logic = CommandLogicTask(
+            circular_buffer=self.circular_buffer,
+            shared_state=self.shared_state,
+            event_manager=self.event_manager,
+            command_queue=self.command_queue,
+            update_period=TIMING_CONFIG['command_logic_period'],
+            fault_generator=self.fault_generator,
+            simulator=self.simulator
+        )
+        self.random_faults = faults is not None
+        
+        if not spec.automatic:
+            self.shared_state.set_mode(OperationMode.MANUAL_LOCAL)
+        if spec.route:
+            self.planner.set_route(spec.route)
+        
+        self.distance = 0.0
+        self.max_speed = 0.0
+        self.routes_completed = 0
+        self.route_completed_at = None
+        self.stopped_time = 0.0
+        self.stops = 0
+        self.left_map = False
+        self.fault_responses: List[dict] = []
+        self._stopped = False
+    
+    def schedule(self) -> List[Tuple[str, float, Callable[[], None]]]:
+        # same order as a sample flows through the embedded system: sensing, state, faults, planning, control
+        tasks = [
+            ('sensor', TIMING_CONFIG['sensor_processing_period'], self.sensor.step),
+            ('command', TIMING_CONFIG['command_logic_period'], self.command_logic.step),
+            ('fault_monitoring', TIMING_CONFIG['fault_monitoring_period'], self.fault_monitor.step),
+        ]
+        if self.random_faults:
+            tasks.append(('random_faults', self.fault_generator.check_period, self.fault_generator.step))
+        return tasks + [
+            ('planning', TIMING_CONFIG['route_planning_period'], self._plan),
+            ('collision', COLLISION_CONFIG['check_period'], self.collision.step),
+            ('navigation', TIMING_CONFIG['control_period'], self.navigation.step),
+        ]
+    
+    def move(self):
+        x0, y0, _, _ = self.dynamics.get_state()
+        self.simulator.step()
+        x, y, _, velocity = self.dynamics.get_state()
+        moved = math.hypot(x - x0, y - y0)
+        self.distance += moved
+        self.max_speed = max(self.max_speed, abs(velocity))
+        if self._stopped and self.fault_responses[-1]['stopped_at'] is None:
+            self.fault_responses[-1]['distance'] += moved
+    
+    def observe(self, dt: float, width: float, height: float):
+        now = self.clock()
+        state = self.shared_state.get_state()
+        stopped = state.status in (VehicleStatus.FAULT, VehicleStatus.EMERGENCY)
+        if stopped:
+            self.stopped_time += dt
+            if not self._stopped:
+                self.stops += 1
+                self.fault_responses.append({'status': state.status.name, 'at': now,
+                                             'stopped_at': None, 'distance': 0.0})
+        self._stopped = stopped
+        
+        x, y, _, velocity = self.dynamics.get_state()
+        # a response only counts as a safe stop if the truck halts while the fault is still active
+        if stopped and self.fault_responses[-1]['stopped_at'] is None and abs(velocity) <= SCENARIO_CONFIG['stop_speed']:
+            self.fault_responses[-1]['stopped_at'] = now
+        if not (0.0 <= x <= width and 0.0 <= y <= height):
+            self.left_map = True
+    
+    def apply(self, event: ScenarioEvent):
+        if event.kind == EVENT_ELECTRICAL_FAULT:
+            self.fault_generator.trigger_electrical_fault()
+        elif event.kind == EVENT_HYDRAULIC_FAULT:
+            self.fault_generator.trigger_hydraulic_fault()
+        elif event.kind == EVENT_HEATING:
+            self.simulator.start_heating(event.value)
+        elif event.kind == EVENT_COMMAND:
+            self.command_queue.put(Command(CommandType[event.value], timestamp=self.clock(), source="scenario"))
+        elif event.kind == EVENT_ROUTE:
+            self.planner.set_route(event.value)
+    
+    def summary(self) -> dict:
+        x, y, theta, velocity = self.dynamics.get_state()
+        state = self.shared_state.get_state()
+        return {
+            'truck_id': self.truck_id,
+            'x': x,
+            'y': y,
+            'theta': theta,
+            'velocity': velocity,
+            'status': state.status.name,
+            'mode': state.mode.name,
+            'temperature': state.temperature,
+            'distance': self.distance,
+            'max_speed': self.max_speed,
+            'routes_completed': self.routes_completed,
+            'route_completed_at': self.route_completed_at,
+            'stops': self.stops,
+            'stopped_time': self.stopped_time,
+            'left_map': self.left_map,
+            'fault_responses': self.fault_responses,
+        }
+    
+    def _plan(self):
+        had_route = bool(self.planner.route)
+        self.planner.step()
+        if had_route and not self.planner.route:
+            self.routes_completed += 1
+            self.route_completed_at = self.clock()
+
+class ScenarioRunner(HaulBenchmark):
+    
+    def __init__(self, scenario: Scenario, config: dict = None, trace: bool = True):
+        self.scenario = scenario
+        self.tracing = trace
+        self.trace: List[dict] = []
+        self.applied: List[dict] = []
+        self._pending = list(scenario.events)
+        config = dict(BENCHMARK_CONFIG, **(config or {}))
+        super().__init__(len(scenario.trucks), scenario.duration, config,
+                         zones=bool(scenario.zones), sites=scenario.sites, zone_list=scenario.zones,
+                         poses=[spec.pose for spec in scenario.trucks], dispatch=scenario.dispatch)
+        self._trace_every = max(1, round(SCENARIO_CONFIG['trace_period'] / self.dt))
+    
+    def _make_truck(self, index: int, x: float, y: float, theta: float) -> ScenarioTruck:
+        return ScenarioTruck(self.scenario.trucks[index], self.scenario, self.clock,
+                             self._zone_client if self.zone_list else None)
+    
+    def _tick(self, step: int, every: dict):
+        now = self.clock.now
+        while self._pending and self._pending[0].time <= now:
+            self._apply(self._pending.pop(0), now)
+        
+        super()._tick(step, every)
+        
+        for truck in self.trucks:
+            truck.observe(self.dt, self.scenario.width, self.scenario.height)
+        if self.tracing and step % self._trace_every == 0:
+            for truck in self.trucks:
+                x, y, theta, velocity = truck.dynamics.get_state()
+                state = truck.shared_state.get_state()
+                self.trace.append({'time': now, 'truck_id': truck.truck_id, 'x': x, 'y': y, 'theta': theta,
+                                   'velocity': velocity, 'status': state.status.name,
+                                   'temperature': state.temperature})
+    
+    def _apply(self, event: ScenarioEvent, now: float):
+        targets = self.trucks if event.truck_id is None else [self._by_id[event.truck_id]]
+        for truck in targets:
+            truck.apply(event)
+        self.applied.append({'time': now, 'type': event.kind, 'truck': event.truck_id,
+                             'value': event.value})
+    
+    def report(self, wall: float, cpu: float) -> dict:
+        result = super().report(wall, cpu)
+        result['scenario'] = self.scenario.to_dict()
+        result['fleet'] = [truck.summary() for truck in self.trucks]
+        result['events'] = self.applied
+        return result